@@ -0,0 +1,61 @@
+import base64
+import time
+import urllib.parse
+
+from nacl.signing import SigningKey
+
+from src.backpack.auth import sign_request
+
+SECRET = base64.b64encode(bytes(range(32))).decode("utf-8")
+ORDER_PAYLOAD = {
+    "orderType": "Market",
+    "symbol": "SOL_USDC_PERP",
+    "quantity": "1.25",
+    "side": "Bid",
+}
+
+
+def legacy_sign_request(
+    instruction: str,
+    timestamp: str,
+    window: str,
+    ed25519_private_key_base64: str,
+    data: dict | None = None
+) -> str:
+    if data is not None:
+        url_params = urllib.parse.urlencode(data)
+        signing_string = f"instruction={instruction}&timestamp={timestamp}&window={window}&{url_params}"
+    else:
+        signing_string = f"instruction={instruction}&timestamp={timestamp}&window={window}"
+
+    components = signing_string.split('&')
+    key_value_pairs = [component.split('=') for component in components]
+    sorted_pairs = sorted(key_value_pairs, key=lambda x: x[0])
+    sorted_query_string = '&'.join(['='.join(pair) for pair in sorted_pairs])
+
+    signing_key = SigningKey(base64.b64decode(ed25519_private_key_base64))
+    signed_message = signing_key.sign(sorted_query_string.encode('utf-8'))
+    return base64.b64encode(signed_message.signature).decode('utf-8')
+
+
+def signatures_per_second(func, iterations: int) -> float:
+    timestamp = str(int(time.time() * 1000))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func("orderExecute", timestamp, "10000", SECRET, ORDER_PAYLOAD)
+    return iterations / (time.perf_counter() - started)
+
+
+def main(iterations: int = 5000) -> None:
+    timestamp = "1700000000000"
+    assert legacy_sign_request("orderExecute", timestamp, "10000", SECRET, ORDER_PAYLOAD) == \
+        sign_request("orderExecute", timestamp, "10000", SECRET, ORDER_PAYLOAD)
+
+    before = signatures_per_second(legacy_sign_request, iterations)
+    after = signatures_per_second(sign_request, iterations)
+    print(f"legacy sign_request: {before:,.0f} signatures/s")
+    print(f"cached sign_request: {after:,.0f} signatures/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
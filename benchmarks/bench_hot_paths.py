@@ -0,0 +1,148 @@
+import json
+import os
+import random
+import tempfile
+import time
+from decimal import Decimal
+
+from benchmarks.bench_backpack_signing import ORDER_PAYLOAD, SECRET
+from benchmarks.runner import benchmark
+from src.backpack.auth import sign_request
+from src.config.paths import FUTURE_PAIRS_BACKPACK_PATH, FUTURE_PAIRS_PARADEX_PATH
+from src.paradex.auth import get_account
+from src.paradex.signing import sign_typed_data
+from src.paradex_pair_metrics import build_metrics_frame, get_common_symbols
+from utils.calc import build_quant_spec, calc_size, calc_sizes
+from utils.markets import _find_pair_by_key
+from utils.stark import build_auth_message, build_trade_message
+from utils.state import JsonStateStore, SqliteStateStore
+
+ACCOUNT_ADDRESS = "0x" + "1" * 63
+ACCOUNT_KEY = "0x" + "2" * 63
+TOKEN = "SOL"
+PRICE = 150.0
+STATE_SIZES = (10, 100, 1000)
+
+
+def _load_results(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def check_exact_sizes() -> None:
+    """Prices that divide the notional exactly must not lose a unit to binary rounding."""
+    spec = build_quant_spec(
+        "TEST",
+        {"order_size_increment": "0.01", "min_notional": "10"},
+        {"stepSize": "0.01", "filters": {"quantity": {"minQuantity": "0.01"}}},
+    )
+    assert spec.to_decimal(spec.size_units(14.0, 0.07)) == Decimal("200.00")
+    assert spec.to_decimal(spec.size_units(200.0, 0.1)) == Decimal("2000.00")
+    assert calc_size(200, TOKEN, 0.1) == Decimal("2000.0")
+
+
+@benchmark("calc_size")
+def bench_calc_size():
+    check_exact_sizes()
+    return lambda: calc_size(200, TOKEN, PRICE)
+
+
+@benchmark("calc_sizes_batch_100")
+def bench_calc_sizes_batch():
+    orders = [(TOKEN, 100 + idx, PRICE * (1 + idx / 1000)) for idx in range(100)]
+    return lambda: calc_sizes(orders)
+
+
+@benchmark("build_trade_message")
+def bench_build_trade_message():
+    return lambda: build_trade_message("SOL-USD-PERP", "MARKET", "BUY", Decimal("1.25"), 1700000000000)
+
+
+@benchmark("paradex_sign_order", min_time_sec=1)
+def bench_paradex_sign_order():
+    account = get_account(ACCOUNT_ADDRESS, ACCOUNT_KEY)
+    message = build_trade_message("SOL-USD-PERP", "MARKET", "BUY", Decimal("1.25"), 1700000000000)
+    return lambda: sign_typed_data(account.signer.private_key, account.address, message)
+
+
+@benchmark("paradex_sign_auth", min_time_sec=1)
+def bench_paradex_sign_auth():
+    account = get_account(ACCOUNT_ADDRESS, ACCOUNT_KEY)
+    message = build_auth_message("POST", "/v1/auth", "", 1700000000, 1700000300)
+    return lambda: sign_typed_data(account.signer.private_key, account.address, message)
+
+
+@benchmark("backpack_sign_request")
+def bench_backpack_sign_request():
+    timestamp = str(int(time.time() * 1000))
+    return lambda: sign_request("orderExecute", timestamp, "10000", SECRET, ORDER_PAYLOAD)
+
+
+@benchmark("find_pair_by_key[paradex]")
+def bench_find_pair_paradex():
+    return lambda: _find_pair_by_key("base_currency", TOKEN, FUTURE_PAIRS_PARADEX_PATH)
+
+
+@benchmark("find_pair_by_key[backpack]")
+def bench_find_pair_backpack():
+    return lambda: _find_pair_by_key("baseSymbol", TOKEN, FUTURE_PAIRS_BACKPACK_PATH)
+
+
+@benchmark("build_metrics_frame", min_time_sec=1)
+def bench_build_metrics_frame():
+    rng = random.Random(7)
+    summary = [
+        {
+            "symbol": pair["symbol"],
+            "mark_price": str(rng.uniform(0.01, 100000)),
+            "last_traded_price": str(rng.uniform(0.01, 100000)),
+            "bid": "0",
+            "ask": "0",
+            "volume_24h": str(rng.uniform(1e4, 1e9)),
+            "total_volume": str(rng.uniform(1e6, 1e11)),
+            "open_interest": str(rng.uniform(1e3, 1e7)),
+            "funding_rate": str(rng.uniform(-0.001, 0.001)),
+            "price_change_rate_24h": str(rng.uniform(-0.2, 0.2)),
+            "created_at": 1742970600000,
+            "greeks": {"delta": "1", "gamma": "0", "vega": "0"},
+        }
+        for pair in _load_results(FUTURE_PAIRS_PARADEX_PATH)
+    ]
+    common_tokens = get_common_symbols()
+    return lambda: build_metrics_frame(summary, common_tokens)
+
+
+def _seed_state(store, accounts: int) -> list:
+    keys = [f"0x{n:063x}" for n in range(accounts)]
+    for key in keys:
+        store.update(key, {"position": "closed", "order_side": "BUY", "order_liq_price": "0", "jwt": "x" * 400})
+    return keys
+
+
+def _register_state_cases(backend: str, store_factory) -> None:
+    for accounts in STATE_SIZES:
+        def setup_update(accounts=accounts):
+            store = store_factory()
+            keys = _seed_state(store, accounts)
+            rng = random.Random(accounts)
+            return lambda: store.update(rng.choice(keys), {"position": "active", "order_liq_price": str(rng.random())})
+
+        def setup_get_all(accounts=accounts):
+            store = store_factory()
+            _seed_state(store, accounts)
+            return store.get_all
+
+        benchmark(f"state_{backend}_update[{accounts}]", min_time_sec=0.3)(setup_update)
+        benchmark(f"state_{backend}_get_all[{accounts}]", min_time_sec=0.3)(setup_get_all)
+
+
+_TMP_DIR = tempfile.TemporaryDirectory(prefix="bench-state-")
+
+
+def _state_path(filename: str) -> str:
+    # A fresh private directory per store, so the path cannot be claimed by anyone else first.
+    return os.path.join(tempfile.mkdtemp(dir=_TMP_DIR.name), filename)
+
+
+_register_state_cases("sqlite", lambda: SqliteStateStore(_state_path("state.db")))
+_register_state_cases("json", lambda: JsonStateStore(_state_path("state.json")))
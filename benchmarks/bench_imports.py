@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.runner import benchmark
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules each main.py command imports before doing any work; a fresh interpreter per call
+# so the timing covers the whole import graph, as a cron job or container restart sees it.
+COMMAND_IMPORTS = {
+    "cli": "import main",
+    "update-metrics": "import src.paradex_pair_metrics",
+    "refresh-accounts": "import src.accounts_monitor",
+    "trade": "import src.trading_controller, src.async_trading_controller, utils.initial_checks",
+}
+
+
+def _register_import_case(command: str, statement: str) -> None:
+    def setup():
+        return lambda: subprocess.run([sys.executable, "-c", statement], cwd=ROOT_DIR, check=True)
+
+    benchmark(f"import[{command}]", min_time_sec=2)(setup)
+
+
+for _command, _statement in COMMAND_IMPORTS.items():
+    _register_import_case(_command, _statement)
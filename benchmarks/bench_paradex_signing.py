@@ -0,0 +1,70 @@
+import argparse
+import os
+import time
+from decimal import Decimal
+from typing import Optional
+
+from src.paradex.auth import get_account
+from src.paradex.signing import SigningService, sign_typed_data
+from utils.stark import build_trade_message
+
+ACCOUNT_ADDRESS = "0x" + "1" * 63
+ACCOUNT_KEY = "0x" + "2" * 63
+
+
+def build_messages(count: int) -> list:
+    return [
+        build_trade_message("SOL-USD-PERP", "MARKET", "BUY", Decimal("1.25"), 1700000000000 + idx)
+        for idx in range(count)
+    ]
+
+
+def legacy_signatures_per_second(account, messages: list) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        account.sign_message(message)
+    return len(messages) / (time.perf_counter() - started)
+
+
+def inline_signatures_per_second(account, messages: list) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        sign_typed_data(account.signer.private_key, account.address, message)
+    return len(messages) / (time.perf_counter() - started)
+
+
+def pool_signatures_per_second(account, messages: list, workers: int) -> float:
+    service = SigningService(workers)
+    service.warm_up()
+    try:
+        started = time.perf_counter()
+        service.sign_many(account, messages)
+        return len(messages) / (time.perf_counter() - started)
+    finally:
+        service.close()
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Paradex order signing throughput")
+    parser.add_argument("-n", "--messages", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    account = get_account(ACCOUNT_ADDRESS, ACCOUNT_KEY)
+    messages = build_messages(args.messages)
+    assert account.sign_message(messages[0]) == sign_typed_data(account.signer.private_key, account.address, messages[0])
+
+    cores = os.cpu_count() or 1
+    legacy = legacy_signatures_per_second(account, messages)
+    inline = inline_signatures_per_second(account, messages)
+    pooled = pool_signatures_per_second(account, messages, args.workers)
+    print(f"account.sign_message:        {legacy:8.2f} signatures/s (1 core)")
+    print(f"sign_typed_data inline:      {inline:8.2f} signatures/s (1 core, {inline / legacy:.2f}x)")
+    print(
+        f"SigningService.sign_many:    {pooled:8.2f} signatures/s "
+        f"({args.workers} workers, {cores} cores, {pooled / min(args.workers, cores):.2f} per core)"
+    )
+
+
+if __name__ == "__main__":
+    main()
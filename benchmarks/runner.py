@@ -0,0 +1,138 @@
+import argparse
+import importlib
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINES_PATH = os.path.join(BENCHMARKS_DIR, "baselines.json")
+BENCHMARK_MODULES = ["benchmarks.bench_hot_paths", "benchmarks.bench_imports"]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    min_time_sec: float
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float
+    peak_kib: float
+    retained_blocks: int
+
+
+_CASES: List[Case] = []
+
+
+def benchmark(name: str, min_time_sec: float = 0.5):
+    """Register ``setup`` as a case; it prepares fixtures and returns the callable to time."""
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        _CASES.append(Case(name, setup, min_time_sec))
+        return setup
+    return decorator
+
+
+def measure(case: Case) -> Result:
+    func = case.setup()
+    func()
+
+    iterations = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    batch = 1
+    while elapsed < case.min_time_sec:
+        for _ in range(batch):
+            func()
+        iterations += batch
+        elapsed = time.perf_counter() - started
+        batch = min(batch * 2, 1000)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")
+    retained_blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return Result(case.name, iterations / elapsed, (peak - baseline) / 1024, retained_blocks)
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baselines(results: List[Result], path: str = BASELINES_PATH) -> None:
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result.name] = {
+            "ops_per_sec": round(result.ops_per_sec, 2),
+            "peak_kib": round(result.peak_kib, 2),
+            "retained_blocks": result.retained_blocks,
+        }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(dict(sorted(baselines.items())), file, indent=2)
+        file.write("\n")
+
+
+def compare(result: Result, baseline: Optional[Dict[str, float]], threshold: float) -> str:
+    if baseline is None:
+        return "new"
+
+    problems = []
+    if result.ops_per_sec < baseline["ops_per_sec"] * (1 - threshold):
+        problems.append(f"{result.ops_per_sec / baseline['ops_per_sec'] - 1:+.0%} ops/s")
+    if result.peak_kib > max(baseline["peak_kib"], 1) * (1 + threshold):
+        problems.append(f"{result.peak_kib / max(baseline['peak_kib'], 1) - 1:+.0%} memory")
+    if problems:
+        return "REGRESSION " + ", ".join(problems)
+    return f"{result.ops_per_sec / baseline['ops_per_sec'] - 1:+.0%} ops/s"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run hot-path micro-benchmarks and compare them with baselines.json")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this substring")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown that counts as a regression")
+    parser.add_argument("--min-time", type=float, help="override the per-case timing budget in seconds")
+    parser.add_argument("--save", action="store_true", help="write the results to baselines.json")
+    args = parser.parse_args(argv)
+
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+
+    baselines = load_baselines()
+    results = []
+    regressions = 0
+
+    print(f"{'case':<44} {'ops/s':>12} {'peak KiB':>10} {'retained':>8}  vs baseline")
+    for case in _CASES:
+        if args.filter not in case.name:
+            continue
+        if args.min_time is not None:
+            case.min_time_sec = args.min_time
+
+        result = measure(case)
+        results.append(result)
+        status = compare(result, baselines.get(case.name), args.threshold)
+        regressions += status.startswith("REGRESSION")
+        print(f"{case.name:<44} {result.ops_per_sec:>12,.1f} {result.peak_kib:>10.1f} {result.retained_blocks:>8}  {status}")
+
+    if args.save:
+        save_baselines(results)
+        print(f"Saved {len(results)} baselines to {os.path.relpath(BASELINES_PATH)}")
+
+    return 1 if regressions and not args.save else 0
@@ -1,38 +1,116 @@
-from src.accounts_monitor import update_accounts_info
-from src.paradex_pair_metrics import update_metrics
-from utils.initial_checks import start as start_initial_checks
-from src.trading_controller import TradingController
+import argparse
+import os
+import sys
+from typing import Optional
 
-import questionary
+# Every command imports only what it needs: the trading stack (starknet_py, pandas, numpy) costs
+# seconds to import, which cron jobs and container restarts should not pay for a metrics update.
 
+MENU_CHOICES = [
+    ("1. ⚙️  Start trading", "trade"),
+    ("2. 📊 Fetch market data and update active trading pairs (data/active_pairs.xlsx)", "update-metrics"),
+    ("3. 🔄 Update account balances and check for open positions (Paradex + Backpack)", "refresh-accounts"),
+    ("4. 🛑 Close all currently open positions", "close-all"),
+    ("5. 📥 Import accounts from xlsx (data/accounts_*.xlsx)", "import-accounts"),
+    ("6. 📤 Export accounts to xlsx (data/accounts_*.xlsx)", "export-accounts"),
+    ("7. ❌ Exit", None),
+]
 
-if __name__ == "__main__":
-    action = questionary.select(
-        "📌 What would you like to do?",
-        choices=[
-            "1. ⚙️  Start trading",
-            "2. 📊 Fetch market data and update active trading pairs (data/active_pairs.xlsx)",
-            "3. 🔄 Update account balances and check for open positions (Paradex + Backpack)",
-            "4. 🛑 Close all currently open positions",
-            "5. ❌ Exit"
-        ]
-    ).ask()
-
-    if action.startswith("1"):
-        start_initial_checks()
+
+def run_trade(args: argparse.Namespace) -> None:
+    from utils.data import USER_CONFIG
+    from utils.initial_checks import start as start_initial_checks
+    from utils.metrics import start_metrics_server
+
+    start_metrics_server()
+    start_initial_checks()
+    if (args.engine or USER_CONFIG.get("engine", "threads")) == "asyncio":
+        from src.async_trading_controller import AsyncTradingController
+        manager = AsyncTradingController()
+    else:
+        from src.trading_controller import TradingController
         manager = TradingController()
-        manager.run_trading_managers()
+    manager.run_trading_managers()
 
 
-    elif action.startswith("2"):
-        update_metrics()
+def run_update_metrics(args: argparse.Namespace) -> None:
+    from src.paradex_pair_metrics import update_metrics
+    update_metrics()
 
-    elif action.startswith("3"):
-        update_accounts_info()
 
-    elif action.startswith("4"):
-        manager = TradingController()
-        manager.close_all_positions()
+def run_refresh_accounts(args: argparse.Namespace) -> None:
+    from src.accounts_monitor import update_accounts_info
+    update_accounts_info()
 
-    else:
-        print("Exited.")
+
+def run_close_all(args: argparse.Namespace) -> None:
+    from src.trading_controller import TradingController
+    TradingController().close_all_positions(workers=args.workers, deadline_sec=args.deadline)
+
+
+def run_import_accounts(args: argparse.Namespace) -> None:
+    from utils.accounts_store import import_accounts_from_xlsx
+    import_accounts_from_xlsx()
+
+
+def run_export_accounts(args: argparse.Namespace) -> None:
+    from utils.accounts_store import export_accounts_to_xlsx
+    export_accounts_to_xlsx()
+
+
+COMMANDS = {
+    "trade": (run_trade, "start the trading threads"),
+    "update-metrics": (run_update_metrics, "fetch market data and update data/active_pairs.xlsx"),
+    "refresh-accounts": (run_refresh_accounts, "update balances and open positions of all accounts"),
+    "close-all": (run_close_all, "close all currently open positions"),
+    "import-accounts": (run_import_accounts, "import accounts from data/accounts_*.xlsx"),
+    "export-accounts": (run_export_accounts, "export accounts to data/accounts_*.xlsx"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Paradex + Backpack delta neutral bot. Without a command, shows the interactive menu.")
+    parser.add_argument("--config", help="path to config.json (default: data/config.json)")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    for name, (handler, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text, description=help_text)
+        subparser.set_defaults(handler=handler)
+        if name == "trade":
+            subparser.add_argument("--engine", choices=["threads", "asyncio"], help="override the engine from config")
+        if name == "close-all":
+            subparser.add_argument("--workers", type=int, help="legs closed concurrently (config close_all.workers)")
+            subparser.add_argument("--deadline", type=float, help="seconds before giving up (config close_all.deadline_sec)")
+    return parser
+
+
+def select_command() -> str:
+    import questionary
+
+    labels = dict(MENU_CHOICES)
+    action = questionary.select("📌 What would you like to do?", choices=list(labels)).ask()
+    return labels.get(action)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.config:
+        os.environ["BOT_CONFIG_PATH"] = os.path.abspath(args.config)
+
+    if args.command is None:
+        if not sys.stdin.isatty():
+            parser.print_help()
+            return 2
+
+        command = select_command()
+        if command is None:
+            print("Exited.")
+            return 0
+        args = parser.parse_args([*(argv or sys.argv[1:]), command])
+
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,539 @@
+import argparse
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.config.paths import FUTURE_PAIRS_BACKPACK_PATH, FUTURE_PAIRS_PARADEX_PATH
+from utils.rate_limit import RateLimiter
+
+PARADEX_PREFIX = "/paradex/v1"
+BACKPACK_PREFIX = "/backpack/api/v1"
+
+
+@dataclass
+class SimulatorConfig:
+    latency_min_ms: float = 20
+    latency_max_ms: float = 80
+    error_rate: float = 0.0
+    partial_fill_rate: float = 0.0
+    rate_limit_per_sec: float = 20
+    rate_limit_burst: float = 40
+    volatility: float = 0.8
+    tick_sec: float = 1
+    spread_bps: float = 2
+    initial_balance: float = 10_000
+    margin_ratio: float = 0.5
+    jwt_ttl_sec: int = 300
+    seed: Optional[int] = None
+
+
+class PriceWalk:
+    def __init__(self, tokens: List[str], volatility: float, tick_sec: float, rng: random.Random) -> None:
+        self.volatility = volatility
+        self.tick_sec = tick_sec
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._prices = {token: math.exp(rng.uniform(0, 9)) for token in tokens}
+        self._stop_event = threading.Event()
+
+    def get(self, token: str) -> float:
+        with self._lock:
+            return self._prices.setdefault(token, math.exp(self._rng.uniform(0, 9)))
+
+    def step(self) -> None:
+        sigma = self.volatility * math.sqrt(self.tick_sec / (365 * 24 * 3600))
+        with self._lock:
+            for token, price in self._prices.items():
+                self._prices[token] = price * math.exp(self._rng.gauss(-sigma * sigma / 2, sigma))
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.tick_sec):
+            self.step()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+@dataclass
+class SimAccount:
+    balance: float
+    positions: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    orders: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class ExchangeSimulator:
+    def __init__(self, config: SimulatorConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.paradex_markets = self._load_markets(FUTURE_PAIRS_PARADEX_PATH)
+        self.backpack_markets = self._load_markets(FUTURE_PAIRS_BACKPACK_PATH)
+        self._paradex_tokens = {item["symbol"]: item["base_currency"] for item in self.paradex_markets}
+        self._backpack_tokens = {item["symbol"]: item["baseSymbol"] for item in self.backpack_markets}
+        self._increments = {
+            **{item["symbol"]: item["order_size_increment"] for item in self.paradex_markets},
+            **{item["symbol"]: item["stepSize"] for item in self.backpack_markets},
+        }
+
+        tokens = set(self._paradex_tokens.values()) | set(self._backpack_tokens.values())
+        self.prices = PriceWalk(sorted(tokens), config.volatility, config.tick_sec, self.rng)
+        self.limiter = RateLimiter(rate=config.rate_limit_per_sec, burst=config.rate_limit_burst)
+        self._lock = threading.Lock()
+        self._accounts: Dict[Tuple[str, str], SimAccount] = {}
+
+    def _load_markets(self, path: str) -> List[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file).get("results", [])
+
+    def account(self, venue: str, key: str) -> SimAccount:
+        with self._lock:
+            return self._accounts.setdefault((venue, key), SimAccount(balance=self.config.initial_balance))
+
+    def quote(self, token: str) -> Tuple[float, float, float]:
+        mid = self.prices.get(token)
+        half_spread = mid * self.config.spread_bps / 20_000
+        return mid - half_spread, mid + half_spread, mid
+
+    def fill(self, venue: str, key: str, symbol: str, token: str, size: float) -> float:
+        bid, ask, _ = self.quote(token)
+        price = ask if size > 0 else bid
+        account = self.account(venue, key)
+
+        with self._lock:
+            position = account.positions.setdefault(symbol, {"size": 0.0, "entry": 0.0})
+            new_size = round(position["size"] + size, 12)
+            if abs(new_size) < 1e-12:
+                account.balance += position["size"] * (price - position["entry"])
+                del account.positions[symbol]
+            elif position["size"] == 0 or (position["size"] > 0) == (size > 0):
+                position["entry"] = (position["entry"] * position["size"] + price * size) / new_size
+                position["size"] = new_size
+            else:
+                account.balance += -size * (price - position["entry"])
+                position["size"] = new_size
+        return price
+
+    def filled_quantity(self, symbol: str, quantity: str) -> str:
+        """The part of a market order that fills: all of it, or with ``partial_fill_rate`` about half,
+        the rest being cancelled for lack of liquidity."""
+        if self.rng.random() >= self.config.partial_fill_rate:
+            return quantity
+        increment = Decimal(str(self._increments[symbol]))
+        filled = (Decimal(quantity) / 2 // increment) * increment
+        return str(filled) if filled > 0 else quantity
+
+    def increases_position(self, venue: str, key: str, symbol: str, size: float) -> bool:
+        """Whether ``size`` would open or grow a position; reduce-only orders are rejected then."""
+        account = self.account(venue, key)
+        with self._lock:
+            current = account.positions.get(symbol, {}).get("size", 0.0)
+        return current == 0 or (current > 0) == (size > 0) or abs(size) > abs(current) + 1e-12
+
+    def position_view(self, account: SimAccount, token_of: Dict[str, str]) -> List[Dict[str, float]]:
+        views = []
+        with self._lock:
+            positions = [(symbol, dict(position)) for symbol, position in account.positions.items()]
+            balance = account.balance
+
+        for symbol, position in positions:
+            mark = self.prices.get(token_of[symbol])
+            size = position["size"]
+            notional = abs(size) * position["entry"]
+            buffer = min(balance * self.config.margin_ratio / notional, 0.95) if notional else 0.95
+            liq_price = position["entry"] * (1 - buffer if size > 0 else 1 + buffer)
+            views.append({
+                "symbol": symbol,
+                "size": size,
+                "entry": position["entry"],
+                "mark": mark,
+                "liq_price": liq_price,
+                "pnl": size * (mark - position["entry"]),
+            })
+        return views
+
+    # Paradex
+
+    def paradex_auth(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        address = request.headers.get("PARADEX-STARKNET-ACCOUNT")
+        if not address:
+            return 400, {"error": "MISSING_ACCOUNT", "message": "PARADEX-STARKNET-ACCOUNT header is required"}
+
+        self.account("paradex", address)
+        encode = lambda payload: base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        claims = {"sub": address, "exp": int(time.time()) + self.config.jwt_ttl_sec}
+        return 200, {"jwt_token": f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.sim"}
+
+    def paradex_account(self, request: "SimulatorHandler") -> Optional[SimAccount]:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        try:
+            payload = token.split(".")[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except Exception:
+            return None
+        if claims.get("exp", 0) < time.time():
+            return None
+        return self.account("paradex", claims["sub"])
+
+    def paradex_balance(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        account = self.paradex_account(request)
+        if account is None:
+            return 401, {"error": "INVALID_TOKEN"}
+        return 200, {"results": [{"token": "USDC", "size": f"{account.balance:.6f}", "last_updated_at": int(time.time() * 1000)}]}
+
+    def paradex_positions(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        account = self.paradex_account(request)
+        if account is None:
+            return 401, {"error": "INVALID_TOKEN"}
+
+        results = [
+            {
+                "market": view["symbol"],
+                "side": "LONG" if view["size"] > 0 else "SHORT",
+                "size": str(view["size"]),
+                "status": "OPEN",
+                "average_entry_price": str(view["entry"]),
+                "unrealized_pnl": str(view["pnl"]),
+                "liquidation_price": str(view["liq_price"]),
+            }
+            for view in self.position_view(account, self._paradex_tokens)
+        ]
+        return 200, {"results": results}
+
+    def paradex_create_order(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        account = self.paradex_account(request)
+        if account is None:
+            return 401, {"error": "INVALID_TOKEN"}
+
+        body = request.json_body()
+        market = body.get("market")
+        if market not in self._paradex_tokens:
+            return 400, {"error": "INVALID_MARKET", "message": f"Unknown market {market}"}
+
+        size = float(body["size"])
+        side = body["side"].upper()
+        signed_size = size if side == "BUY" else -size
+        if "REDUCE_ONLY" in body.get("flags", []) and self.increases_position("paradex", request.account_key, market, signed_size):
+            return 400, {"error": "ORDER_IS_REDUCE_ONLY", "message": "Reduce-only order would increase the position"}
+        filled = self.filled_quantity(market, body["size"])
+        signed_filled = float(filled) if side == "BUY" else -float(filled)
+        price = self.fill("paradex", request.account_key, market, self._paradex_tokens[market], signed_filled)
+        now_ms = int(time.time() * 1000)
+        order = {
+            "id": uuid.uuid4().hex,
+            "market": market,
+            "side": side,
+            "size": body["size"],
+            "type": body.get("type", "MARKET"),
+            "status": "NEW",
+            "created_at": now_ms,
+        }
+        with self._lock:
+            account.orders[order["id"]] = dict(
+                order,
+                status="CLOSED",
+                avg_fill_price=str(price),
+                remaining_size=str(Decimal(body["size"]) - Decimal(filled)),
+                cancel_reason="" if filled == body["size"] else "IOC_CANCELLED",
+                last_updated_at=now_ms,
+            )
+        return 201, order
+
+    def paradex_get_order(self, request: "SimulatorHandler", order_id: str) -> Tuple[int, Any]:
+        account = self.paradex_account(request)
+        if account is None:
+            return 401, {"error": "INVALID_TOKEN"}
+
+        with self._lock:
+            order = account.orders.get(order_id)
+        if order is None:
+            return 404, {"error": "ORDER_ID_NOT_FOUND"}
+        return 200, order
+
+    def paradex_bbo(self, request: "SimulatorHandler", symbol: str) -> Tuple[int, Any]:
+        if symbol not in self._paradex_tokens:
+            return 400, {"error": "INVALID_MARKET"}
+        bid, ask, _ = self.quote(self._paradex_tokens[symbol])
+        return 200, {"market": symbol, "bid": f"{bid:.8f}", "ask": f"{ask:.8f}", "last_updated_at": int(time.time() * 1000)}
+
+    def conditional(self, request: "SimulatorHandler", body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, body, {"ETag": etag}
+
+    def paradex_list_markets(self, request: "SimulatorHandler") -> Tuple[int, Any, Dict[str, str]]:
+        return self.conditional(request, {"results": self.paradex_markets})
+
+    def paradex_system_time(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        return 200, {"server_time": str(int(time.time() * 1000))}
+
+    def paradex_markets_summary(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        now_ms = int(time.time() * 1000)
+        results = []
+        for symbol, token in self._paradex_tokens.items():
+            bid, ask, mid = self.quote(token)
+            volume = self.rng.uniform(1e5, 1e8)
+            results.append({
+                "symbol": symbol,
+                "mark_price": str(mid),
+                "last_traded_price": str(mid),
+                "bid": str(bid),
+                "ask": str(ask),
+                "volume_24h": str(volume),
+                "total_volume": str(volume * 30),
+                "open_interest": str(volume / mid / 10),
+                "funding_rate": str(self.rng.uniform(-0.0005, 0.0005)),
+                "price_change_rate_24h": str(self.rng.uniform(-0.1, 0.1)),
+                "created_at": now_ms,
+                "greeks": {"delta": "1", "gamma": "0", "vega": "0"},
+            })
+        return 200, {"results": results}
+
+    # Backpack
+
+    def backpack_account(self, request: "SimulatorHandler") -> Optional[SimAccount]:
+        api_key = request.headers.get("X-API-Key")
+        if not api_key or not request.headers.get("X-Signature"):
+            return None
+        return self.account("backpack", api_key)
+
+    def backpack_capital(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        account = self.backpack_account(request)
+        if account is None:
+            return 401, {"code": "UNAUTHORIZED", "message": "Missing API key or signature"}
+        return 200, {"USDC": {"available": f"{account.balance:.6f}", "locked": "0", "staked": "0"}}
+
+    def backpack_lend_positions(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        if self.backpack_account(request) is None:
+            return 401, {"code": "UNAUTHORIZED", "message": "Missing API key or signature"}
+        return 200, []
+
+    def backpack_positions(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        account = self.backpack_account(request)
+        if account is None:
+            return 401, {"code": "UNAUTHORIZED", "message": "Missing API key or signature"}
+
+        results = [
+            {
+                "symbol": view["symbol"],
+                "netQuantity": str(view["size"]),
+                "netExposureQuantity": str(abs(view["size"])),
+                "entryPrice": str(view["entry"]),
+                "markPrice": str(view["mark"]),
+                "estLiquidationPrice": str(view["liq_price"]),
+                "pnlUnrealized": str(view["pnl"]),
+            }
+            for view in self.position_view(account, self._backpack_tokens)
+        ]
+        return 200, results
+
+    def backpack_order(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        if self.backpack_account(request) is None:
+            return 401, {"code": "UNAUTHORIZED", "message": "Missing API key or signature"}
+
+        body = request.json_body()
+        symbol = body.get("symbol")
+        if symbol not in self._backpack_tokens:
+            return 400, {"code": "INVALID_MARKET", "message": f"Unknown market {symbol}"}
+
+        quantity = float(body["quantity"])
+        signed_quantity = quantity if body["side"] == "Bid" else -quantity
+        if body.get("reduceOnly") and self.increases_position("backpack", request.account_key, symbol, signed_quantity):
+            return 400, {"code": "INVALID_ORDER", "message": "Reduce only order not reduced"}
+        filled = self.filled_quantity(symbol, body["quantity"])
+        signed_filled = float(filled) if body["side"] == "Bid" else -float(filled)
+        price = self.fill("backpack", request.account_key, symbol, self._backpack_tokens[symbol], signed_filled)
+        return 200, {
+            "id": str(self.rng.getrandbits(48)),
+            "symbol": symbol,
+            "side": body["side"],
+            "quantity": body["quantity"],
+            "executedQuantity": filled,
+            "executedQuoteQuantity": str(float(filled) * price),
+            "orderType": body.get("orderType", "Market"),
+            "status": "Filled" if filled == body["quantity"] else "Cancelled",
+            "createdAt": int(time.time() * 1000),
+        }
+
+    def backpack_list_markets(self, request: "SimulatorHandler") -> Tuple[int, Any, Dict[str, str]]:
+        return self.conditional(request, self.backpack_markets)
+
+    def backpack_time(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        return 200, int(time.time() * 1000)
+
+    def backpack_mark_prices(self, request: "SimulatorHandler") -> Tuple[int, Any]:
+        symbol = request.query.get("symbol", [None])[0]
+        symbols = [symbol] if symbol else list(self._backpack_tokens)
+        results = []
+        for item in symbols:
+            if item not in self._backpack_tokens:
+                return 400, {"code": "INVALID_MARKET", "message": f"Unknown market {item}"}
+            mark = self.prices.get(self._backpack_tokens[item])
+            results.append({"symbol": item, "markPrice": str(mark), "indexPrice": str(mark), "fundingRate": "0.0001"})
+        return 200, results
+
+    def routes(self) -> List[Tuple[str, "re.Pattern", Callable[..., Tuple[int, Any]]]]:
+        return [
+            ("POST", re.compile(rf"^{PARADEX_PREFIX}/auth$"), self.paradex_auth),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/balance$"), self.paradex_balance),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/positions$"), self.paradex_positions),
+            ("POST", re.compile(rf"^{PARADEX_PREFIX}/orders$"), self.paradex_create_order),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/orders/([^/]+)$"), self.paradex_get_order),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/bbo/([^/]+)$"), self.paradex_bbo),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/markets$"), self.paradex_list_markets),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/markets/summary$"), self.paradex_markets_summary),
+            ("GET", re.compile(rf"^{PARADEX_PREFIX}/system/time$"), self.paradex_system_time),
+            ("GET", re.compile(rf"^{BACKPACK_PREFIX}/capital$"), self.backpack_capital),
+            ("GET", re.compile(rf"^{BACKPACK_PREFIX}/borrowLend/positions$"), self.backpack_lend_positions),
+            ("GET", re.compile(rf"^{BACKPACK_PREFIX}/position$"), self.backpack_positions),
+            ("POST", re.compile(rf"^{BACKPACK_PREFIX}/order$"), self.backpack_order),
+            ("GET", re.compile(rf"^{BACKPACK_PREFIX}/markets$"), self.backpack_list_markets),
+            ("GET", re.compile(rf"^{BACKPACK_PREFIX}/markPrices$"), self.backpack_mark_prices),
+            ("GET", re.compile(rf"^{BACKPACK_PREFIX}/time$"), self.backpack_time),
+        ]
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    server: "SimulatorServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def account_key(self) -> str:
+        if self.path.startswith(BACKPACK_PREFIX):
+            return self.headers.get("X-API-Key", "")
+
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        try:
+            payload = token.split(".")[1]
+            return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["sub"]
+        except Exception:
+            return self.headers.get("PARADEX-STARKNET-ACCOUNT", "")
+
+    def json_body(self) -> Dict[str, Any]:
+        return json.loads(self.body) if self.body else {}
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = b"" if status == 304 else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str) -> None:
+        simulator = self.server.simulator
+        config = simulator.config
+        parsed = urlparse(self.path)
+        self.query = parse_qs(parsed.query)
+        # Always drain the body so a rejected request does not corrupt the kept-alive connection.
+        self.body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        time.sleep(simulator.rng.uniform(config.latency_min_ms, config.latency_max_ms) / 1000)
+
+        client = self.account_key or self.client_address[0]
+        retry_after = simulator.limiter.try_acquire(client)
+        if retry_after > 0:
+            self._send(429, {"error": "RATE_LIMIT_EXCEEDED"}, {"Retry-After": str(max(math.ceil(retry_after), 1))})
+            return
+
+        if simulator.rng.random() < config.error_rate:
+            self._send(simulator.rng.choice([500, 502, 503]), {"error": "SIMULATED_FAILURE"})
+            return
+
+        for route_method, pattern, handler in simulator.routes():
+            match = pattern.match(parsed.path)
+            if match and route_method == method:
+                try:
+                    status, body, *headers = handler(self, *match.groups())
+                except (KeyError, ValueError) as exc:
+                    status, body, headers = 400, {"error": "BAD_REQUEST", "message": str(exc)}, []
+                self._send(status, body, *headers)
+                return
+
+        self._send(404, {"error": "NOT_FOUND", "message": f"{method} {parsed.path}"})
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+
+class SimulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], simulator: ExchangeSimulator, verbose: bool = False) -> None:
+        super().__init__(address, SimulatorHandler)
+        self.simulator = simulator
+        self.verbose = verbose
+
+
+def start_simulator(config: SimulatorConfig, host: str = "127.0.0.1", port: int = 8900, verbose: bool = False) -> SimulatorServer:
+    simulator = ExchangeSimulator(config)
+    server = SimulatorServer((host, port), simulator, verbose)
+    threading.Thread(target=simulator.prices.run, name="sim-prices", daemon=True).start()
+    threading.Thread(target=server.serve_forever, name="sim-http", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Paradex/Backpack REST simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-min-ms", type=float, default=20)
+    parser.add_argument("--latency-max-ms", type=float, default=80)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--partial-fill-rate", type=float, default=0.0, help="share of market orders that fill only partly")
+    parser.add_argument("--rate-limit", type=float, default=20, help="requests per second per account")
+    parser.add_argument("--burst", type=float, default=40)
+    parser.add_argument("--volatility", type=float, default=0.8, help="annualized volatility of the price walk")
+    parser.add_argument("--tick-sec", type=float, default=1)
+    parser.add_argument("--balance", type=float, default=10_000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        latency_min_ms=args.latency_min_ms,
+        latency_max_ms=args.latency_max_ms,
+        error_rate=args.error_rate,
+        partial_fill_rate=args.partial_fill_rate,
+        rate_limit_per_sec=args.rate_limit,
+        rate_limit_burst=args.burst,
+        volatility=args.volatility,
+        tick_sec=args.tick_sec,
+        initial_balance=args.balance,
+        seed=args.seed,
+    )
+    server = start_simulator(config, args.host, args.port, args.verbose)
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"Simulator listening on {base_url}")
+    print(f"  export PARADEX_HTTP_URL={base_url}{PARADEX_PREFIX}")
+    print(f"  export BACKPACK_HTTP_URL={base_url}{BACKPACK_PREFIX}")
+    print("  export PARADEX_WS_URL= BACKPACK_WS_URL=")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        server.simulator.prices.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,161 +1,188 @@
 import warnings
+import random
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal
-import time
-import random
+from typing import Any, Callable, Dict
 
 from src.config.constants import logger
-from src.config.paths import DATA_DIR
 from src.paradex.auth import get_account
 from src.paradex.account import get_balance as get_balance_paradex, get_open_positions as get_open_positions_paradex
 from src.backpack.account import get_balance as get_balance_backpack, get_open_positions as get_open_positions_backpack
-from utils.general import _retry_request
+from utils.accounts_store import load_accounts, save_accounts
+from utils.data import USER_CONFIG
+from utils.retry import retry_call
 
 warnings.filterwarnings("ignore")
 
+EMPTY_POSITION = {
+    "position_market": "",
+    "position_side": "",
+    "position_size": None,
+    "position_avg_price": None,
+    "position_mark_price": None,
+    "position_liq_price": None,
+    "position_pnl": None,
+    "position_ltv": None,
+}
 
-def update_accounts_info():
-    update_paradex_accounts_info()
-    update_backpack_accounts_info()
 
-def update_paradex_accounts_info():
-    df = pd.read_excel(DATA_DIR + "/accounts_paradex.xlsx")
+def _refresh_config() -> Dict[str, Any]:
+    return USER_CONFIG.get("accounts_refresh", {})
 
-    df = df.sample(frac=1).reset_index(drop=True)
 
-    for x in range(df.shape[0]):
-        data = df.iloc[x]
+def update_accounts_info():
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="Refresh") as executor:
+        futures = [
+            executor.submit(update_paradex_accounts_info),
+            executor.submit(update_backpack_accounts_info),
+        ]
+        for future in futures:
+            future.result()
 
-        if not data["is_active"]:
-            continue
 
-        account = get_account(data["address"], data["private_key"])
+def calc_ltv(side: str, mark_price: float, liq_price: float):
+    if liq_price > 0 and mark_price > 0:
+        if side.upper() == "SHORT":
+            return mark_price / liq_price
+        elif side.upper() == "LONG":
+            return liq_price / mark_price
+    return None
 
-        balance_data = _retry_request(get_balance_paradex, account, data["proxy"])
-        for token_entry in balance_data.get("results", []):
-            token = token_entry["token"]
-            size = float(token_entry["size"])
-            df.loc[x, token] = size
 
-        position_data = _retry_request(get_open_positions_paradex, account, data["proxy"])
-        positions = position_data.get("results", [])
+def fetch_paradex_account_info(data: pd.Series) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    account = get_account(data["address"], data["private_key"])
 
-        for pos in positions:
-            if pos["status"].upper() == "CLOSED":
-                continue
+    balance_data = retry_call(get_balance_paradex, account, data["proxy"])
+    for token_entry in balance_data.get("results", []):
+        row[token_entry["token"]] = float(token_entry["size"])
 
-            side = pos.get("side", "")
-            try:
-                liq_price = float(pos.get("liquidation_price", 0))
-            except Exception:
-                liq_price = 0
-            unrealized_pnl = Decimal(pos.get("unrealized_pnl", "0"))
-            avg_price = Decimal(pos.get("average_entry_price", "0"))
-            size = abs(Decimal(pos.get("size", "0")))
-
-            if size > 0:
-                direction = -1 if side.upper() == "SHORT" else 1
-                mark_price = float((unrealized_pnl / (size * direction)) + avg_price)
-            else:
-                mark_price = 0.0
-
-            df.loc[x, "position_market"] = str(pos.get("market", ""))
-            df.loc[x, "position_side"] = str(side)
-            df.loc[x, "position_size"] = float(size)
-            df.loc[x, "position_avg_price"] = float(avg_price)
-            df.loc[x, "position_mark_price"] = mark_price
-            df.loc[x, "position_liq_price"] = liq_price
-            df.loc[x, "position_pnl"] = float(unrealized_pnl)
-
-            if liq_price > 0 and mark_price > 0:
-                if side.upper() == "SHORT":
-                    ltv = mark_price / liq_price
-                elif side.upper() == "LONG":
-                    ltv = liq_price / mark_price
-                else:
-                    ltv = None
-            else:
-                ltv = None
-
-            df.loc[x, "position_ltv"] = ltv
-            break
+    position_data = retry_call(get_open_positions_paradex, account, data["proxy"])
+    positions = position_data.get("results", [])
+
+    for pos in positions:
+        if pos["status"].upper() == "CLOSED":
+            continue
+
+        side = pos.get("side", "")
+        try:
+            liq_price = float(pos.get("liquidation_price", 0))
+        except Exception:
+            liq_price = 0
+        unrealized_pnl = Decimal(pos.get("unrealized_pnl", "0"))
+        avg_price = Decimal(pos.get("average_entry_price", "0"))
+        size = abs(Decimal(pos.get("size", "0")))
+
+        if size > 0:
+            direction = -1 if side.upper() == "SHORT" else 1
+            mark_price = float((unrealized_pnl / (size * direction)) + avg_price)
         else:
-            df.loc[x, "position_market"] = ""
-            df.loc[x, "position_side"] = ""
-            df.loc[x, "position_size"] = None
-            df.loc[x, "position_avg_price"] = None
-            df.loc[x, "position_mark_price"] = None
-            df.loc[x, "position_liq_price"] = None
-            df.loc[x, "position_pnl"] = None
-            df.loc[x, "position_ltv"] = None
-
-        time.sleep(random.randint(3, 5))
-
-    df.to_excel(DATA_DIR + "/accounts_paradex.xlsx", index=False)
-    logger.success(f"Paradex: updated balances and open positions for {df.shape[0]} accounts.")
+            mark_price = 0.0
+
+        row.update({
+            "position_market": str(pos.get("market", "")),
+            "position_side": str(side),
+            "position_size": float(size),
+            "position_avg_price": float(avg_price),
+            "position_mark_price": mark_price,
+            "position_liq_price": liq_price,
+            "position_pnl": float(unrealized_pnl),
+            "position_ltv": calc_ltv(side, mark_price, liq_price),
+        })
+        return row
+
+    row.update(EMPTY_POSITION)
+    return row
+
+
+def fetch_backpack_account_info(data: pd.Series) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+
+    balance_data = retry_call(get_balance_backpack, data["api_key"], data["api_secret"], data["proxy"])
+    row["USDC"] = float(balance_data["USDC"]["available"])
+
+    positions_data = retry_call(get_open_positions_backpack, data["api_key"], data["api_secret"], data["proxy"])
+
+    pos = next(
+        (p for p in positions_data if Decimal(p.get("netQuantity", "0")) != 0),
+        None
+    )
+
+    if pos is None:
+        row.update(EMPTY_POSITION)
+        return row
+
+    side = "SHORT" if Decimal(pos["netQuantity"]) < 0 else "LONG"
+    mark_price = float(Decimal(pos["markPrice"]))
+    liq_price = float(pos.get("estLiquidationPrice", 0))
+
+    row.update({
+        "position_market": pos.get("symbol", ""),
+        "position_side": side,
+        "position_size": float(abs(Decimal(pos["netQuantity"]))),
+        "position_avg_price": float(Decimal(pos["entryPrice"])),
+        "position_mark_price": mark_price,
+        "position_liq_price": liq_price,
+        "position_pnl": float(Decimal(pos["pnlUnrealized"])),
+        "position_ltv": calc_ltv(side, mark_price, liq_price),
+    })
+    return row
+
+
+def refresh_accounts(df: pd.DataFrame, exchange: str, fetch: Callable[[pd.Series], Dict[str, Any]]) -> pd.DataFrame:
+    refresh_cfg = _refresh_config()
+    indexes = [idx for idx in df.index if df.loc[idx, "is_active"]]
+    random.shuffle(indexes)
+    total = len(indexes)
+    progress_step = max(total // 10, 1)
+
+    results: Dict[int, Dict[str, Any]] = {}
+    failures: Dict[int, Exception] = {}
+
+    with ThreadPoolExecutor(max_workers=refresh_cfg.get("workers", 8), thread_name_prefix=f"Refresh-{exchange}") as executor:
+        futures = {executor.submit(fetch, df.loc[idx]): idx for idx in indexes}
+        for done, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as exc:
+                failures[idx] = exc
+                logger.error(f"{exchange}: failed to refresh account in row {idx + 2}: {exc}")
 
+            if done % progress_step == 0 or done == total:
+                logger.info(f"{exchange}: refreshed {done}/{total} accounts")
 
-def update_backpack_accounts_info():
-    df = pd.read_excel(DATA_DIR + "/accounts_backpack.xlsx")
+    if results:
+        updates = pd.DataFrame.from_dict(results, orient="index")
+        for col in updates.columns:
+            if col not in df.columns:
+                df[col] = None
+        df.loc[updates.index, updates.columns] = updates.astype(object)
 
-    df = df.sample(frac=1).reset_index(drop=True)
+    if failures:
+        raise RuntimeError(f"{exchange}: failed to refresh {len(failures)} of {total} accounts")
 
-    for x in range(df.shape[0]):
-        data = df.iloc[x]
+    return df
 
-        if not data["is_active"]:
-            continue
 
-        balance_data = _retry_request(get_balance_backpack, data["api_key"], data["api_secret"], data["proxy"])
-        df.loc[x, "USDC"] = float(balance_data["USDC"]["available"])
-
-        positions_data = _retry_request(get_open_positions_backpack, data["api_key"], data["api_secret"], data["proxy"])
-        
-        first_open_position = next(
-            (p for p in positions_data if Decimal(p.get("netQuantity", "0")) != 0),
-            None
-        )
-
-        if first_open_position:
-            pos = first_open_position
-            side = "SHORT" if Decimal(pos["netQuantity"]) < 0 else "LONG"
-            size = abs(Decimal(pos["netQuantity"]))
-            avg_price = Decimal(pos["entryPrice"])
-            mark_price = Decimal(pos["markPrice"])
-            unrealized_pnl = Decimal(pos["pnlUnrealized"])
-            liq_price = float(pos.get("estLiquidationPrice", 0))
-
-            df.loc[x, "position_market"] = pos.get("symbol", "")
-            df.loc[x, "position_side"] = side
-            df.loc[x, "position_size"] = float(size)
-            df.loc[x, "position_avg_price"] = float(avg_price)
-            df.loc[x, "position_mark_price"] = float(mark_price)
-            df.loc[x, "position_liq_price"] = liq_price
-            df.loc[x, "position_pnl"] = float(unrealized_pnl)
-
-            if liq_price > 0 and mark_price > 0:
-                if side == "SHORT":
-                    ltv = float(mark_price) / liq_price
-                elif side == "LONG":
-                    ltv = liq_price / float(mark_price)
-                else:
-                    ltv = None
-            else:
-                ltv = None
-
-            df.loc[x, "position_ltv"] = ltv
-        else:
-            df.loc[x, "position_market"] = ""
-            df.loc[x, "position_side"] = ""
-            df.loc[x, "position_size"] = None
-            df.loc[x, "position_avg_price"] = None
-            df.loc[x, "position_mark_price"] = None
-            df.loc[x, "position_liq_price"] = None
-            df.loc[x, "position_pnl"] = None
-            df.loc[x, "position_ltv"] = None
+def update_paradex_accounts_info():
+    df = load_accounts("accounts_paradex")
 
-        time.sleep(random.randint(3, 5))
+    try:
+        refresh_accounts(df, "Paradex", fetch_paradex_account_info)
+    finally:
+        save_accounts("accounts_paradex", df)
+
+    logger.success(f"Paradex: updated balances and open positions for {df.shape[0]} accounts.")
+
+
+def update_backpack_accounts_info():
+    df = load_accounts("accounts_backpack")
 
+    try:
+        refresh_accounts(df, "Backpack", fetch_backpack_account_info)
+    finally:
+        save_accounts("accounts_backpack", df)
 
-    df.to_excel(DATA_DIR + "/accounts_backpack.xlsx", index=False)
     logger.success(f"Backpack: updated balances and open positions for {df.shape[0]} accounts.")
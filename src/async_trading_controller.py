@@ -0,0 +1,533 @@
+import asyncio
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from src.backpack.account import get_balance_async as get_balance_backpack_async
+from src.backpack.account import get_last_position_info_async as get_last_position_info_backpack_async
+from src.backpack.market import get_pair_data as get_pair_data_backpack
+from src.backpack.order_stream import get_order_stream as get_order_stream_backpack
+from src.backpack.trade import close_last_position_async as close_last_position_backpack_async
+from src.backpack.trade import open_position_async as open_position_backpack_async
+from src.backpack.trade import prepare_order as prepare_order_backpack
+from src.backpack.trade import reconcile_close_async as reconcile_close_backpack_async
+from src.backpack.trade import submit_order_async as submit_order_backpack_async
+from src.config.constants import logger
+from src.paradex.account import get_balance_async as get_balance_paradex_async
+from src.paradex.account import get_last_position_info_async as get_last_position_info_paradex_async
+from src.paradex.auth import get_account, get_jwt_token_async
+from src.paradex.market import get_pair_data as get_pair_data_paradex
+from src.paradex.market import get_pair_price
+from src.paradex.order_stream import get_order_stream as get_order_stream_paradex
+from src.paradex.trade import close_last_position_async as close_last_position_paradex_async
+from src.paradex.trade import open_position_async as open_position_paradex_async
+from src.paradex.trade import prepare_order as prepare_order_paradex
+from src.paradex.trade import reconcile_close_async as reconcile_close_paradex_async
+from src.paradex.trade import submit_order_async as submit_order_paradex_async
+from src.paradex_pair_metrics import start_market_refresher
+from src.position_manager import LegFill, TradingManager
+from src.trading_controller import load_active_accounts
+from utils.calc import calc_size
+from utils.data import USER_CONFIG
+from utils.retry import async_retry_call, get_retry_policy
+from utils.sessions import close_async_sessions
+
+
+class AsyncTradingManager:
+    """Runs a TradingManager's cycle on the event loop.
+
+    HTTP, fill confirmation, position polling and retry backoff are awaited, so a pair holds no thread
+    while it waits; the executor only runs short blocking steps (order signing, state writes, REST price
+    refreshes). Decisions that need no I/O are delegated to the wrapped TradingManager.
+    """
+
+    def __init__(self, manager: TradingManager, executor: ThreadPoolExecutor, stop_event: asyncio.Event) -> None:
+        self.manager = manager
+        self.executor = executor
+        self.stop_event = stop_event
+        self.log_prefix = f"[{manager.thread_id}] [{manager.short_pk_paradex}] [{manager.short_pk_backpack}]"
+        self._paradex_account = None
+
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def wait(self, seconds: float) -> bool:
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout=max(seconds, 0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def get_paradex_account(self):
+        if self._paradex_account is None:
+            creds = self.manager.paradex_creds
+            # Deriving the key pair is CPU work; the account is cached afterwards.
+            self._paradex_account = await self.run_blocking(get_account, creds["address"], creds["private_key"])
+        return self._paradex_account
+
+    async def start_trading(self) -> None:
+        while not self.stop_event.is_set():
+            token, size, order_value, order_duration = await self.prepare_trade()
+
+            try:
+                await self.open_positions(size, token)
+            except RuntimeError as exc:
+                logger.error(f"{self.log_prefix} Trade aborted: {exc}")
+                break
+
+            logger.info(f"{self.log_prefix} Positions opened, waiting {order_duration} min")
+            await self.monitor_ltv(order_duration)
+
+            if self.stop_event.is_set():
+                logger.info(f"{self.log_prefix} Task stopped")
+                break
+
+            await self.close_positions()
+
+            delay_between_cycles = self.manager.get_random_from_range("delay_between_trading_cycles_min")
+            logger.info(f"{self.log_prefix} Waiting {delay_between_cycles} min for next cycle")
+            if await self.wait(delay_between_cycles * 60):
+                break
+
+    async def prepare_trade(self) -> Tuple[str, Decimal, float, int]:
+        order_value = self.manager.get_random_from_range("order_value_usd")
+        order_duration = self.manager.get_random_from_range("order_duration_min")
+
+        token = await self.run_blocking(self.manager.select_token)
+
+        max_order_value = await self.get_max_order_value()
+        order_value = min(order_value, max_order_value)
+
+        current_price = await self.run_blocking(get_pair_price, token)
+        size = calc_size(order_value, token, current_price)
+
+        logger.info(f"{self.log_prefix} Starting trade: {token}, ${order_value}, {order_duration} min, Size: {size}")
+        return token, size, order_value, order_duration
+
+    async def get_max_order_value(self) -> float:
+        paradex_account = await self.get_paradex_account()
+        creds = self.manager.backpack_creds
+        paradex_balance_json, backpack_balance_json = await asyncio.gather(
+            get_balance_paradex_async(paradex_account, self.manager.paradex_creds["proxy"]),
+            get_balance_backpack_async(creds["api_key"], creds["api_secret"], creds["proxy"]),
+        )
+        return self.manager.max_order_value(paradex_balance_json, backpack_balance_json)
+
+    async def open_paradex_leg(
+        self,
+        paradex_account,
+        side: str,
+        market: str,
+        size: str,
+        prepared: Optional[dict] = None,
+        abort: Optional[asyncio.Event] = None
+    ) -> Optional[LegFill]:
+        manager = self.manager
+        proxy = manager.paradex_creds["proxy"]
+        prepared_payloads = [prepared] if prepared else []
+
+        async def submit() -> LegFill:
+            if prepared_payloads:
+                order_payload = prepared_payloads.pop()
+            else:
+                order_payload = await self.run_blocking(prepare_order_paradex, paradex_account, side, market, size)
+            order = await submit_order_paradex_async(paradex_account, order_payload, proxy)
+            return LegFill(order.get("filled_size"), order.get("filled_at"))
+
+        async def reconcile() -> Optional[LegFill]:
+            position = await get_last_position_info_paradex_async(paradex_account, proxy)
+            return LegFill() if position and position.get("market") == market else None
+
+        try:
+            fill = await async_retry_call(submit, idempotent=False, reconcile=reconcile, stop_event=abort)
+        except Exception as exc:
+            logger.warning(f"[{manager.thread_id}] [{manager.short_pk_paradex}] Paradex {side} failed: {exc}")
+            return None
+
+        logger.info(f"[{manager.thread_id}] [{manager.short_pk_paradex}] Paradex {side} opened")
+        return fill
+
+    async def open_backpack_leg(
+        self,
+        side: str,
+        symbol: str,
+        size: str,
+        prepared: Optional[Tuple[dict, dict]] = None,
+        abort: Optional[asyncio.Event] = None
+    ) -> Optional[LegFill]:
+        manager = self.manager
+        creds = manager.backpack_creds
+        prepared_orders = [prepared] if prepared else []
+
+        async def submit() -> LegFill:
+            if prepared_orders:
+                order_payload, headers = prepared_orders.pop()
+            else:
+                order_payload, headers = prepare_order_backpack(creds["api_key"], creds["api_secret"], side, symbol, size)
+            order = await submit_order_backpack_async(creds["api_secret"], order_payload, headers, creds["proxy"])
+            return LegFill(order.get("filledQuantity"), order.get("filledAt"))
+
+        async def reconcile() -> Optional[LegFill]:
+            position = await get_last_position_info_backpack_async(creds["api_key"], creds["api_secret"], creds["proxy"])
+            return LegFill() if position and position.get("symbol") == symbol else None
+
+        try:
+            fill = await async_retry_call(submit, idempotent=False, reconcile=reconcile, stop_event=abort)
+        except Exception as exc:
+            logger.warning(f"[{manager.thread_id}] [{manager.short_pk_backpack}] Backpack {side} failed: {exc}")
+            return None
+
+        logger.info(f"[{manager.thread_id}] [{manager.short_pk_backpack}] Backpack {side} opened")
+        return fill
+
+    async def open_legs_sequentially(self, paradex_account, paradex_side: str, market_paradex: str, backpack_side: str, market_backpack: str, size: str) -> Tuple[LegFill, LegFill]:
+        filled_pd = await self.open_paradex_leg(paradex_account, paradex_side, market_paradex, size)
+        if filled_pd is None:
+            logger.error(f"{self.log_prefix} Failed to open positions")
+            await self.close_positions()
+            raise RuntimeError("Unable to open position on Paradex")
+
+        filled_bp = await self.open_backpack_leg(backpack_side, market_backpack, size)
+        if filled_bp is None:
+            logger.error(f"{self.log_prefix} Failed to open positions")
+            await self.close_positions()
+            raise RuntimeError("Unable to open position on Backpack")
+
+        return filled_pd, filled_bp
+
+    async def open_legs_concurrently(self, paradex_account, paradex_side: str, market_paradex: str, backpack_side: str, market_backpack: str, size: str) -> Tuple[LegFill, LegFill]:
+        creds = self.manager.backpack_creds
+        await get_jwt_token_async(paradex_account, self.manager.paradex_creds["proxy"])
+        prepared_pd = await self.run_blocking(prepare_order_paradex, paradex_account, paradex_side, market_paradex, size)
+        prepared_bp = prepare_order_backpack(creds["api_key"], creds["api_secret"], backpack_side, market_backpack, size)
+
+        # As in TradingManager: a leg that fails stops the other one from retrying.
+        abort = asyncio.Event()
+
+        async def open_leg(leg) -> Optional[LegFill]:
+            fill = await leg
+            if fill is None:
+                abort.set()
+            return fill
+
+        filled_pd, filled_bp = await asyncio.gather(
+            open_leg(self.open_paradex_leg(paradex_account, paradex_side, market_paradex, size, prepared_pd, abort)),
+            open_leg(self.open_backpack_leg(backpack_side, market_backpack, size, prepared_bp, abort)),
+        )
+
+        if filled_pd is not None and filled_bp is not None:
+            self.manager.log_hedge_gap(filled_pd, filled_bp)
+            return filled_pd, filled_bp
+
+        logger.error(f"{self.log_prefix} Failed to open positions")
+        logger.warning(f"{self.log_prefix} Unwinding opened legs")
+        await asyncio.gather(self.close_paradex_leg(paradex_account), self.close_backpack_leg())
+
+        if filled_pd is not None:
+            raise RuntimeError("Unable to open position on Backpack")
+        if filled_bp is not None:
+            raise RuntimeError("Unable to open position on Paradex")
+        raise RuntimeError("Unable to open positions on Paradex and Backpack")
+
+    async def balance_legs(
+        self,
+        paradex_account,
+        paradex_side: str,
+        pair_data_pd: dict,
+        backpack_side: str,
+        pair_data_bp: dict,
+        size_pd: float,
+        size_bp: float
+    ) -> bool:
+        manager = self.manager
+        try:
+            imbalance = manager.leg_imbalance(pair_data_pd, pair_data_bp, size_pd, size_bp)
+        except RuntimeError:
+            await self.close_positions()
+            raise
+        if imbalance is None:
+            return False
+
+        venue, excess = imbalance
+        try:
+            if venue == "Paradex":
+                order = await async_retry_call(
+                    open_position_paradex_async, paradex_account, manager.opposite_order_side(paradex_side), pair_data_pd["symbol"],
+                    str(excess), manager.paradex_creds["proxy"], reduce_only=True, idempotent=False
+                )
+                trimmed = order.get("filled_size")
+            else:
+                order = await async_retry_call(
+                    open_position_backpack_async, manager.backpack_creds["api_key"], manager.backpack_creds["api_secret"],
+                    "Bid" if backpack_side == "Ask" else "Ask", pair_data_bp["symbol"], str(excess),
+                    manager.backpack_creds["proxy"], reduce_only=True, idempotent=False
+                )
+                trimmed = order.get("filledQuantity")
+            if trimmed is not None and Decimal(str(trimmed)) < excess:
+                raise RuntimeError(f"trim filled only {trimmed} of {excess}")
+        except Exception as exc:
+            logger.error(f"{self.log_prefix} Failed to trim {venue}: {exc}, unwinding")
+            await self.close_positions()
+            raise RuntimeError("Unable to match partially filled legs") from exc
+
+        return True
+
+    async def wait_for_positions(self, paradex_account) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        execution_cfg = self.manager.config.get("execution", {})
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + execution_cfg.get("confirm_timeout_sec", 15)
+        poll_interval = execution_cfg.get("confirm_poll_interval_sec", 1)
+        proxy_pd = self.manager.paradex_creds["proxy"]
+        creds = self.manager.backpack_creds
+
+        async def read_paradex(last: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            return last or await get_last_position_info_paradex_async(paradex_account, proxy_pd)
+
+        async def read_backpack(last: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            return last or await get_last_position_info_backpack_async(creds["api_key"], creds["api_secret"], creds["proxy"])
+
+        last_pd = None
+        last_bp = None
+        while True:
+            last_pd, last_bp = await asyncio.gather(read_paradex(last_pd), read_backpack(last_bp))
+
+            if (last_pd and last_bp) or loop.time() >= deadline:
+                return last_pd, last_bp
+            await asyncio.sleep(poll_interval)
+
+    async def open_positions(self, size: str, token: str) -> None:
+        manager = self.manager
+        paradex_account = await self.get_paradex_account()
+        pk_paradex = hex(paradex_account.signer.private_key)
+
+        paradex_side = random.choice(["BUY", "SELL"])
+        backpack_side = manager.opposite_side(paradex_side)
+
+        pair_data_pd = get_pair_data_paradex(token)
+        pair_data_bp = get_pair_data_backpack(token)
+        market_paradex = pair_data_pd["symbol"]
+        market_backpack = pair_data_bp["symbol"]
+
+        logger.info(
+            f"{self.log_prefix} Opening: Paradex {paradex_side} ({market_paradex}), Backpack {backpack_side} ({market_backpack}), Size: {size}"
+        )
+
+        connect_timeout = manager.config.get("order_stream", {}).get("connect_timeout_sec", 2)
+        creds = manager.backpack_creds
+        streams = (
+            get_order_stream_paradex(paradex_account, manager.paradex_creds["proxy"]),
+            get_order_stream_backpack(creds["api_key"], creds["api_secret"], creds["proxy"]),
+        )
+        await asyncio.gather(*(stream.wait_connected_async(connect_timeout) for stream in streams))
+
+        if manager.config.get("execution", {}).get("mode", "sequential") == "concurrent":
+            filled_pd, filled_bp = await self.open_legs_concurrently(paradex_account, paradex_side, market_paradex, backpack_side, market_backpack, size)
+        else:
+            filled_pd, filled_bp = await self.open_legs_sequentially(paradex_account, paradex_side, market_paradex, backpack_side, market_backpack, size)
+
+        last_pd, last_bp = await self.wait_for_positions(paradex_account)
+
+        try:
+            manager.check_positions_visible(last_pd, last_bp)
+        except RuntimeError:
+            await self.close_positions()
+            raise
+
+        size_pd, size_bp = manager.leg_sizes(filled_pd, filled_bp, last_pd, last_bp)
+        if await self.balance_legs(paradex_account, paradex_side, pair_data_pd, backpack_side, pair_data_bp, size_pd, size_bp):
+            last_pd, last_bp = await self.wait_for_positions(paradex_account)
+
+        await self.run_blocking(
+            manager.record_positions, pk_paradex, paradex_side, backpack_side, market_paradex, market_backpack, last_pd, last_bp
+        )
+
+    async def close_paradex_leg(self, paradex_account) -> bool:
+        manager = self.manager
+        proxy = manager.paradex_creds["proxy"]
+        try:
+            await async_retry_call(
+                close_last_position_paradex_async, paradex_account, proxy,
+                idempotent=False, reconcile=lambda: reconcile_close_paradex_async(paradex_account, proxy)
+            )
+        except Exception as exc:
+            logger.warning(f"[{manager.thread_id}] [{manager.short_pk_paradex}] Paradex close failed: {exc}")
+            return False
+
+        logger.debug(f"[{manager.thread_id}] [{manager.short_pk_paradex}] Paradex closed")
+        return True
+
+    async def close_backpack_leg(self) -> bool:
+        manager = self.manager
+        creds = (manager.backpack_creds["api_key"], manager.backpack_creds["api_secret"], manager.backpack_creds["proxy"])
+        try:
+            await async_retry_call(
+                close_last_position_backpack_async, *creds,
+                idempotent=False, reconcile=lambda: reconcile_close_backpack_async(*creds)
+            )
+        except Exception as exc:
+            logger.warning(f"[{manager.thread_id}] [{manager.short_pk_backpack}] Backpack close failed: {exc}")
+            return False
+
+        logger.debug(f"[{manager.thread_id}] [{manager.short_pk_backpack}] Backpack closed")
+        return True
+
+    async def close_positions(self) -> None:
+        paradex_account = await self.get_paradex_account()
+
+        logger.info(f"{self.log_prefix} Closing positions")
+
+        paradex_success, backpack_success = await asyncio.gather(
+            self.close_paradex_leg(paradex_account), self.close_backpack_leg()
+        )
+        self.manager.settle_closed_legs(paradex_success, backpack_success)
+
+    async def check_ltv(self) -> bool:
+        if not self.manager.report_breach():
+            return False
+        await self.close_positions()
+        return True
+
+    async def monitor_ltv(self, duration_min: int) -> None:
+        logger.info(f"{self.log_prefix} Monitoring LTV for {duration_min} min")
+        loop = asyncio.get_running_loop()
+        breach_event = asyncio.Event()
+
+        def on_breach(leg_id: str, ltv: float) -> None:
+            loop.call_soon_threadsafe(breach_event.set)
+
+        self.manager.add_breach_listener(on_breach)
+        try:
+            if self.manager.risk_event.is_set():
+                breach_event.set()
+
+            end_time = loop.time() + duration_min * 60
+            while loop.time() < end_time and not self.stop_event.is_set():
+                # Same as TradingManager.monitor_ltv: breaches arrive from price ticks, and every
+                # ltv_checks_sec the legs are repriced over REST in case a feed went quiet.
+                wait_time = min(self.manager.get_random_from_range("ltv_checks_sec"), max(end_time - loop.time(), 0))
+                waiters = [asyncio.create_task(self.stop_event.wait()), asyncio.create_task(breach_event.wait())]
+                try:
+                    await asyncio.wait(waiters, timeout=wait_time, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    for waiter in waiters:
+                        waiter.cancel()
+
+                if self.stop_event.is_set():
+                    break
+                if not breach_event.is_set():
+                    await self.run_blocking(self.manager.refresh_ltv)
+                if await self.check_ltv():
+                    self.stop_event.set()
+                    return
+                breach_event.clear()
+        finally:
+            self.manager.remove_breach_listener(on_breach)
+
+        logger.info(f"{self.log_prefix} LTV monitoring finished")
+
+
+class AsyncTradingController:
+    def __init__(self) -> None:
+        self.config: Dict[str, Any] = USER_CONFIG
+        self.retries = self.config["retries"]
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def run_trading_managers(self) -> None:
+        try:
+            asyncio.run(self._run_trading_managers())
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_trading_managers(self) -> None:
+        df_paradex = await asyncio.to_thread(load_active_accounts, "accounts_paradex")
+        df_backpack = await asyncio.to_thread(load_active_accounts, "accounts_backpack")
+
+        n_workers = min(len(df_paradex), len(df_backpack))
+        # Waits are awaited on the loop, so the pool only runs short blocking steps (signing, state
+        # writes) and stays at a fixed size however many pairs run. It is also the loop's default
+        # executor, which asyncio.to_thread in the exchange modules uses.
+        io_workers = self.config.get("async_engine", {}).get("io_workers", 32)
+        self.executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="AsyncIO")
+        asyncio.get_running_loop().set_default_executor(self.executor)
+        logger.info(f"Starting {n_workers} trading tasks on {io_workers} worker threads")
+        start_market_refresher()
+
+        delay_cfg = self.config["delay_between_starting_new_thread_sec"]
+        start_delay = 0
+        for n in range(n_workers):
+            stop_event = asyncio.Event()
+            task = asyncio.create_task(
+                self._pair_worker(str(n), df_paradex.iloc[n], df_backpack.iloc[n], stop_event, start_delay),
+                name=f"Task-{n}",
+            )
+            self.tasks[f"Task-{n}"] = {"task": task, "stop_event": stop_event}
+            start_delay += random.randint(delay_cfg["min"], delay_cfg["max"])
+
+        try:
+            await asyncio.gather(*(info["task"] for info in self.tasks.values()), return_exceptions=True)
+        finally:
+            await close_async_sessions()
+        logger.info("All tasks finished")
+
+    async def _pair_worker(
+        self,
+        task_id: str,
+        paradex_data: pd.Series,
+        backpack_data: pd.Series,
+        stop_event: asyncio.Event,
+        start_delay: float
+    ) -> None:
+        short_pk_paradex = paradex_data["private_key"][:10]
+        short_pk_backpack = backpack_data["api_secret"][:10]
+
+        manager = TradingManager(
+            paradex_address=paradex_data["address"],
+            paradex_private_key=paradex_data["private_key"],
+            paradex_proxy=paradex_data["proxy"],
+            backpack_api_key=backpack_data["api_key"],
+            backpack_api_secret=backpack_data["api_secret"],
+            backpack_proxy=backpack_data["proxy"],
+            thread_id=task_id
+        )
+        runner = AsyncTradingManager(manager, self.executor, stop_event)
+
+        if await runner.wait(start_delay):
+            return
+        logger.debug(f"[{task_id}] Starting task with Paradex {short_pk_paradex} and Backpack {short_pk_backpack}")
+
+        policy = get_retry_policy()
+        delay = policy.base_delay_sec
+        attempts = 0
+        while attempts < self.retries and not stop_event.is_set():
+            try:
+                await runner.start_trading()
+                break
+            except Exception as exc:
+                attempts += 1
+                logger.error(f"[{task_id}] [{short_pk_paradex}] [{short_pk_backpack}] Error (Attempt {attempts}/{self.retries}): {exc}")
+
+                try:
+                    await runner.close_positions()
+                except Exception as close_exc:
+                    logger.error(f"[{task_id}] [{short_pk_paradex}] [{short_pk_backpack}] Close failed: {close_exc}")
+
+                if attempts < self.retries:
+                    delay = policy.next_delay(delay)
+                    logger.info(f"[{task_id}] [{short_pk_paradex}] [{short_pk_backpack}] Retrying after {delay:.1f}s")
+                    await runner.wait(delay)
+                else:
+                    logger.error(f"[{task_id}] [{short_pk_paradex}] [{short_pk_backpack}] Failed after {self.retries} attempts")
+
+    def stop_task(self, task_id: str) -> None:
+        if task_id in self.tasks:
+            logger.info(f"[{task_id.split('-')[1]}] Stopping task")
+            self.tasks[task_id]["stop_event"].set()
+        else:
+            logger.warning(f"[{task_id}] Task not found")
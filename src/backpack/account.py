@@ -1,11 +1,10 @@
-import requests
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 
 from src.backpack.auth import get_auth_headers
 from src.config.constants import BACKPACK_HTTP_URL
-from utils.proxy import convert_proxy_to_dict
-from utils.general import _retry_request
+from utils.sessions import async_http_get, http_get
+from utils.retry import async_retry_call, retry_call
 
 def get_balance(api_key: str, api_secret: str, proxy: str):
     url = f"{BACKPACK_HTTP_URL}/capital"
@@ -16,12 +15,26 @@ def get_balance(api_key: str, api_secret: str, proxy: str):
         instruction="balanceQuery"
     )
 
-    response = requests.get(url, headers=headers, proxies=convert_proxy_to_dict(proxy))
+    response = http_get("backpack", url, proxy, headers=headers)
     response.raise_for_status()
-    balances = response.json()
+    return _add_lend_positions(response.json(), get_lend_positions(api_key, api_secret, proxy))
 
-    lend_positions = get_lend_positions(api_key, api_secret, proxy)
 
+async def get_balance_async(api_key: str, api_secret: str, proxy: str):
+    url = f"{BACKPACK_HTTP_URL}/capital"
+
+    headers = get_auth_headers(
+        api_key=api_key,
+        ed25519_private_key_base64=api_secret,
+        instruction="balanceQuery"
+    )
+
+    response = await async_http_get("backpack", url, proxy, headers=headers)
+    response.raise_for_status()
+    return _add_lend_positions(response.json(), await get_lend_positions_async(api_key, api_secret, proxy))
+
+
+def _add_lend_positions(balances: dict, lend_positions: list) -> dict:
     for position in lend_positions:
         symbol = position.get("symbol")
         quantity = float(position.get("netQuantity", "0"))
@@ -42,11 +55,20 @@ def get_balance(api_key: str, api_secret: str, proxy: str):
     return balances
 
 
-def get_lend_positions(api_key: str, api_secret: str, proxy: str = None):
+def get_lend_positions(api_key: str, api_secret: str, proxy: Optional[str] = None):
+    url = f"{BACKPACK_HTTP_URL}/borrowLend/positions"
+    headers = get_auth_headers(api_key, api_secret, instruction="borrowLendPositionQuery")
+
+    response = http_get("backpack", url, proxy, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_lend_positions_async(api_key: str, api_secret: str, proxy: Optional[str] = None):
     url = f"{BACKPACK_HTTP_URL}/borrowLend/positions"
     headers = get_auth_headers(api_key, api_secret, instruction="borrowLendPositionQuery")
 
-    response = requests.get(url, headers=headers, proxies=convert_proxy_to_dict(proxy), timeout=10)
+    response = await async_http_get("backpack", url, proxy, headers=headers)
     response.raise_for_status()
     return response.json()
 
@@ -60,18 +82,36 @@ def get_open_positions(api_key: str, api_secret: str, proxy: str):
         instruction="positionQuery"
     )
 
-    response = requests.get(url, headers=headers, proxies=convert_proxy_to_dict(proxy))
+    response = http_get("backpack", url, proxy, headers=headers)
     response.raise_for_status()
     return response.json()
 
 
-def get_last_position_info(api_key: str, api_secret: str, proxy: str) -> Optional[Dict[str, Any]]:
-    position_data = _retry_request(get_open_positions, api_key, api_secret, proxy)
+async def get_open_positions_async(api_key: str, api_secret: str, proxy: str):
+    url = f"{BACKPACK_HTTP_URL}/position"
+
+    headers = get_auth_headers(
+        api_key=api_key,
+        ed25519_private_key_base64=api_secret,
+        instruction="positionQuery"
+    )
 
-    first_open_position = next(
+    response = await async_http_get("backpack", url, proxy, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def _first_open_position(position_data: list) -> Optional[Dict[str, Any]]:
+    return next(
         (p for p in position_data if Decimal(p.get("netQuantity", "0")) != 0),
         None
     )
 
-    return first_open_position
+
+def get_last_position_info(api_key: str, api_secret: str, proxy: str) -> Optional[Dict[str, Any]]:
+    return _first_open_position(retry_call(get_open_positions, api_key, api_secret, proxy))
+
+
+async def get_last_position_info_async(api_key: str, api_secret: str, proxy: str) -> Optional[Dict[str, Any]]:
+    return _first_open_position(await async_retry_call(get_open_positions_async, api_key, api_secret, proxy))
 
@@ -1,33 +1,55 @@
 import base64
+import functools
 import time
-import urllib.parse
+from typing import Any
 from nacl.signing import SigningKey
 
+from utils.metrics import SIGNING_DURATION
 
-def sign_request(
+
+class BackpackSigner:
+    def __init__(self, ed25519_private_key_base64: str) -> None:
+        self._signing_key = SigningKey(base64.b64decode(ed25519_private_key_base64))
+
+    def sign(self, message: str) -> str:
+        signed_message = self._signing_key.sign(message.encode("utf-8"))
+        return base64.b64encode(signed_message.signature).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def get_signer(ed25519_private_key_base64: str) -> BackpackSigner:
+    return BackpackSigner(ed25519_private_key_base64)
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def build_signing_string(
     instruction: str,
     timestamp: str,
     window: str,
-    ed25519_private_key_base64: str,
     data: dict | None = None
 ) -> str:
-    if data is not None:
-        url_params = urllib.parse.urlencode(data)
-        signing_string = f"instruction={instruction}&timestamp={timestamp}&window={window}&{url_params}"
-    else:
-        signing_string = f"instruction={instruction}&timestamp={timestamp}&window={window}"
-
-    components = signing_string.split('&')
-    key_value_pairs = [component.split('=') for component in components]
-    sorted_pairs = sorted(key_value_pairs, key=lambda x: x[0])
-    sorted_query_string = '&'.join(['='.join(pair) for pair in sorted_pairs])
+    parts = [f"instruction={instruction}"]
+    if data:
+        parts.extend(f"{key}={_format_value(data[key])}" for key in sorted(data))
+    parts.append(f"timestamp={timestamp}")
+    parts.append(f"window={window}")
+    return "&".join(parts)
 
-    private_key_bytes = base64.b64decode(ed25519_private_key_base64)
-    signing_key = SigningKey(private_key_bytes)
-    signed_message = signing_key.sign(sorted_query_string.encode('utf-8'))
-    signature = base64.b64encode(signed_message.signature).decode('utf-8')
 
-    return signature
+def sign_request(
+    instruction: str,
+    timestamp: str,
+    window: str,
+    ed25519_private_key_base64: str,
+    data: dict | None = None
+) -> str:
+    signing_string = build_signing_string(instruction, timestamp, window, data)
+    return get_signer(ed25519_private_key_base64).sign(signing_string)
 
 
 def get_auth_headers(
@@ -38,7 +60,8 @@ def get_auth_headers(
 ) -> dict:
     timestamp = str(int(time.time() * 1000))
     window = '10000'
-    signature = sign_request(instruction, timestamp, window, ed25519_private_key_base64, data)
+    with SIGNING_DURATION.time(kind="backpack"):
+        signature = sign_request(instruction, timestamp, window, ed25519_private_key_base64, data)
 
     headers = {
         'X-API-Key': api_key,
@@ -1,18 +1,9 @@
-import json
-from pathlib import Path
-import requests
+from typing import List
 
-from src.config.paths import FUTURE_PAIRS_BACKPACK_PATH, DATA_DIR
+from src.config.paths import FUTURE_PAIRS_BACKPACK_PATH
 from src.config.constants import BACKPACK_HTTP_URL, logger
-from utils.data import load_json, _find_pair_by_key, _load_pairs
-
-
-def get_pair_data(token: str) -> dict:
-    return _find_pair_by_key("base_currency", token, FUTURE_PAIRS_BACKPACK_PATH)
-
-
-def get_pair_data_by_symbol(symbol: str) -> dict:
-    return _find_pair_by_key("symbol", symbol, FUTURE_PAIRS_BACKPACK_PATH)
+from utils.market_refresh import MarketChange, MarketSource, get_market_refresher
+from utils.markets import _find_pair_by_key
 
 
 def get_pair_data(token: str) -> dict:
@@ -21,17 +12,7 @@ def get_pair_data(token: str) -> dict:
 def get_pair_data_by_symbol(symbol: str) -> dict:
     return _find_pair_by_key("symbol", symbol, FUTURE_PAIRS_BACKPACK_PATH)
 
-def update_markets():
-    logger.info("Backpack futures pairs information update has started")
-    response = requests.get(f"{BACKPACK_HTTP_URL}/markets")
-    print(response.json())
-    try:
-        response.raise_for_status()
-    except requests.HTTPError as exc:
-        logger.error(f"Error fetching current futures pairs: {response.text}")
-        raise exc
-
-    data = response.json()
+def filter_markets(data: list) -> list:
     filtered_results = []
 
     for item in data:
@@ -47,8 +28,21 @@ def update_markets():
             })
             filtered_results.append(item)
 
-    file_path = Path(DATA_DIR) / "pairs_backpack.json"
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump({"results": filtered_results}, file, ensure_ascii=False, indent=2)
+    return filtered_results
+
+
+MARKET_SOURCE = MarketSource(
+    "backpack", f"{BACKPACK_HTTP_URL}/markets", FUTURE_PAIRS_BACKPACK_PATH, filter_markets,
+    fields=("baseSymbol", "stepSize", "tickSize", "filters.quantity.minQuantity", "marketType", "orderBookState"),
+)
+
+
+def update_markets() -> List[MarketChange]:
+    logger.info("Backpack futures pairs information update has started")
+
+    refresher = get_market_refresher()
+    refresher.add_source(MARKET_SOURCE)
+    changes = refresher.refresh(MARKET_SOURCE.exchange)
 
-    logger.success("Information on Backpack futures pairs has been updated")
+    logger.success(f"Information on Backpack futures pairs has been updated ({len(changes)} changes)")
+    return changes
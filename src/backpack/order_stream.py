@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.backpack.auth import get_auth_headers, sign_request
+from src.config.constants import BACKPACK_HTTP_URL, BACKPACK_WS_URL
+from utils.data import USER_CONFIG
+from utils.order_stream import OrderStream, OrderUpdate, close_idle_streams
+from utils.retry import ExchangeHTTPError
+from utils.sessions import async_http_get, http_get
+
+FINAL_STATUSES = {"Filled", "Cancelled", "Expired"}
+
+
+def parse_order(order: Dict[str, Any]) -> OrderUpdate:
+    """Build an OrderUpdate from a Backpack order, either the REST shape or the compact
+    ``account.orderUpdate`` event (``i``/``s``/``X``/``z``/``Z``)."""
+    order_id = order.get("id", order.get("i"))
+    status = order.get("status", order.get("X", ""))
+    executed = float(order.get("executedQuantity", order.get("z")) or 0)
+    executed_quote = float(order.get("executedQuoteQuantity", order.get("Z")) or 0)
+    # The stream's engine timestamp "T" is in microseconds; a REST order only has its creation
+    # time in milliseconds, which for a market order is when it filled.
+    if order.get("T"):
+        updated_at = int(order["T"]) / 1_000_000
+    elif str(order.get("createdAt", "")).isdigit():
+        updated_at = int(order["createdAt"]) / 1000
+    else:
+        updated_at = None
+    return OrderUpdate(
+        order_id=str(order_id),
+        market=order.get("symbol", order.get("s", "")),
+        status=status,
+        filled_size=executed,
+        avg_price=executed_quote / executed if executed else None,
+        final=status in FINAL_STATUSES,
+        reject_reason="" if status == "Filled" or executed else status,
+        updated_at=updated_at,
+    )
+
+
+def fetch_order(api_key: str, api_secret: str, symbol: str, order_id: str, proxy: Optional[str] = None) -> Optional[OrderUpdate]:
+    params = {"orderId": order_id, "symbol": symbol}
+    headers = get_auth_headers(api_key, api_secret, "orderQuery", params)
+    response = http_get("backpack", f"{BACKPACK_HTTP_URL}/order", proxy, headers=headers, params=params)
+    return _parse_fetched_order(response)
+
+
+async def fetch_order_async(api_key: str, api_secret: str, symbol: str, order_id: str, proxy: Optional[str] = None) -> Optional[OrderUpdate]:
+    params = {"orderId": order_id, "symbol": symbol}
+    headers = get_auth_headers(api_key, api_secret, "orderQuery", params)
+    response = await async_http_get("backpack", f"{BACKPACK_HTTP_URL}/order", proxy, headers=headers, params=params)
+    return _parse_fetched_order(response)
+
+
+def _parse_fetched_order(response) -> Optional[OrderUpdate]:
+    if response.status_code == 404:
+        # Backpack only serves open orders here; a 404 means it left the book and the stream has the outcome.
+        return None
+    if response.status_code != 200:
+        raise ExchangeHTTPError("Error receiving order info", response)
+    return parse_order(response.json())
+
+
+class BackpackOrderStream(OrderStream):
+    name = "backpack-orders"
+    ws_url = BACKPACK_WS_URL
+
+    def __init__(self, api_key: str, api_secret: str, proxy: Optional[str] = None, **kwargs) -> None:
+        super().__init__(proxy, **kwargs)
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+    def _open_messages(self) -> List[Dict[str, Any]]:
+        timestamp = str(int(time.time() * 1000))
+        window = "5000"
+        signature = sign_request("subscribe", timestamp, window, self.api_secret)
+        return [{
+            "method": "SUBSCRIBE",
+            "params": ["account.orderUpdate"],
+            "signature": [self.api_key, signature, timestamp, window],
+        }]
+
+    def _parse_message(self, message: Dict[str, Any]) -> Optional[OrderUpdate]:
+        if not message.get("stream", "").startswith("account.orderUpdate"):
+            return None
+        return parse_order(message.get("data", {}))
+
+
+_STREAMS: Dict[str, BackpackOrderStream] = {}
+_STREAMS_LOCK = threading.Lock()
+
+
+def get_order_stream(api_key: str, api_secret: str, proxy: Optional[str] = None) -> BackpackOrderStream:
+    stream = _STREAMS.get(api_key)
+    if stream is not None:
+        return stream
+
+    with _STREAMS_LOCK:
+        stream = _STREAMS.get(api_key)
+        if stream is None:
+            close_idle_streams(_STREAMS, USER_CONFIG.get("order_stream", {}).get("idle_timeout_sec", 1800))
+            stream = BackpackOrderStream(api_key, api_secret, proxy)
+            if USER_CONFIG.get("order_stream", {}).get("enabled", True):
+                stream.start()
+            _STREAMS[api_key] = stream
+    return stream
@@ -0,0 +1,71 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.constants import BACKPACK_HTTP_URL, BACKPACK_WS_URL, logger
+from utils.data import USER_CONFIG
+from utils.price_feed import PriceFeed
+from utils.retry import ExchangeHTTPError
+from utils.sessions import http_get
+
+
+def fetch_mark_price(symbol: str) -> float:
+    response = http_get("backpack", f"{BACKPACK_HTTP_URL}/markPrices", params={"symbol": symbol})
+    if response.status_code != 200:
+        logger.error(f"Error receiving Backpack mark price: {response.text}")
+        raise ExchangeHTTPError("Error receiving Backpack mark price", response)
+
+    data = response.json()
+    try:
+        entry = next(item for item in data if item["symbol"] == symbol)
+        return float(entry["markPrice"])
+    except (StopIteration, KeyError, ValueError, TypeError) as exc:
+        logger.error(f"Invalid mark price data format: {data}")
+        raise ValueError("Failed to parse mark price") from exc
+
+
+class BackpackPriceFeed(PriceFeed):
+    name = "backpack-mark"
+    ws_url = BACKPACK_WS_URL
+
+    def _subscribe_message(self, symbol: str, request_id: int) -> Dict[str, Any]:
+        return {
+            "method": "SUBSCRIBE",
+            "params": [f"markPrice.{symbol}"],
+            "id": request_id,
+        }
+
+    def _parse_message(self, message: Dict[str, Any]) -> Optional[Tuple[str, float, float]]:
+        if not message.get("stream", "").startswith("markPrice."):
+            return None
+
+        data = message.get("data", {})
+        mark_price = float(data["p"])
+        return data["s"], mark_price, mark_price
+
+    def _fetch_rest(self, symbol: str) -> Tuple[float, float]:
+        mark_price = fetch_mark_price(symbol)
+        return mark_price, mark_price
+
+
+_PRICE_FEED: Optional[BackpackPriceFeed] = None
+_PRICE_FEED_LOCK = threading.Lock()
+
+
+def get_price_feed() -> BackpackPriceFeed:
+    global _PRICE_FEED
+
+    if _PRICE_FEED is not None:
+        return _PRICE_FEED
+
+    with _PRICE_FEED_LOCK:
+        if _PRICE_FEED is None:
+            feed_cfg = USER_CONFIG.get("price_feed", {})
+            # markPrice is pushed about once a second, so a quote older than max_age_sec means the
+            # stream went quiet and the poll thread falls back to REST for that symbol.
+            feed = BackpackPriceFeed(
+                poll_interval_sec=feed_cfg.get("poll_interval_sec", 5),
+                max_age_sec=feed_cfg.get("max_age_sec", 5),
+            )
+            feed.start()
+            _PRICE_FEED = feed
+    return _PRICE_FEED
@@ -1,76 +1,222 @@
-import requests
+import asyncio
+from typing import Optional, Tuple
+
 from src.backpack.auth import get_auth_headers
 from src.config.constants import logger
 from utils.data import update_state
-from utils.proxy import convert_proxy_to_dict
+from utils.sessions import async_http_post, http_post
 from src.config.constants import BACKPACK_HTTP_URL
-from src.backpack.account import get_last_position_info
+from src.backpack.account import get_last_position_info, get_last_position_info_async
+from src.backpack.order_stream import fetch_order, fetch_order_async, get_order_stream, parse_order
+from utils.order_stream import wait_options
+from utils.retry import ExchangeHTTPError, OrderRejectedError
 
 
-def open_position(
+def prepare_order(
     api_key: str,
     ed25519_private_key_base64: str,
     side: str,
     symbol: str,
     quantity: str,
-    proxy_str: str = None
-):
-    short_pk = ed25519_private_key_base64[:10]
-    instruction = "orderExecute"
-
+    reduce_only: bool = False
+) -> Tuple[dict, dict]:
     order_payload = {
         "orderType": "Market",
         "symbol": symbol,
         "quantity": str(quantity),
         "side": side
     }
+    if reduce_only:
+        order_payload["reduceOnly"] = True
 
     headers = get_auth_headers(
         api_key=api_key,
         ed25519_private_key_base64=ed25519_private_key_base64,
-        instruction=instruction,
+        instruction="orderExecute",
         data=order_payload,
     )
+    return order_payload, headers
 
-    url = f"{BACKPACK_HTTP_URL}/order"
-    response = requests.post(
-        url,
-        headers=headers,
-        json=order_payload,
-        proxies=convert_proxy_to_dict(proxy_str),
-    )
 
-    if response.status_code in [200, 202]:
-        order = response.json()
-        update_state(ed25519_private_key_base64, "last_order", order)
+def open_position(
+    api_key: str,
+    ed25519_private_key_base64: str,
+    side: str,
+    symbol: str,
+    quantity: str,
+    proxy_str: Optional[str] = None,
+    reduce_only: bool = False
+):
+    order_payload, headers = prepare_order(api_key, ed25519_private_key_base64, side, symbol, quantity, reduce_only)
+    return submit_order(ed25519_private_key_base64, order_payload, headers, proxy_str)
+
+
+async def open_position_async(
+    api_key: str,
+    ed25519_private_key_base64: str,
+    side: str,
+    symbol: str,
+    quantity: str,
+    proxy_str: Optional[str] = None,
+    reduce_only: bool = False
+):
+    order_payload, headers = prepare_order(api_key, ed25519_private_key_base64, side, symbol, quantity, reduce_only)
+    return await submit_order_async(ed25519_private_key_base64, order_payload, headers, proxy_str)
+
+
+def _apply_fill(short_pk: str, order_payload: dict, order: dict, fill) -> dict:
+    if fill is not None and fill.reject_reason:
+        logger.error(
+            f"[{short_pk}] {order_payload['side']} {order_payload['quantity']} {order_payload['symbol']} — "
+            f"failed: {fill.reject_reason}"
+        )
+        raise OrderRejectedError(f"Order {fill.reject_reason.lower()}")
+
+    if fill is None:
+        logger.warning(
+            f"[{short_pk}] {order['side']} {order['quantity']} {order['symbol']} — "
+            f"market order sent, fill not confirmed in time, relying on position checks (id: {order.get('id', '')[:10]}...)"
+        )
+    else:
+        order["avgFillPrice"] = fill.avg_price
+        order["filledAt"] = fill.updated_at
+        order["filledQuantity"] = fill.filled_size
+        if fill.filled_size < float(order["quantity"]):
+            logger.warning(f"[{short_pk}] Order {order.get('id', '')[:10]}... filled only {fill.filled_size} of {order['quantity']}")
         logger.success(
             f"[{short_pk}] {order['side']} {order['quantity']} {order['symbol']} — "
-            f"market order sent (id: {order.get('id', '')[:10]}...)"
+            f"market order filled at {fill.avg_price} (id: {order.get('id', '')[:10]}...)"
         )
-        return order
+    return order
+
 
+def _order_failed(short_pk: str, order_payload: dict, response) -> ExchangeHTTPError:
     logger.error(
         f"[{short_pk}] {order_payload['side']} {order_payload['quantity']} {order_payload['symbol']} — "
         f"failed: {response.text}"
     )
-    raise ValueError("Backpack market order failed")
+    return ExchangeHTTPError("Backpack market order failed", response)
+
+
+def submit_order(
+    ed25519_private_key_base64: str,
+    order_payload: dict,
+    headers: dict,
+    proxy_str: Optional[str] = None
+):
+    short_pk = ed25519_private_key_base64[:10]
+
+    url = f"{BACKPACK_HTTP_URL}/order"
+    response = http_post("backpack", url, proxy_str, headers=headers, json=order_payload)
+
+    if response.status_code in [200, 202]:
+        order = response.json()
+        fill = parse_order(order)
+        if not fill.final:
+            api_key = headers["X-API-Key"]
+            fill = get_order_stream(api_key, ed25519_private_key_base64, proxy_str).wait_for_order(
+                fill.order_id,
+                lambda: fetch_order(api_key, ed25519_private_key_base64, order["symbol"], fill.order_id, proxy_str),
+                **wait_options()
+            )
+
+        order = _apply_fill(short_pk, order_payload, order, fill)
+        update_state(ed25519_private_key_base64, "last_order", order)
+        return order
+
+    raise _order_failed(short_pk, order_payload, response)
+
+
+async def submit_order_async(
+    ed25519_private_key_base64: str,
+    order_payload: dict,
+    headers: dict,
+    proxy_str: Optional[str] = None
+):
+    short_pk = ed25519_private_key_base64[:10]
+
+    url = f"{BACKPACK_HTTP_URL}/order"
+    response = await async_http_post("backpack", url, proxy_str, headers=headers, json=order_payload)
+
+    if response.status_code in [200, 202]:
+        order = response.json()
+        fill = parse_order(order)
+        if not fill.final:
+            api_key = headers["X-API-Key"]
+            order_id = fill.order_id
+            fill = await get_order_stream(api_key, ed25519_private_key_base64, proxy_str).wait_for_order_async(
+                order_id,
+                lambda: fetch_order_async(api_key, ed25519_private_key_base64, order["symbol"], order_id, proxy_str),
+                **wait_options()
+            )
+
+        order = _apply_fill(short_pk, order_payload, order, fill)
+        await asyncio.to_thread(update_state, ed25519_private_key_base64, "last_order", order)
+        return order
+
+    raise _order_failed(short_pk, order_payload, response)
+
+
+def _close_order(last_pos: dict) -> Tuple[str, str, str]:
+    side = "Ask" if float(last_pos["netQuantity"]) > 0 else "Bid"
+    return side, last_pos["symbol"], last_pos["netExposureQuantity"]
+
+
+def _is_flat(last_pos: Optional[dict]) -> bool:
+    return not last_pos or float(last_pos.get("netQuantity", 0)) == 0
+
+
+def _check_close(order: dict, quantity: str) -> None:
+    if order.get("filledQuantity") is not None and order["filledQuantity"] < float(quantity):
+        # Surfaces as an ambiguous failure: retry_call reconciles and closes what is left.
+        raise RuntimeError(f"Close filled only {order['filledQuantity']} of {quantity}")
+
 
 def close_last_position(
     api_key: str,
     ed25519_private_key_base64: str,
     proxy_str: str
-):
+) -> bool:
     short_pk = ed25519_private_key_base64[:10]
     last_pos = get_last_position_info(api_key, ed25519_private_key_base64, proxy_str)
 
-    if not last_pos or float(last_pos.get("netQuantity", 0)) == 0:
+    if _is_flat(last_pos):
         logger.info(f"[{short_pk}] Backpack: all positions closed for this account")
-        return
+        return False
+
+    side, symbol, quantity = _close_order(last_pos)
 
-    symbol = last_pos["symbol"]
-    net_qty = float(last_pos["netQuantity"])
-    side = "Ask" if net_qty > 0 else "Bid"
-    
-    open_position(api_key, ed25519_private_key_base64, side, symbol, last_pos["netExposureQuantity"], proxy_str)
+    # Reduce-only: if an earlier close did go through and the position read lags behind, this
+    # order is rejected instead of opening a position on the other side.
+    order = open_position(api_key, ed25519_private_key_base64, side, symbol, quantity, proxy_str, reduce_only=True)
+    _check_close(order, quantity)
     update_state(ed25519_private_key_base64, "position", "closed")
-    return
+    return True
+
+
+async def close_last_position_async(
+    api_key: str,
+    ed25519_private_key_base64: str,
+    proxy_str: str
+) -> bool:
+    short_pk = ed25519_private_key_base64[:10]
+    last_pos = await get_last_position_info_async(api_key, ed25519_private_key_base64, proxy_str)
+
+    if _is_flat(last_pos):
+        logger.info(f"[{short_pk}] Backpack: all positions closed for this account")
+        return False
+
+    side, symbol, quantity = _close_order(last_pos)
+    order = await open_position_async(api_key, ed25519_private_key_base64, side, symbol, quantity, proxy_str, reduce_only=True)
+    _check_close(order, quantity)
+    await asyncio.to_thread(update_state, ed25519_private_key_base64, "position", "closed")
+    return True
+
+
+def reconcile_close(api_key: str, ed25519_private_key_base64: str, proxy_str: str) -> Optional[bool]:
+    """After an ambiguous close: True if the account is flat, None if the close must be resubmitted."""
+    return True if _is_flat(get_last_position_info(api_key, ed25519_private_key_base64, proxy_str)) else None
+
+
+async def reconcile_close_async(api_key: str, ed25519_private_key_base64: str, proxy_str: str) -> Optional[bool]:
+    return True if _is_flat(await get_last_position_info_async(api_key, ed25519_private_key_base64, proxy_str)) else None
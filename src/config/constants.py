@@ -1,8 +1,14 @@
+import os
+
 from src.config.configure_logger import get_logger
 
 logger = get_logger()
 
-PARADEX_HTTP_URL = "https://api.prod.paradex.trade/v1"
-STARKNET_FULLNODE_RPC_URL = "https://juno.api.prod.paradex.trade/rpc/v0_7"
+# Every endpoint can be overridden from the environment, e.g. to point the bot at simulator/server.py.
+# An empty WS URL disables the WebSocket and leaves the price feeds on REST polling.
+PARADEX_HTTP_URL = os.getenv("PARADEX_HTTP_URL", "https://api.prod.paradex.trade/v1")
+PARADEX_WS_URL = os.getenv("PARADEX_WS_URL", "wss://ws.api.prod.paradex.trade/v1")
+STARKNET_FULLNODE_RPC_URL = os.getenv("STARKNET_FULLNODE_RPC_URL", "https://juno.api.prod.paradex.trade/rpc/v0_7")
 STARKNET_CHAIN_ID = "PRIVATE_SN_PARACLEAR_MAINNET"
-BACKPACK_HTTP_URL = "https://api.backpack.exchange/api/v1"
+BACKPACK_HTTP_URL = os.getenv("BACKPACK_HTTP_URL", "https://api.backpack.exchange/api/v1")
+BACKPACK_WS_URL = os.getenv("BACKPACK_WS_URL", "wss://ws.backpack.exchange")
@@ -5,7 +5,10 @@ MAIN_DIR = os.path.join(pathlib.Path(__file__).parent.parent.parent.resolve())
 
 DATA_DIR = os.path.join(MAIN_DIR, "data")
 LOGS_DIR = os.path.join(MAIN_DIR, "logs")
-CONFIG_PATH = os.path.join(DATA_DIR, "config.json")
+CONFIG_PATH = os.getenv("BOT_CONFIG_PATH", os.path.join(DATA_DIR, "config.json"))
 FUTURE_PAIRS_PARADEX_PATH = os.path.join(DATA_DIR, "pairs_paradex.json")
 FUTURE_PAIRS_BACKPACK_PATH = os.path.join(DATA_DIR, "pairs_backpack.json")
 STATE_PATH = os.path.join(DATA_DIR, "state.json")
+STATE_DB_PATH = os.path.join(DATA_DIR, "state.db")
+ACCOUNTS_DB_PATH = os.path.join(DATA_DIR, "accounts.db")
+PROXY_HEALTH_DB_PATH = os.path.join(DATA_DIR, "proxy_health.db")
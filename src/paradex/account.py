@@ -1,11 +1,15 @@
 from starknet_py.net.account.account import Account
-import requests
 from typing import List, Dict, Any, Optional
 
-from src.paradex.auth import get_jwt_token
+from src.paradex.auth import get_jwt_token, get_jwt_token_async, invalidate_jwt_token
 from src.config.constants import PARADEX_HTTP_URL, logger
-from utils.proxy import convert_proxy_to_dict
-from utils.general import _retry_request
+from utils.sessions import async_http_get, http_get
+from utils.retry import ExchangeHTTPError, async_retry_call, retry_call
+
+
+def _check_auth(account: Account, headers: dict, response) -> None:
+    if response.status_code == 401:
+        invalidate_jwt_token(account, headers["authorization"].removeprefix("Bearer "))
 
 
 def get_auth_headers(account: Account, proxy_str: str) -> dict:
@@ -15,57 +19,84 @@ def get_auth_headers(account: Account, proxy_str: str) -> dict:
     }
 
 
+async def get_auth_headers_async(account: Account, proxy_str: str) -> dict:
+    jwt = await get_jwt_token_async(account, proxy_str)
+    return {
+        "authorization": f"Bearer {jwt}"
+    }
+
+
 def get_balance(account: Account, proxy_str: str):
     headers = get_auth_headers(account, proxy_str)
-    response = requests.get(
-        f"{PARADEX_HTTP_URL}/balance",
-        headers=headers,
-        proxies=convert_proxy_to_dict(proxy_str),
-    )
+    response = http_get("paradex", f"{PARADEX_HTTP_URL}/balance", proxy_str, headers=headers)
+
+    _check_auth(account, headers, response)
+    if response.status_code != 200:
+        logger.error(f"Error receiving balance: {response.text}")
+        raise ExchangeHTTPError("Error receiving balance", response)
+
+    return response.json()
+
+
+async def get_balance_async(account: Account, proxy_str: str):
+    headers = await get_auth_headers_async(account, proxy_str)
+    response = await async_http_get("paradex", f"{PARADEX_HTTP_URL}/balance", proxy_str, headers=headers)
 
+    _check_auth(account, headers, response)
     if response.status_code != 200:
         logger.error(f"Error receiving balance: {response.text}")
-        raise ValueError("Error receiving balance")
+        raise ExchangeHTTPError("Error receiving balance", response)
 
     return response.json()
 
 
 def get_open_positions(account: Account, proxy_str: str):
     headers = get_auth_headers(account, proxy_str)
-    response = requests.get(
-        f"{PARADEX_HTTP_URL}/positions",
-        headers=headers,
-        proxies=convert_proxy_to_dict(proxy_str),
-    )
+    response = http_get("paradex", f"{PARADEX_HTTP_URL}/positions", proxy_str, headers=headers)
 
+    _check_auth(account, headers, response)
     if response.status_code != 200:
         logger.error(f"Error receiving open positions: {response.text}")
-        raise ValueError("Error receiving open positions")
+        raise ExchangeHTTPError("Error receiving open positions", response)
+
+    return response.json()
+
+
+async def get_open_positions_async(account: Account, proxy_str: str):
+    headers = await get_auth_headers_async(account, proxy_str)
+    response = await async_http_get("paradex", f"{PARADEX_HTTP_URL}/positions", proxy_str, headers=headers)
+
+    _check_auth(account, headers, response)
+    if response.status_code != 200:
+        logger.error(f"Error receiving open positions: {response.text}")
+        raise ExchangeHTTPError("Error receiving open positions", response)
 
     return response.json()
 
 
 def get_liquidation_price(account: Account, proxy_str: str):
     headers = get_auth_headers(account, proxy_str)
-    response = requests.get(
-        f"{PARADEX_HTTP_URL}/liquidation_price",
-        headers=headers,
-        proxies=convert_proxy_to_dict(proxy_str),
-    )
+    response = http_get("paradex", f"{PARADEX_HTTP_URL}/liquidation_price", proxy_str, headers=headers)
 
+    _check_auth(account, headers, response)
     if response.status_code != 200:
         logger.error(f"Error receiving liquidation price: {response.text}")
-        raise ValueError("Error receiving liquidation price")
+        raise ExchangeHTTPError("Error receiving liquidation price", response)
 
     return response.json()
 
-def get_last_position_info(account: Account, proxy: str) -> Optional[Dict[str, Any]]:
-    position_data = _retry_request(get_open_positions, account, proxy)
-    results = position_data.get("results", [])
-
-    for pos in results:
+def _first_open_position(position_data: dict) -> Optional[Dict[str, Any]]:
+    for pos in position_data.get("results", []):
         status = pos.get("status", "").upper()
         if status != "CLOSED":
             return pos
 
-    return None
\ No newline at end of file
+    return None
+
+
+def get_last_position_info(account: Account, proxy: str) -> Optional[Dict[str, Any]]:
+    return _first_open_position(retry_call(get_open_positions, account, proxy))
+
+
+async def get_last_position_info_async(account: Account, proxy: str) -> Optional[Dict[str, Any]]:
+    return _first_open_position(await async_retry_call(get_open_positions_async, account, proxy))
@@ -1,42 +1,63 @@
+import asyncio
+import base64
+import hashlib
+import json
+import threading
 import time
-import requests
+from typing import Dict, Optional, Tuple
 
 from starknet_py.net.signer.stark_curve_signer import KeyPair
 from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.common import int_from_bytes
 from starknet_py.net.account.account import Account
 
-from src.config.constants import STARKNET_FULLNODE_RPC_URL, STARKNET_CHAIN_ID, PARADEX_HTTP_URL, logger
-from utils.data import update_state, get_user_state
-from utils.stark import build_auth_message, hex_to_int
-from utils.proxy import convert_proxy_to_dict
+from src.config.constants import STARKNET_FULLNODE_RPC_URL, PARADEX_HTTP_URL, logger
+from src.paradex.signing import get_signing_service
+from utils.data import update_state_many, get_account_state, USER_CONFIG
+from utils.stark import CHAIN_ID, build_auth_message, hex_to_int
+from utils.metrics import SIGNING_DURATION
+from utils.retry import ExchangeHTTPError
+from utils.sessions import http_post
+
+
+_ACCOUNTS: Dict[Tuple[int, str], Account] = {}
+_ACCOUNTS_LOCK = threading.Lock()
+_CLIENT: Optional[FullNodeClient] = None
+
+
+def get_client() -> FullNodeClient:
+    global _CLIENT
+
+    if _CLIENT is None:
+        with _ACCOUNTS_LOCK:
+            if _CLIENT is None:
+                _CLIENT = FullNodeClient(node_url=STARKNET_FULLNODE_RPC_URL)
+    return _CLIENT
 
 
 def get_account(account_address: str, account_key: str) -> Account:
-    client = FullNodeClient(node_url=STARKNET_FULLNODE_RPC_URL)
-    key_pair = KeyPair.from_private_key(key=hex_to_int(account_key))
-    chain = int_from_bytes(STARKNET_CHAIN_ID.encode("utf-8"))
+    private_key = hex_to_int(account_key)
+    cache_key = (hex_to_int(account_address), hashlib.sha256(str(private_key).encode()).hexdigest())
 
-    return Account(
-        client=client,
+    account = _ACCOUNTS.get(cache_key)
+    if account is not None:
+        return account
+
+    key_pair = KeyPair.from_private_key(key=private_key)
+    account = Account(
+        client=get_client(),
         address=account_address,
         key_pair=key_pair,
-        chain=chain,
+        chain=CHAIN_ID,
     )
 
+    with _ACCOUNTS_LOCK:
+        return _ACCOUNTS.setdefault(cache_key, account)
 
-def get_jwt_token(account: Account, proxy_str: str) -> str:
+
+def request_jwt_token(account: Account, proxy_str: str) -> Tuple[str, int]:
     private_key = hex(account.signer.private_key)
     short_pk = private_key[:10]
     now = int(time.time())
-    state = get_user_state().get(private_key, {})
-
-    jwt = state.get("jwt")
-    expiry = state.get("expiry", 0)
-
-    if jwt and now < expiry:
-        return jwt
-
     new_expiry = now + 24 * 60 * 60
 
     message_dict = build_auth_message(
@@ -47,7 +68,8 @@ def get_jwt_token(account: Account, proxy_str: str) -> str:
         expiration=new_expiry,
     )
 
-    sig = account.sign_message(message_dict)
+    with SIGNING_DURATION.time(kind="paradex_auth"):
+        sig = get_signing_service().sign(account, message_dict)
     signature_str = f'["{hex(sig[0])}","{hex(sig[1])}"]'
 
     headers = {
@@ -58,13 +80,151 @@ def get_jwt_token(account: Account, proxy_str: str) -> str:
     }
 
     url = f"{PARADEX_HTTP_URL}/auth"
-    response = requests.post(url, headers=headers, proxies=convert_proxy_to_dict(proxy_str))
+    response = http_post("paradex", url, proxy_str, headers=headers)
     jwt = response.json().get("jwt_token", "")
 
     if response.status_code == 200 and jwt:
-        update_state(private_key, "jwt", jwt)
-        update_state(private_key, "expiry", now + 5 * 60)
         logger.info(f"[{short_pk}] JWT token retrieved successfully")
+        return jwt, get_jwt_expiry(jwt, default=now + 5 * 60)
+
+    raise ExchangeHTTPError("Failed to get JWT token", response)
+
+
+def get_jwt_expiry(jwt: str, default: int) -> int:
+    try:
+        payload = jwt.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return default
+
+
+class JwtManager:
+    def __init__(self, refresh_margin_sec: int = 60, refresh_idle_sec: int = 600, check_interval_sec: int = 10) -> None:
+        self.refresh_margin_sec = refresh_margin_sec
+        self.refresh_idle_sec = refresh_idle_sec
+        self.check_interval_sec = check_interval_sec
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, Tuple[str, int]] = {}
+        self._accounts: Dict[str, Tuple[Account, str, float]] = {}
+        self._account_locks: Dict[str, threading.Lock] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="jwt-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _account_lock(self, private_key: str) -> threading.Lock:
+        with self._lock:
+            return self._account_locks.setdefault(private_key, threading.Lock())
+
+    def _cached_token(self, private_key: str, margin_sec: int = 0) -> Optional[str]:
+        with self._lock:
+            cached = self._tokens.get(private_key)
+
+        if cached is None:
+            state = get_account_state(private_key)
+            cached = (state.get("jwt"), state.get("expiry", 0))
+            with self._lock:
+                self._tokens.setdefault(private_key, cached)
+
+        jwt, expiry = cached
+        if jwt and time.time() + margin_sec < expiry:
+            return jwt
+        return None
+
+    def _refresh(self, private_key: str, account: Account, proxy_str: str) -> str:
+        jwt, expiry = request_jwt_token(account, proxy_str)
+        with self._lock:
+            self._tokens[private_key] = (jwt, expiry)
+        update_state_many(private_key, {"jwt": jwt, "expiry": expiry})
         return jwt
 
-    raise ValueError(f"Failed to get JWT token: {response.status_code} - {response.text}")
+    def invalidate(self, account: Account, jwt: str) -> None:
+        """Forget ``jwt`` after the exchange rejected it, so the next request authenticates again.
+        A token another thread has already refreshed in the meantime is kept."""
+        private_key = hex(account.signer.private_key)
+        with self._account_lock(private_key):
+            with self._lock:
+                cached = self._tokens.get(private_key)
+                if cached is not None and cached[0] != jwt:
+                    return
+                self._tokens[private_key] = ("", 0)
+            update_state_many(private_key, {"jwt": "", "expiry": 0})
+
+    def get_token(self, account: Account, proxy_str: str) -> str:
+        private_key = hex(account.signer.private_key)
+        with self._lock:
+            self._accounts[private_key] = (account, proxy_str, time.time())
+
+        jwt = self._cached_token(private_key)
+        if jwt:
+            return jwt
+
+        with self._account_lock(private_key):
+            jwt = self._cached_token(private_key)
+            if jwt:
+                return jwt
+            return self._refresh(private_key, account, proxy_str)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.check_interval_sec):
+            now = time.time()
+            with self._lock:
+                accounts = [
+                    (private_key, account, proxy_str)
+                    for private_key, (account, proxy_str, last_used) in self._accounts.items()
+                    if now - last_used < self.refresh_idle_sec
+                ]
+
+            for private_key, account, proxy_str in accounts:
+                if self._cached_token(private_key, self.refresh_margin_sec):
+                    continue
+
+                lock = self._account_lock(private_key)
+                if not lock.acquire(blocking=False):
+                    continue
+                try:
+                    if not self._cached_token(private_key, self.refresh_margin_sec):
+                        self._refresh(private_key, account, proxy_str)
+                except Exception as exc:
+                    logger.warning(f"[{private_key[:10]}] Background JWT refresh failed: {exc}")
+                finally:
+                    lock.release()
+
+
+_JWT_MANAGER: Optional[JwtManager] = None
+
+
+def get_jwt_manager() -> JwtManager:
+    global _JWT_MANAGER
+
+    if _JWT_MANAGER is None:
+        with _ACCOUNTS_LOCK:
+            if _JWT_MANAGER is None:
+                jwt_cfg = USER_CONFIG.get("jwt", {})
+                manager = JwtManager(
+                    refresh_margin_sec=jwt_cfg.get("refresh_margin_sec", 60),
+                    refresh_idle_sec=jwt_cfg.get("refresh_idle_sec", 600),
+                )
+                manager.start()
+                _JWT_MANAGER = manager
+    return _JWT_MANAGER
+
+
+def get_jwt_token(account: Account, proxy_str: str) -> str:
+    return get_jwt_manager().get_token(account, proxy_str)
+
+
+async def get_jwt_token_async(account: Account, proxy_str: str) -> str:
+    # Signing and the occasional refresh are short; a thread is held only for them.
+    return await asyncio.to_thread(get_jwt_token, account, proxy_str)
+
+
+def invalidate_jwt_token(account: Account, jwt: str) -> None:
+    get_jwt_manager().invalidate(account, jwt)
@@ -1,10 +1,11 @@
-import json
-from pathlib import Path
-import requests
+from typing import List, Optional
 
-from src.config.paths import FUTURE_PAIRS_PARADEX_PATH, DATA_DIR
+from src.config.paths import FUTURE_PAIRS_PARADEX_PATH
 from src.config.constants import PARADEX_HTTP_URL, logger
-from utils.data import load_json, _find_pair_by_key, _load_pairs
+from src.paradex.price_feed import fetch_bbo, get_price_feed
+from utils.data import USER_CONFIG
+from utils.market_refresh import MarketChange, MarketSource, get_market_refresher
+from utils.markets import _find_pair_by_key
 
 
 def get_pair_data(token: str) -> dict:
@@ -15,44 +16,48 @@ def get_pair_data_by_symbol(symbol: str) -> dict:
     return _find_pair_by_key("symbol", symbol, FUTURE_PAIRS_PARADEX_PATH)
 
 
-def get_pair_price(token: str) -> float:
+def get_pair_price(token: str, max_age_sec: Optional[float] = None) -> float:
     pair = get_pair_data(token)
     symbol = pair["symbol"]
 
-    response = requests.get(f"{PARADEX_HTTP_URL}/bbo/{symbol}")
-    if response.status_code != 200:
-        logger.error(f"Error receiving token price: {response.text}")
-        raise ValueError("Error receiving token price")
+    feed_cfg = USER_CONFIG.get("price_feed", {})
+    if not feed_cfg.get("enabled", True):
+        bid, ask = fetch_bbo(symbol)
+        return (bid + ask) / 2
 
-    data = response.json()
-    try:
-        bid = float(data["bid"])
-        ask = float(data["ask"])
-    except (KeyError, ValueError, TypeError) as exc:
-        logger.error(f"Invalid price data format: {data}")
-        raise ValueError("Failed to parse bid/ask price") from exc
+    if max_age_sec is None:
+        max_age_sec = feed_cfg.get("max_age_sec", 5)
 
-    return (bid + ask) / 2
+    feed = get_price_feed()
+    feed.subscribe(symbol)
 
+    quote = feed.get_quote(symbol, max_age_sec)
+    if quote is None:
+        quote = feed.fetch_quote(symbol)
+    return quote.mid
 
-def update_markets():
-    logger.info("Futures pairs information update has started")
-
-    response = requests.get(f"{PARADEX_HTTP_URL}/markets")
-    try:
-        response.raise_for_status()
-    except requests.HTTPError as exc:
-        logger.error(f"Error fetching current futures pairs: {response.text}")
-        raise exc
 
-    data = response.json()
-    filtered_results = [
+def filter_markets(data: dict) -> list:
+    return [
         item for item in data.get("results", [])
         if item.get("symbol", "").endswith("-PERP")
     ]
 
-    file_path = Path(DATA_DIR) / "pairs_paradex.json"
-    with open(file_path, "w", encoding="utf-8") as file:
-        json.dump({"results": filtered_results}, file, ensure_ascii=False, indent=2)
 
-    logger.success("Information on futures pairs has been updated")
+MARKET_SOURCE = MarketSource(
+    "paradex", f"{PARADEX_HTTP_URL}/markets", FUTURE_PAIRS_PARADEX_PATH, filter_markets,
+    fields=(
+        "base_currency", "order_size_increment", "min_notional", "price_tick_size", "asset_kind", "open_at", "expiry_at"
+    ),
+)
+
+
+def update_markets() -> List[MarketChange]:
+    logger.info("Futures pairs information update has started")
+
+    refresher = get_market_refresher()
+    refresher.add_source(MARKET_SOURCE)
+    changes = refresher.refresh(MARKET_SOURCE.exchange)
+
+    logger.success(f"Information on futures pairs has been updated ({len(changes)} changes)")
+    return changes
@@ -0,0 +1,79 @@
+import threading
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from starknet_py.net.account.account import Account
+
+from src.config.constants import PARADEX_WS_URL
+from src.paradex.auth import get_jwt_token
+from utils.data import USER_CONFIG
+from utils.order_stream import OrderStream, OrderUpdate, close_idle_streams
+
+
+def parse_order(order: Dict[str, Any]) -> OrderUpdate:
+    """Build an OrderUpdate from a Paradex order object (REST ``/orders/{id}`` or the ``orders`` channel)."""
+    size = Decimal(str(order.get("size") or 0))
+    filled = float(size - Decimal(str(order.get("remaining_size") or 0)))
+    avg_price = order.get("avg_fill_price")
+    updated_at = order.get("last_updated_at")
+    return OrderUpdate(
+        order_id=order["id"],
+        market=order.get("market", ""),
+        status=order.get("status", ""),
+        filled_size=filled,
+        avg_price=float(avg_price) if avg_price else None,
+        final=order.get("status") == "CLOSED",
+        # A market order that filled partly and was then cancelled is a (short) fill, not a rejection.
+        reject_reason="" if filled > 0 else (order.get("cancel_reason") or "").strip(),
+        updated_at=int(updated_at) / 1000 if updated_at else None,
+    )
+
+
+class ParadexOrderStream(OrderStream):
+    name = "paradex-orders"
+    ws_url = PARADEX_WS_URL
+
+    def __init__(self, account: Account, proxy: Optional[str] = None, **kwargs) -> None:
+        super().__init__(proxy, **kwargs)
+        self.account = account
+
+    def _open_messages(self) -> List[Dict[str, Any]]:
+        # A fresh token on every (re)connect; JwtManager hands back the cached one while it is valid.
+        jwt = get_jwt_token(self.account, self.proxy)
+        if not jwt:
+            raise ValueError("JWT token is empty, auth failed")
+
+        return [
+            {"jsonrpc": "2.0", "method": "auth", "params": {"bearer": jwt}, "id": 0},
+            {"jsonrpc": "2.0", "method": "subscribe", "params": {"channel": "orders.ALL"}, "id": 1},
+        ]
+
+    def _parse_message(self, message: Dict[str, Any]) -> Optional[OrderUpdate]:
+        if message.get("method") != "subscription":
+            return None
+
+        params = message.get("params", {})
+        if not params.get("channel", "").startswith("orders."):
+            return None
+        return parse_order(params.get("data", {}))
+
+
+_STREAMS: Dict[str, ParadexOrderStream] = {}
+_STREAMS_LOCK = threading.Lock()
+
+
+def get_order_stream(account: Account, proxy: Optional[str] = None) -> ParadexOrderStream:
+    key = hex(account.address)
+    stream = _STREAMS.get(key)
+    if stream is not None:
+        return stream
+
+    with _STREAMS_LOCK:
+        stream = _STREAMS.get(key)
+        if stream is None:
+            close_idle_streams(_STREAMS, USER_CONFIG.get("order_stream", {}).get("idle_timeout_sec", 1800))
+            stream = ParadexOrderStream(account, proxy)
+            if USER_CONFIG.get("order_stream", {}).get("enabled", True):
+                stream.start()
+            _STREAMS[key] = stream
+    return stream
@@ -0,0 +1,74 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.constants import PARADEX_HTTP_URL, PARADEX_WS_URL, logger
+from utils.data import USER_CONFIG
+from utils.price_feed import PriceFeed
+from utils.retry import ExchangeHTTPError
+from utils.sessions import http_get
+
+
+def fetch_bbo(symbol: str) -> Tuple[float, float]:
+    response = http_get("paradex", f"{PARADEX_HTTP_URL}/bbo/{symbol}")
+    if response.status_code != 200:
+        logger.error(f"Error receiving token price: {response.text}")
+        raise ExchangeHTTPError("Error receiving token price", response)
+
+    data = response.json()
+    try:
+        bid = float(data["bid"])
+        ask = float(data["ask"])
+    except (KeyError, ValueError, TypeError) as exc:
+        logger.error(f"Invalid price data format: {data}")
+        raise ValueError("Failed to parse bid/ask price") from exc
+
+    return bid, ask
+
+
+class ParadexPriceFeed(PriceFeed):
+    name = "paradex-bbo"
+    ws_url = PARADEX_WS_URL
+
+    def _subscribe_message(self, symbol: str, request_id: int) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "method": "subscribe",
+            "params": {"channel": f"bbo.{symbol}"},
+            "id": request_id,
+        }
+
+    def _parse_message(self, message: Dict[str, Any]) -> Optional[Tuple[str, float, float]]:
+        if message.get("method") != "subscription":
+            return None
+
+        params = message.get("params", {})
+        if not params.get("channel", "").startswith("bbo."):
+            return None
+
+        data = params.get("data", {})
+        return data["market"], float(data["bid"]), float(data["ask"])
+
+    def _fetch_rest(self, symbol: str) -> Tuple[float, float]:
+        return fetch_bbo(symbol)
+
+
+_PRICE_FEED: Optional[ParadexPriceFeed] = None
+_PRICE_FEED_LOCK = threading.Lock()
+
+
+def get_price_feed() -> ParadexPriceFeed:
+    global _PRICE_FEED
+
+    if _PRICE_FEED is not None:
+        return _PRICE_FEED
+
+    with _PRICE_FEED_LOCK:
+        if _PRICE_FEED is None:
+            feed_cfg = USER_CONFIG.get("price_feed", {})
+            feed = ParadexPriceFeed(
+                poll_interval_sec=feed_cfg.get("poll_interval_sec", 5),
+                max_age_sec=feed_cfg.get("max_age_sec", 5),
+            )
+            feed.start()
+            _PRICE_FEED = feed
+    return _PRICE_FEED
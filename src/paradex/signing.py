@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence
+
+from starknet_py.hash.utils import message_signature
+from starknet_py.net.account.account import Account
+
+from src.config.constants import logger
+from utils.data import USER_CONFIG
+from utils.stark import message_hash
+
+
+def sign_typed_data(private_key: int, account_address: int, typed_data: Dict) -> List[int]:
+    """Hash and sign one Starknet typed data message. Runs inside the pool workers."""
+    r, s = message_signature(msg_hash=message_hash(typed_data, account_address), priv_key=private_key)
+    return [r, s]
+
+
+def _sign_batch(private_key: int, account_address: int, messages: Sequence[Dict]) -> List[List[int]]:
+    return [sign_typed_data(private_key, account_address, typed_data) for typed_data in messages]
+
+
+class SigningService:
+    """Runs Stark curve signing in worker processes so it does not hold the GIL of the trading threads.
+
+    With ``workers=0`` everything is signed inline in the calling thread.
+    """
+
+    def __init__(self, workers: int = 2) -> None:
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a process that runs loguru and websocket threads can deadlock the child.
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _reset(self, disable: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            if disable:
+                self.workers = 0
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self) -> None:
+        executor = self._get_executor()
+        if executor is not None:
+            for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+
+    def submit(self, account: Account, typed_data: Dict) -> Future:
+        executor = self._get_executor()
+        if executor is None:
+            future = Future()
+            future.set_result(sign_typed_data(account.signer.private_key, account.address, typed_data))
+            return future
+        return executor.submit(sign_typed_data, account.signer.private_key, account.address, typed_data)
+
+    def sign(self, account: Account, typed_data: Dict) -> List[int]:
+        try:
+            return self.submit(account, typed_data).result()
+        except BrokenProcessPool:
+            logger.warning("Signing pool died, signing inline from now on")
+            self._reset(disable=True)
+            return sign_typed_data(account.signer.private_key, account.address, typed_data)
+
+    def sign_many(self, account: Account, messages: Sequence[Dict]) -> List[List[int]]:
+        """Sign many messages for one account, split into one chunk per worker."""
+        executor = self._get_executor()
+        if executor is None or len(messages) < 2:
+            return [self.sign(account, typed_data) for typed_data in messages]
+
+        chunk_size = -(-len(messages) // self.workers)
+        chunks = [messages[idx:idx + chunk_size] for idx in range(0, len(messages), chunk_size)]
+        try:
+            futures = [executor.submit(_sign_batch, account.signer.private_key, account.address, chunk) for chunk in chunks]
+            return [signature for future in futures for signature in future.result()]
+        except BrokenProcessPool:
+            logger.warning("Signing pool died, signing inline from now on")
+            self._reset(disable=True)
+            return _sign_batch(account.signer.private_key, account.address, messages)
+
+    def close(self) -> None:
+        self._reset()
+
+
+_SIGNING_SERVICE: Optional[SigningService] = None
+_SIGNING_SERVICE_LOCK = threading.Lock()
+
+
+def get_signing_service() -> SigningService:
+    global _SIGNING_SERVICE
+
+    if _SIGNING_SERVICE is not None:
+        return _SIGNING_SERVICE
+
+    with _SIGNING_SERVICE_LOCK:
+        if _SIGNING_SERVICE is None:
+            signing_cfg = USER_CONFIG.get("signing", {})
+            workers = signing_cfg.get("workers", min(os.cpu_count() or 1, 4))
+            _SIGNING_SERVICE = SigningService(workers if signing_cfg.get("process_pool", True) else 0)
+    return _SIGNING_SERVICE
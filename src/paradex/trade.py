@@ -1,24 +1,23 @@
+import asyncio
 import time
-import requests
 from decimal import Decimal
+from typing import Optional, Tuple
 from starknet_py.net.account.account import Account
 
 from utils.stark import build_trade_message
 from utils.data import update_state
-from src.paradex.auth import get_jwt_token
+from src.paradex.auth import get_jwt_token, get_jwt_token_async, invalidate_jwt_token
 from src.config.constants import PARADEX_HTTP_URL, logger
-from utils.proxy import convert_proxy_to_dict
-from src.paradex.account import get_last_position_info
+from utils.metrics import SIGNING_DURATION
+from utils.retry import ExchangeHTTPError, OrderRejectedError
+from utils.sessions import async_http_get, async_http_post, http_get, http_post
+from src.paradex.account import get_last_position_info, get_last_position_info_async
+from src.paradex.order_stream import get_order_stream, parse_order
+from src.paradex.signing import get_signing_service
+from utils.order_stream import wait_options
 
 
-def open_position(account: Account, side: str, market: str, size: str, proxy_str):
-    private_key = hex(account.signer.private_key)
-    short_pk = private_key[:10]
-
-    jwt = get_jwt_token(account, proxy_str)
-    if not jwt:
-        raise Exception("JWT token is empty, auth failed")
-
+def prepare_order(account: Account, side: str, market: str, size: str, reduce_only: bool = False) -> dict:
     timestamp = int(time.time())
     signature_timestamp_ms = timestamp * 1000
 
@@ -29,6 +28,9 @@ def open_position(account: Account, side: str, market: str, size: str, proxy_str
         "size": str(size),
         "signature_timestamp": signature_timestamp_ms,
     }
+    if reduce_only:
+        # Flags are not part of the signed order message.
+        order_payload["flags"] = ["REDUCE_ONLY"]
 
     signable = build_trade_message(
         market=order_payload["market"],
@@ -38,53 +40,137 @@ def open_position(account: Account, side: str, market: str, size: str, proxy_str
         timestamp=order_payload["signature_timestamp"],
     )
 
-    sig = account.sign_message(signable)
+    with SIGNING_DURATION.time(kind="paradex_order"):
+        sig = get_signing_service().sign(account, signable)
     signature_str = f'["{hex(sig[0])}","{hex(sig[1])}"]'
     order_payload["signature"] = signature_str
+    return order_payload
+
+
+def open_position(account: Account, side: str, market: str, size: str, proxy_str, reduce_only: bool = False):
+    order_payload = prepare_order(account, side, market, size, reduce_only)
+    return submit_order(account, order_payload, proxy_str)
+
+
+async def open_position_async(account: Account, side: str, market: str, size: str, proxy_str, reduce_only: bool = False):
+    # Signing may go to the process pool; only that step holds a thread.
+    order_payload = await asyncio.to_thread(prepare_order, account, side, market, size, reduce_only)
+    return await submit_order_async(account, order_payload, proxy_str)
+
 
-    headers = {
+def _order_headers(jwt: str) -> dict:
+    if not jwt:
+        raise ValueError("JWT token is empty, auth failed")
+
+    return {
         "Content-Type": "application/json",
         "Accept": "application/json",
         "Authorization": f"Bearer {jwt}",
     }
 
-    url = f"{PARADEX_HTTP_URL}/orders"
-    response = requests.post(
-        url,
-        headers=headers,
-        json=order_payload,
-        proxies=convert_proxy_to_dict(proxy_str),
-    )
 
-    if response.status_code == 201:
-        order = response.json()
-        order_id = order["id"]
-        order_info = get_order_info_by_id(account, order_id, proxy_str)
-
-        cancel_reason = order_info.get("cancel_reason", "").strip()
-
-        if cancel_reason:
-            logger.error(
-                f"[{short_pk}] {order_payload['side']} {order_payload['size']} {order_payload['market']} — "
-                f"failed: {cancel_reason}"
-            )
-            raise ValueError("Error opening a new position")
+def _apply_fill(short_pk: str, order_payload: dict, order: dict, fill) -> dict:
+    order_id = order["id"]
+    if fill is not None and fill.reject_reason:
+        logger.error(
+            f"[{short_pk}] {order_payload['side']} {order_payload['size']} {order_payload['market']} — "
+            f"failed: {fill.reject_reason}"
+        )
+        raise OrderRejectedError(f"Order cancelled: {fill.reject_reason}")
 
-        update_state(private_key, "last_order", order)
+    if fill is None:
+        logger.warning(
+            f"[{short_pk}] {order['side']} {order['size']} {order['market']} — "
+            f"market order sent, fill not confirmed in time, relying on position checks (id: {order_id[:10]}...)"
+        )
+    else:
+        order["avg_fill_price"] = fill.avg_price
+        order["filled_at"] = fill.updated_at
+        order["filled_size"] = fill.filled_size
+        if fill.filled_size < float(order["size"]):
+            logger.warning(f"[{short_pk}] Order {order_id[:10]}... filled only {fill.filled_size} of {order['size']}")
         logger.success(
             f"[{short_pk}] {order['side']} {order['size']} {order['market']} — "
-            f"market order sent (id: {order['id'][:10]}...)"
+            f"market order filled at {fill.avg_price} (id: {order_id[:10]}...)"
         )
-        return True
+    return order
 
+
+def _order_failed(account: Account, jwt: str, short_pk: str, order_payload: dict, response) -> ExchangeHTTPError:
+    if response.status_code == 401:
+        invalidate_jwt_token(account, jwt)
     logger.error(
         f"[{short_pk}] {order_payload['side']} {order_payload['size']} {order_payload['market']} — "
         f"failed: {response.text}"
     )
-    raise ValueError("Error opening a new position")
+    return ExchangeHTTPError("Error opening a new position", response)
+
+
+def submit_order(account: Account, order_payload: dict, proxy_str: str):
+    private_key = hex(account.signer.private_key)
+    short_pk = private_key[:10]
+
+    jwt = get_jwt_token(account, proxy_str)
+    headers = _order_headers(jwt)
+
+    url = f"{PARADEX_HTTP_URL}/orders"
+    response = http_post("paradex", url, proxy_str, headers=headers, json=order_payload)
 
+    if response.status_code == 201:
+        order = response.json()
+        order_id = order["id"]
+        fill = get_order_stream(account, proxy_str).wait_for_order(
+            order_id,
+            lambda: parse_order(get_order_info_by_id(account, order_id, proxy_str)),
+            **wait_options()
+        )
 
-def close_last_position(account: Account, proxy_str: str) -> None:
+        order = _apply_fill(short_pk, order_payload, order, fill)
+        update_state(private_key, "last_order", order)
+        return order
+
+    raise _order_failed(account, jwt, short_pk, order_payload, response)
+
+
+async def submit_order_async(account: Account, order_payload: dict, proxy_str: str):
+    private_key = hex(account.signer.private_key)
+    short_pk = private_key[:10]
+
+    jwt = await get_jwt_token_async(account, proxy_str)
+    headers = _order_headers(jwt)
+
+    url = f"{PARADEX_HTTP_URL}/orders"
+    response = await async_http_post("paradex", url, proxy_str, headers=headers, json=order_payload)
+
+    if response.status_code == 201:
+        order = response.json()
+        order_id = order["id"]
+
+        async def poll():
+            return parse_order(await get_order_info_by_id_async(account, order_id, proxy_str))
+
+        fill = await get_order_stream(account, proxy_str).wait_for_order_async(order_id, poll, **wait_options())
+
+        order = _apply_fill(short_pk, order_payload, order, fill)
+        await asyncio.to_thread(update_state, private_key, "last_order", order)
+        return order
+
+    raise _order_failed(account, jwt, short_pk, order_payload, response)
+
+
+def _close_order(pos: dict) -> Tuple[str, str, float]:
+    size = abs(float(pos["size"]))
+    close_side = "SELL" if pos["side"].upper() == "LONG" else "BUY"
+    return close_side, pos["market"], size
+
+
+def _check_close(order: dict, size: float) -> None:
+    if order.get("filled_size") is not None and order["filled_size"] < size:
+        # Surfaces as an ambiguous failure: retry_call reconciles and closes what is left.
+        raise RuntimeError(f"Close filled only {order['filled_size']} of {size}")
+
+
+def close_last_position(account: Account, proxy_str: str) -> bool:
     pk = hex(account.signer.private_key)
     short_pk = pk[:10]
 
@@ -92,32 +178,69 @@ def close_last_position(account: Account, proxy_str: str) -> None:
 
     if not pos:
         logger.info(f"[{short_pk}] Paradex: all positions closed for this account")
-        return
+        return False
 
-    market = pos["market"]
-    size = abs(float(pos["size"]))
-    side = pos["side"].upper()
-    close_side = "SELL" if side == "LONG" else "BUY"
+    close_side, market, size = _close_order(pos)
 
-    open_position(account, close_side, market, str(size), proxy_str)
+    # Reduce-only: if an earlier close did go through and the position read lags behind, this
+    # order is rejected instead of opening a position on the other side.
+    order = open_position(account, close_side, market, str(size), proxy_str, reduce_only=True)
+    _check_close(order, size)
     update_state(pk, "position", "closed")
+    return True
+
 
-    return
+async def close_last_position_async(account: Account, proxy_str: str) -> bool:
+    pk = hex(account.signer.private_key)
+    short_pk = pk[:10]
+
+    pos = await get_last_position_info_async(account, proxy_str)
+
+    if not pos:
+        logger.info(f"[{short_pk}] Paradex: all positions closed for this account")
+        return False
+
+    close_side, market, size = _close_order(pos)
+    order = await open_position_async(account, close_side, market, str(size), proxy_str, reduce_only=True)
+    _check_close(order, size)
+    await asyncio.to_thread(update_state, pk, "position", "closed")
+    return True
+
+
+def reconcile_close(account: Account, proxy_str: str) -> Optional[bool]:
+    """After an ambiguous close: True if the account is flat, None if the close must be resubmitted."""
+    return True if not get_last_position_info(account, proxy_str) else None
+
+
+async def reconcile_close_async(account: Account, proxy_str: str) -> Optional[bool]:
+    return True if not await get_last_position_info_async(account, proxy_str) else None
 
 
 def get_order_info_by_id(account: Account, order_id: str, proxy_str: str) -> dict:
     jwt = get_jwt_token(account, proxy_str)
-    if not jwt:
-        raise ValueError("JWT token is empty, auth failed")
+    headers = _order_headers(jwt)
 
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {jwt}",
-    }
+    url = f"{PARADEX_HTTP_URL}/orders/{order_id}"
+
+    response = http_get("paradex", url, proxy_str, headers=headers)
+    if response.status_code == 401:
+        invalidate_jwt_token(account, jwt)
+    if response.status_code != 200:
+        raise ExchangeHTTPError("Error receiving order info", response)
+
+    return response.json()
+
+
+async def get_order_info_by_id_async(account: Account, order_id: str, proxy_str: str) -> dict:
+    jwt = await get_jwt_token_async(account, proxy_str)
+    headers = _order_headers(jwt)
 
     url = f"{PARADEX_HTTP_URL}/orders/{order_id}"
 
-    response = requests.get(url, headers=headers, proxies=convert_proxy_to_dict(proxy_str))
+    response = await async_http_get("paradex", url, proxy_str, headers=headers)
+    if response.status_code == 401:
+        invalidate_jwt_token(account, jwt)
+    if response.status_code != 200:
+        raise ExchangeHTTPError("Error receiving order info", response)
 
     return response.json()
@@ -1,37 +1,53 @@
-import requests
+import threading
+import time
+from typing import List, Optional
+
 import pandas as pd
-import json
 
 from src.config.constants import PARADEX_HTTP_URL, logger
 from src.config.paths import DATA_DIR, FUTURE_PAIRS_PARADEX_PATH, FUTURE_PAIRS_BACKPACK_PATH
-from utils.general import _retry_request
+from utils.data import USER_CONFIG
+from utils.market_refresh import MarketChange, get_market_refresher
+from utils.markets import get_registry
+from utils.retry import ExchangeHTTPError, retry_call
+from utils.sessions import http_get
 
-from src.paradex.market import update_markets as update_paradex_markets
-from src.backpack.market import update_markets as update_backpack_markets
+from src.paradex.market import MARKET_SOURCE as PARADEX_MARKET_SOURCE, update_markets as update_paradex_markets
+from src.backpack.market import MARKET_SOURCE as BACKPACK_MARKET_SOURCE, update_markets as update_backpack_markets
 
 
 def update_metrics():
     update_paradex_markets()
     update_backpack_markets()
 
-    response = _retry_request(requests.get, f"{PARADEX_HTTP_URL}/markets/summary?market=ALL")
+    data = retry_call(fetch_markets_summary)
+    df = build_metrics_frame(data.get("results", []), get_common_symbols())
+
+    logger.info(f"Market metrics updated successfully: active_pairs.xlsx {len(df)} rows")
+
+    df.to_excel(DATA_DIR + "/active_pairs.xlsx", index=False)
+
+    return df
+
 
+def fetch_markets_summary() -> dict:
+    response = http_get("paradex", f"{PARADEX_HTTP_URL}/markets/summary?market=ALL")
     if response.status_code != 200:
         logger.error(f"Failed to fetch market data: {response.status_code} - {response.text}")
-        raise ValueError("Failed to fetch market summary")
+        raise ExchangeHTTPError("Failed to fetch market summary", response)
+    return response.json()
 
-    data = response.json()
-    results = data.get("results", [])
 
+def build_metrics_frame(results: list, common_tokens: set[str]) -> pd.DataFrame:
+    rows = []
     for item in results:
-        greeks = item.pop("greeks", {})
-        for greek_key, greek_value in greeks.items():
-            item[f"greek_{greek_key}"] = greek_value
+        row = {key: value for key, value in item.items() if key != "greeks"}
+        for greek_key, greek_value in item.get("greeks", {}).items():
+            row[f"greek_{greek_key}"] = greek_value
+        rows.append(row)
 
-    df = pd.DataFrame(results)
+    df = pd.DataFrame(rows)
     df = df[df["symbol"].str.endswith("-PERP")]
-
-    common_tokens = get_common_symbols()
     df = df[df["symbol"].str.split("-").str[0].isin(common_tokens)]
 
     numeric_cols = [
@@ -56,20 +72,73 @@ def update_metrics():
     df["tier"] = pd.qcut(df["volume_24h"], q=5, labels=[5, 4, 3, 2, 1])
     df["tier"] = df["tier"].astype(int)
 
-    logger.info(f"Market metrics updated successfully: active_pairs.xlsx {len(df)} rows")
-
-    df.to_excel(DATA_DIR + "/active_pairs.xlsx", index=False)
-
     return df
 
 
 def get_common_symbols() -> set[str]:
-    with open(FUTURE_PAIRS_PARADEX_PATH, "r", encoding="utf-8") as f:
-        paradex_pairs = json.load(f).get("results", [])
-    with open(FUTURE_PAIRS_BACKPACK_PATH, "r", encoding="utf-8") as f:
-        backpack_pairs = json.load(f).get("results", [])
+    paradex_tokens = {item["base_currency"].upper() for item in get_registry(FUTURE_PAIRS_PARADEX_PATH).pairs()}
+    backpack_tokens = {item["baseSymbol"].upper() for item in get_registry(FUTURE_PAIRS_BACKPACK_PATH).pairs()}
+
+    return paradex_tokens & backpack_tokens
 
-    paradex_tokens = {item["base_currency"].upper() for item in paradex_pairs}
-    backpack_tokens = {item["baseSymbol"].upper() for item in backpack_pairs}
+
+def _paradex_tradable(pair: dict, now_ms: int) -> bool:
+    open_at = pair.get("open_at") or 0
+    expiry_at = pair.get("expiry_at") or 0
+    return open_at <= now_ms and (expiry_at == 0 or expiry_at > now_ms)
+
+
+def get_tradable_symbols() -> set[str]:
+    """Tokens listed on both exchanges whose markets currently accept new orders."""
+    now_ms = int(time.time() * 1000)
+    paradex_tokens = {
+        item["base_currency"].upper() for item in get_registry(FUTURE_PAIRS_PARADEX_PATH).pairs()
+        if _paradex_tradable(item, now_ms)
+    }
+    backpack_tokens = {
+        item["baseSymbol"].upper() for item in get_registry(FUTURE_PAIRS_BACKPACK_PATH).pairs()
+        if item.get("orderBookState", "Open") == "Open"
+    }
 
     return paradex_tokens & backpack_tokens
+
+
+_TRADABLE: Optional[set[str]] = None
+_TRADABLE_LOCK = threading.Lock()
+
+
+def is_tradable(token: str) -> bool:
+    global _TRADABLE
+
+    if _TRADABLE is None:
+        with _TRADABLE_LOCK:
+            if _TRADABLE is None:
+                _TRADABLE = get_tradable_symbols()
+    return token.upper() in _TRADABLE
+
+
+def on_market_changes(changes: List[MarketChange]) -> None:
+    global _TRADABLE
+
+    with _TRADABLE_LOCK:
+        previous = _TRADABLE
+        _TRADABLE = get_tradable_symbols()
+        current = _TRADABLE
+
+    if previous is not None:
+        if previous - current:
+            logger.warning(f"No longer tradable: {', '.join(sorted(previous - current))}")
+        if current - previous:
+            logger.info(f"Tradable again: {', '.join(sorted(current - previous))}")
+
+
+def start_market_refresher() -> None:
+    """Refresh both market lists in the background while trading (config ``market_refresh``)."""
+    if not USER_CONFIG.get("market_refresh", {}).get("enabled", True):
+        return
+
+    refresher = get_market_refresher()
+    refresher.add_source(PARADEX_MARKET_SOURCE)
+    refresher.add_source(BACKPACK_MARKET_SOURCE)
+    refresher.add_listener(on_market_changes)
+    refresher.start()
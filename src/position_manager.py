@@ -1,26 +1,49 @@
 import random
 import time
-from typing import Dict, Any
+from dataclasses import dataclass
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Tuple
 import pandas as pd
 import threading
 
 from src.config.constants import logger
 from src.config.paths import DATA_DIR
 from src.paradex.auth import get_account
+from src.paradex.auth import get_jwt_token
+from src.paradex.trade import prepare_order as prepare_order_paradex
+from src.paradex.trade import submit_order as submit_order_paradex
 from src.paradex.trade import open_position as open_position_paradex
 from src.paradex.trade import close_last_position as close_last_position_paradex
+from src.paradex.trade import reconcile_close as reconcile_close_paradex
 from src.paradex.account import get_last_position_info as get_last_position_info_paradex
 from src.paradex.account import get_balance as get_balance_paradex
 from src.paradex.market import get_pair_data as get_pair_data_paradex
 from src.paradex.market import get_pair_data_by_symbol
 from src.paradex.market import get_pair_price
-from utils.data import update_state, get_user_state, USER_CONFIG
+from src.paradex.order_stream import get_order_stream as get_order_stream_paradex
+from utils.data import update_state_many, USER_CONFIG
 from utils.calc import calc_size
+from src.backpack.trade import prepare_order as prepare_order_backpack
+from src.backpack.trade import submit_order as submit_order_backpack
 from src.backpack.trade import open_position as open_position_backpack
 from src.backpack.trade import close_last_position as close_last_position_backpack
+from src.backpack.trade import reconcile_close as reconcile_close_backpack
 from src.backpack.account import get_last_position_info as get_last_position_info_backpack
 from src.backpack.account import get_balance as get_balance_backpack
 from src.backpack.market import get_pair_data as get_pair_data_backpack
+from src.backpack.order_stream import get_order_stream as get_order_stream_backpack
+from src.risk_engine import get_risk_engine
+from src.paradex_pair_metrics import is_tradable
+from utils.retry import retry_call
+
+
+@dataclass
+class LegFill:
+    # Filled size; None when the fill was not confirmed and only the position shows the leg.
+    size: Optional[float] = None
+    # Exchange time of the fill; None when the venue did not report one or the leg was reconciled.
+    filled_at: Optional[float] = None
 
 
 class TradingManager:
@@ -32,7 +55,8 @@ class TradingManager:
         backpack_api_key: str,
         backpack_api_secret: str,
         backpack_proxy: str,
-        stop_event: threading.Event = None
+        stop_event: Optional[threading.Event] = None,
+        thread_id: Optional[str] = None
     ) -> None:
         self.paradex_creds: Dict[str, str] = {
             "address": paradex_address,
@@ -48,10 +72,16 @@ class TradingManager:
         self.df_accounts: pd.DataFrame = pd.DataFrame({})
         self.retries = self.config["retries"]
         self.stop_event = stop_event or threading.Event()
-        thread_name = threading.current_thread().name
-        self.thread_id = thread_name.split('-')[1].split()[0]  # Берем только число после "Thread-"
+        if thread_id is None:
+            thread_name = threading.current_thread().name
+            thread_id = thread_name.split('-')[1].split()[0]  # Берем только число после "Thread-"
+        self.thread_id = thread_id
         self.short_pk_paradex = self.get_short_pk(self.paradex_creds["private_key"])
         self.short_pk_backpack = self.get_short_pk(self.backpack_creds["api_secret"])
+        self.risk_event = threading.Event()
+        self.risk_breach: Optional[Tuple[str, float]] = None
+        self.risk_leg_ids = (f"{self.thread_id}:paradex:{self.short_pk_paradex}", f"{self.thread_id}:backpack:{self.short_pk_backpack}")
+        self._breach_listeners = []
 
     def get_random_from_range(self, key: str) -> int:
         if key in self.config and isinstance(self.config[key], dict):
@@ -67,6 +97,9 @@ class TradingManager:
             market_row = df_markets.iloc[idx]
             try:
                 pair_data = get_pair_data_by_symbol(market_row["symbol"])
+                if pair_data is not None and not is_tradable(pair_data["base_currency"]):
+                    logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Skipping {market_row['symbol']}: delisted or halted")
+                    continue
                 if pair_data is not None:
                     logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Selected market: {market_row['symbol']}")
                     return pair_data
@@ -90,24 +123,67 @@ class TradingManager:
         except Exception:
             return default
 
-    def start_trading(self) -> None:
-        while not self.stop_event.is_set():
-            order_value = self.get_random_from_range("order_value_usd")
-            order_duration = self.get_random_from_range("order_duration_min")
+    def safe_float(self, value, default=0.0) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def add_breach_listener(self, listener) -> None:
+        self._breach_listeners.append(listener)
+
+    def remove_breach_listener(self, listener) -> None:
+        if listener in self._breach_listeners:
+            self._breach_listeners.remove(listener)
+
+    def _on_risk_breach(self, leg_id: str, ltv: float) -> None:
+        self.risk_breach = (leg_id, ltv)
+        self.risk_event.set()
+        for listener in list(self._breach_listeners):
+            listener(leg_id, ltv)
+
+    def register_risk_legs(self, market_paradex: str, market_backpack: str, paradex_side: str, liq_pd, liq_bp) -> None:
+        engine = get_risk_engine()
+        self.risk_breach = None
+        self.risk_event.clear()
+
+        leg_pd, leg_bp = self.risk_leg_ids
+        side_pd = 1 if paradex_side == "BUY" else -1
+        legs = (
+            (leg_pd, "paradex", market_paradex, side_pd, liq_pd),
+            (leg_bp, "backpack", market_backpack, -side_pd, liq_bp),
+        )
+        for leg_id, venue, market, side, liq_price in legs:
+            liq_price = self.safe_float(liq_price)
+            if liq_price > 0:
+                engine.register(leg_id, venue, market, side, liq_price, self._on_risk_breach)
+            else:
+                logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] No liquidation price for {leg_id}, LTV is not monitored")
 
-            df_markets = pd.read_excel(f"{DATA_DIR}/active_pairs.xlsx")
-            pair_data = self.select_market_data(df_markets)
-            token = pair_data["base_currency"]
+    def prepare_trade(self) -> Tuple[str, Decimal, float, int]:
+        order_value = self.get_random_from_range("order_value_usd")
+        order_duration = self.get_random_from_range("order_duration_min")
 
-            max_order_value = self.get_max_order_value()
-            order_value = min(order_value, max_order_value)
+        token = self.select_token()
 
-            current_price = get_pair_price(token)
-            size = calc_size(order_value, token, current_price)
+        max_order_value = self.get_max_order_value()
+        order_value = min(order_value, max_order_value)
 
-            logger.info(
-                f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Starting trade: {token}, ${order_value}, {order_duration} min, Size: {size}"
-            )
+        current_price = get_pair_price(token)
+        size = calc_size(order_value, token, current_price)
+
+        logger.info(
+            f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Starting trade: {token}, ${order_value}, {order_duration} min, Size: {size}"
+        )
+        return token, size, order_value, order_duration
+
+    def select_token(self) -> str:
+        df_markets = pd.read_excel(f"{DATA_DIR}/active_pairs.xlsx")
+        return self.select_market_data(df_markets)["base_currency"]
+
+    def start_trading(self) -> None:
+        while not self.stop_event.is_set():
+            token, size, order_value, order_duration = self.prepare_trade()
 
             try:
                 self.open_positions(size, token)
@@ -131,21 +207,237 @@ class TradingManager:
     def get_max_order_value(self) -> float:
         paradex_account = get_account(self.paradex_creds["address"], self.paradex_creds["private_key"])
         paradex_balance_json = get_balance_paradex(paradex_account, self.paradex_creds["proxy"])
+        backpack_balance_json = get_balance_backpack(
+            self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]
+        )
+        return self.max_order_value(paradex_balance_json, backpack_balance_json)
 
+    def max_order_value(self, paradex_balance_json: dict, backpack_balance_json: dict) -> float:
         paradex_balance = 0.0
         for token_entry in paradex_balance_json.get("results", []):
             if token_entry["token"] == "USDC":
                 paradex_balance = float(token_entry["size"])
 
-        backpack_balance_json = get_balance_backpack(
-            self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]
-        )
         backpack_balance = float(backpack_balance_json["USDC"]["available"])
 
         min_balance = min(paradex_balance, backpack_balance)
         max_order_value = USER_CONFIG["max_leverage"] * min_balance
         return max_order_value
 
+    def open_paradex_leg(
+        self,
+        paradex_account,
+        side: str,
+        market: str,
+        size: str,
+        prepared: Optional[dict] = None,
+        abort: Optional[threading.Event] = None
+    ) -> Optional[LegFill]:
+        prepared_payloads = [prepared] if prepared else []
+
+        def submit() -> LegFill:
+            order_payload = prepared_payloads.pop() if prepared_payloads else prepare_order_paradex(paradex_account, side, market, size)
+            order = submit_order_paradex(paradex_account, order_payload, self.paradex_creds["proxy"])
+            return LegFill(order.get("filled_size"), order.get("filled_at"))
+
+        def reconcile() -> Optional[LegFill]:
+            position = get_last_position_info_paradex(paradex_account, self.paradex_creds["proxy"])
+            return LegFill() if position and position.get("market") == market else None
+
+        try:
+            fill = retry_call(submit, idempotent=False, reconcile=reconcile, stop_event=abort)
+        except Exception as exc:
+            logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex {side} failed: {exc}")
+            return None
+
+        logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex {side} opened")
+        return fill
+
+    def open_backpack_leg(
+        self,
+        side: str,
+        symbol: str,
+        size: str,
+        prepared: Optional[Tuple[dict, dict]] = None,
+        abort: Optional[threading.Event] = None
+    ) -> Optional[LegFill]:
+        prepared_orders = [prepared] if prepared else []
+
+        def submit() -> LegFill:
+            if prepared_orders:
+                order_payload, headers = prepared_orders.pop()
+            else:
+                order_payload, headers = prepare_order_backpack(
+                    self.backpack_creds["api_key"], self.backpack_creds["api_secret"], side, symbol, size
+                )
+            order = submit_order_backpack(self.backpack_creds["api_secret"], order_payload, headers, self.backpack_creds["proxy"])
+            return LegFill(order.get("filledQuantity"), order.get("filledAt"))
+
+        def reconcile() -> Optional[LegFill]:
+            position = get_last_position_info_backpack(
+                self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]
+            )
+            return LegFill() if position and position.get("symbol") == symbol else None
+
+        try:
+            fill = retry_call(submit, idempotent=False, reconcile=reconcile, stop_event=abort)
+        except Exception as exc:
+            logger.warning(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack {side} failed: {exc}")
+            return None
+
+        logger.info(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack {side} opened")
+        return fill
+
+    def open_legs_sequentially(self, paradex_account, paradex_side: str, market_paradex: str, backpack_side: str, market_backpack: str, size: str) -> Tuple[LegFill, LegFill]:
+        filled_pd = self.open_paradex_leg(paradex_account, paradex_side, market_paradex, size)
+        if filled_pd is None:
+            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to open positions")
+            self.close_positions()
+            raise RuntimeError("Unable to open position on Paradex")
+
+        filled_bp = self.open_backpack_leg(backpack_side, market_backpack, size)
+        if filled_bp is None:
+            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to open positions")
+            self.close_positions()
+            raise RuntimeError("Unable to open position on Backpack")
+
+        return filled_pd, filled_bp
+
+    def open_legs_concurrently(self, paradex_account, paradex_side: str, market_paradex: str, backpack_side: str, market_backpack: str, size: str) -> Tuple[LegFill, LegFill]:
+        get_jwt_token(paradex_account, self.paradex_creds["proxy"])
+        prepared_pd = prepare_order_paradex(paradex_account, paradex_side, market_paradex, size)
+        prepared_bp = prepare_order_backpack(
+            self.backpack_creds["api_key"], self.backpack_creds["api_secret"], backpack_side, market_backpack, size
+        )
+
+        # A leg that fails stops the other one from retrying, so a filled leg is unwound without waiting
+        # out the other leg's backoff.
+        abort = threading.Event()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_pd = executor.submit(self.open_paradex_leg, paradex_account, paradex_side, market_paradex, size, prepared_pd, abort)
+            future_bp = executor.submit(self.open_backpack_leg, backpack_side, market_backpack, size, prepared_bp, abort)
+            for future in as_completed((future_pd, future_bp)):
+                if future.result() is None:
+                    abort.set()
+            filled_pd = future_pd.result()
+            filled_bp = future_bp.result()
+
+        if filled_pd is not None and filled_bp is not None:
+            self.log_hedge_gap(filled_pd, filled_bp)
+            return filled_pd, filled_bp
+
+        logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to open positions")
+        # An aborted leg may have been left mid-reconcile, so both sides are closed; the closes re-read
+        # the position and are reduce-only, so closing a leg that never opened is a no-op.
+        logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Unwinding opened legs")
+        self.close_paradex_leg(paradex_account)
+        self.close_backpack_leg()
+
+        if filled_pd is not None:
+            raise RuntimeError("Unable to open position on Backpack")
+        if filled_bp is not None:
+            raise RuntimeError("Unable to open position on Paradex")
+        raise RuntimeError("Unable to open positions on Paradex and Backpack")
+
+    def log_hedge_gap(self, filled_pd: LegFill, filled_bp: LegFill) -> None:
+        # Both fill times come from the exchanges; the local clock would add skew and request latency.
+        if filled_pd.filled_at is not None and filled_bp.filled_at is not None:
+            hedge_gap_ms = abs(filled_pd.filled_at - filled_bp.filled_at) * 1000
+            logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Both legs filled, hedge gap {hedge_gap_ms:.0f} ms")
+        else:
+            logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Both legs filled")
+
+    def leg_imbalance(self, pair_data_pd: dict, pair_data_bp: dict, size_pd: float, size_bp: float) -> Optional[Tuple[str, Decimal]]:
+        """The venue whose leg filled more and by how much, or None when the legs match.
+
+        Raises RuntimeError when the excess is not a multiple of that venue's size increment; the caller unwinds.
+        """
+        increment_pd = Decimal(str(pair_data_pd["order_size_increment"]))
+        increment_bp = Decimal(str(pair_data_bp["stepSize"]))
+        filled_pd = (Decimal(str(size_pd)) / increment_pd).to_integral_value() * increment_pd
+        filled_bp = (Decimal(str(size_bp)) / increment_bp).to_integral_value() * increment_bp
+        if filled_pd == filled_bp:
+            return None
+
+        if filled_pd > filled_bp:
+            venue, excess, increment = "Paradex", filled_pd - filled_bp, increment_pd
+        else:
+            venue, excess, increment = "Backpack", filled_bp - filled_pd, increment_bp
+        logger.warning(
+            f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Legs filled unevenly "
+            f"(Paradex {filled_pd}, Backpack {filled_bp}), trimming {venue} by {excess}"
+        )
+
+        if excess % increment != 0:
+            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] {excess} is not a multiple of the {venue} size increment {increment}, unwinding")
+            raise RuntimeError("Unable to match partially filled legs")
+        return venue, excess
+
+    def balance_legs(
+        self,
+        paradex_account,
+        paradex_side: str,
+        pair_data_pd: dict,
+        backpack_side: str,
+        pair_data_bp: dict,
+        size_pd: float,
+        size_bp: float
+    ) -> bool:
+        """Trim the larger leg with a reduce-only order when one leg filled only partly.
+
+        Returns whether a trim was sent. Legs that cannot be matched exactly are unwound and RuntimeError is raised.
+        """
+        try:
+            imbalance = self.leg_imbalance(pair_data_pd, pair_data_bp, size_pd, size_bp)
+        except RuntimeError:
+            self.close_positions()
+            raise
+        if imbalance is None:
+            return False
+
+        venue, excess = imbalance
+        try:
+            if venue == "Paradex":
+                order = retry_call(
+                    open_position_paradex, paradex_account, self.opposite_order_side(paradex_side), pair_data_pd["symbol"],
+                    str(excess), self.paradex_creds["proxy"], reduce_only=True, idempotent=False
+                )
+                trimmed = order.get("filled_size")
+            else:
+                order = retry_call(
+                    open_position_backpack, self.backpack_creds["api_key"], self.backpack_creds["api_secret"],
+                    "Bid" if backpack_side == "Ask" else "Ask", pair_data_bp["symbol"], str(excess),
+                    self.backpack_creds["proxy"], reduce_only=True, idempotent=False
+                )
+                trimmed = order.get("filledQuantity")
+            if trimmed is not None and Decimal(str(trimmed)) < excess:
+                raise RuntimeError(f"trim filled only {trimmed} of {excess}")
+        except Exception as exc:
+            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to trim {venue}: {exc}, unwinding")
+            self.close_positions()
+            raise RuntimeError("Unable to match partially filled legs") from exc
+
+        return True
+
+    def wait_for_positions(self, paradex_account) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        execution_cfg = self.config.get("execution", {})
+        deadline = time.time() + execution_cfg.get("confirm_timeout_sec", 15)
+        poll_interval = execution_cfg.get("confirm_poll_interval_sec", 1)
+
+        last_pd = None
+        last_bp = None
+        while True:
+            if last_pd is None:
+                last_pd = get_last_position_info_paradex(paradex_account, self.paradex_creds["proxy"])
+            if last_bp is None:
+                last_bp = get_last_position_info_backpack(
+                    self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]
+                )
+
+            if (last_pd and last_bp) or time.time() >= deadline:
+                return last_pd, last_bp
+            time.sleep(poll_interval)
+
     def open_positions(self, size: str, token: str) -> None:
         paradex_account = get_account(self.paradex_creds["address"], self.paradex_creds["private_key"])
         pk_paradex = hex(paradex_account.signer.private_key)
@@ -162,199 +454,172 @@ class TradingManager:
             f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Opening: Paradex {paradex_side} ({market_paradex}), Backpack {backpack_side} ({market_backpack}), Size: {size}"
         )
 
-        paradex_success = False
-        for attempt in range(1, self.retries + 1):
-            try:
-                open_position_paradex(
-                    paradex_account, paradex_side, market_paradex, size, self.paradex_creds["proxy"]
-                )
-                paradex_success = True
-                logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex {paradex_side} opened on attempt {attempt}")
-                break
-            except Exception as exc:
-                logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex {paradex_side} failed on attempt {attempt}: {exc}")
-                time.sleep(1)
+        # Connect the fill streams before the orders go out so the confirmations are not missed;
+        # a stream that is not up within connect_timeout_sec is covered by the REST fallback.
+        connect_timeout = self.config.get("order_stream", {}).get("connect_timeout_sec", 2)
+        streams = (
+            get_order_stream_paradex(paradex_account, self.paradex_creds["proxy"]),
+            get_order_stream_backpack(self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]),
+        )
+        for stream in streams:
+            stream.wait_connected(connect_timeout)
 
-        if not paradex_success:
-            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to open positions")
-            self.close_positions()
-            raise RuntimeError("Unable to open position on Paradex")
+        if self.config.get("execution", {}).get("mode", "sequential") == "concurrent":
+            filled_pd, filled_bp = self.open_legs_concurrently(paradex_account, paradex_side, market_paradex, backpack_side, market_backpack, size)
+        else:
+            filled_pd, filled_bp = self.open_legs_sequentially(paradex_account, paradex_side, market_paradex, backpack_side, market_backpack, size)
 
-        backpack_success = False
-        for attempt in range(1, self.retries + 1):
-            try:
-                open_position_backpack(
-                    self.backpack_creds["api_key"], self.backpack_creds["api_secret"],
-                    backpack_side, market_backpack, size, self.backpack_creds["proxy"]
-                )
-                backpack_success = True
-                logger.info(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack {backpack_side} opened on attempt {attempt}")
-                break
-            except Exception as exc:
-                logger.warning(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack {backpack_side} failed on attempt {attempt}: {exc}")
-                time.sleep(1)
+        last_pd, last_bp = self.wait_for_positions(paradex_account)
 
-        if not backpack_success:
-            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to open positions")
+        try:
+            self.check_positions_visible(last_pd, last_bp)
+        except RuntimeError:
             self.close_positions()
-            raise RuntimeError("Unable to open position on Backpack")
+            raise
 
-        delay = random.randint(5, 10)
-        time.sleep(delay)
+        size_pd, size_bp = self.leg_sizes(filled_pd, filled_bp, last_pd, last_bp)
+        if self.balance_legs(paradex_account, paradex_side, pair_data_pd, backpack_side, pair_data_bp, size_pd, size_bp):
+            # The trim moved the liquidation price of the trimmed leg.
+            last_pd, last_bp = self.wait_for_positions(paradex_account)
 
-        last_pd = get_last_position_info_paradex(paradex_account, self.paradex_creds["proxy"])
-        last_bp = get_last_position_info_backpack(
-            self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]
-        )
+        self.record_positions(pk_paradex, paradex_side, backpack_side, market_paradex, market_backpack, last_pd, last_bp)
 
+    def check_positions_visible(self, last_pd: Optional[Dict[str, Any]], last_bp: Optional[Dict[str, Any]]) -> None:
+        """Raise RuntimeError unless both legs show up as positions; the caller unwinds."""
         if not (last_pd or last_bp):
             logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to get position info")
-            self.close_positions()
             raise RuntimeError("Unable to retrieve position info")
 
+        if not (last_pd and last_bp):
+            # A leg that does not show up is treated as failed: unwind the one that did instead of
+            # recording and monitoring a hedge that does not exist.
+            missing = "Backpack" if last_pd else "Paradex"
+            logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] {missing} leg is not visible after confirmation timeout")
+            raise RuntimeError(f"Unable to confirm position on {missing}")
+
+    def leg_sizes(self, filled_pd: LegFill, filled_bp: LegFill, last_pd: Dict[str, Any], last_bp: Dict[str, Any]) -> Tuple[float, float]:
+        # A leg whose fill was not confirmed is sized from its position.
+        size_pd = filled_pd.size if filled_pd.size is not None else abs(self.safe_float(last_pd.get("size")))
+        size_bp = filled_bp.size if filled_bp.size is not None else abs(self.safe_float(last_bp.get("netQuantity")))
+        return size_pd, size_bp
+
+    def record_positions(
+        self,
+        pk_paradex: str,
+        paradex_side: str,
+        backpack_side: str,
+        market_paradex: str,
+        market_backpack: str,
+        last_pd: Dict[str, Any],
+        last_bp: Dict[str, Any]
+    ) -> None:
         liq_pd = self.safe_get(last_pd, "liquidation_price", 0)
-        update_state(pk_paradex, "position", "active")
-        update_state(pk_paradex, "order_side", paradex_side)
-        update_state(pk_paradex, "order_liq_price", liq_pd)
+        update_state_many(pk_paradex, {
+            "position": "active",
+            "order_side": paradex_side,
+            "order_liq_price": liq_pd,
+            "hedge_backpack_api_key": self.backpack_creds["api_key"],
+        })
 
         liq_bp = self.safe_get(last_bp, "estLiquidationPrice", 0)
-        update_state(self.backpack_creds["api_secret"], "position", "active")
-        update_state(self.backpack_creds["api_secret"], "order_side", backpack_side)
-        update_state(self.backpack_creds["api_secret"], "order_liq_price", liq_bp)
+        update_state_many(self.backpack_creds["api_secret"], {
+            "position": "active",
+            "order_side": backpack_side,
+            "order_liq_price": liq_bp,
+            "hedge_paradex_address": self.paradex_creds["address"],
+        })
+
+        self.register_risk_legs(market_paradex, market_backpack, paradex_side, liq_pd, liq_bp)
+
+    def close_paradex_leg(self, paradex_account) -> bool:
+        # A close that timed out may still have filled: reconcile by re-reading the position instead
+        # of resubmitting, and the close order itself is reduce-only in case that read lags.
+        proxy = self.paradex_creds["proxy"]
+        try:
+            retry_call(
+                close_last_position_paradex, paradex_account, proxy,
+                idempotent=False, reconcile=lambda: reconcile_close_paradex(paradex_account, proxy)
+            )
+        except Exception as exc:
+            logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex close failed: {exc}")
+            return False
+
+        logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex closed")
+        return True
+
+    def close_backpack_leg(self) -> bool:
+        creds = (self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"])
+        try:
+            retry_call(
+                close_last_position_backpack, *creds,
+                idempotent=False, reconcile=lambda: reconcile_close_backpack(*creds)
+            )
+        except Exception as exc:
+            logger.warning(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack close failed: {exc}")
+            return False
+
+        logger.debug(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack closed")
+        return True
 
     def close_positions(self) -> None:
         paradex_account = get_account(self.paradex_creds["address"], self.paradex_creds["private_key"])
 
         logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Closing positions")
 
-        paradex_success = False
-        for attempt in range(1, self.retries + 1):
-            try:
-                close_last_position_paradex(paradex_account, self.paradex_creds["proxy"])
-                paradex_success = True
-                logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex closed on attempt {attempt}")
-                break
-            except Exception as exc:
-                logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex close failed on attempt {attempt}: {exc}")
-                time.sleep(1)
+        paradex_success = self.close_paradex_leg(paradex_account)
+        backpack_success = self.close_backpack_leg()
+        self.settle_closed_legs(paradex_success, backpack_success)
 
-        backpack_success = False
-        for attempt in range(1, self.retries + 1):
-            try:
-                close_last_position_backpack(
-                    self.backpack_creds["api_key"], self.backpack_creds["api_secret"], self.backpack_creds["proxy"]
-                )
-                backpack_success = True
-                logger.debug(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack closed on attempt {attempt}")
-                break
-            except Exception as exc:
-                logger.warning(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack close failed on attempt {attempt}: {exc}")
-                time.sleep(1)
+    def settle_closed_legs(self, paradex_success: bool, backpack_success: bool) -> None:
+        engine = get_risk_engine()
+        for leg_id, success in zip(self.risk_leg_ids, (paradex_success, backpack_success)):
+            if success:
+                engine.unregister(leg_id)
+            else:
+                # The leg is still open, so it must be able to breach again.
+                engine.rearm(leg_id)
 
         if not (paradex_success or backpack_success):
             logger.error(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Failed to close positions")
             raise RuntimeError("Unable to close positions")
 
+    def refresh_ltv(self) -> None:
+        engine = get_risk_engine()
+        engine.refresh(self.risk_leg_ids, self.config.get("price_feed", {}).get("max_age_sec", 5))
+        for leg_id in self.risk_leg_ids:
+            if engine.is_registered(leg_id) and engine.get_ltv(leg_id) is None:
+                logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] No price for {leg_id}, LTV is unknown")
+
+    def report_breach(self) -> bool:
+        if not self.risk_event.is_set() or self.risk_breach is None:
+            return False
+
+        leg_id, ltv = self.risk_breach
+        logger.info(
+            f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] {leg_id} LTV={round(ltv, 1)}% exceeds max ({self.config['max_position_ltv']}%)"
+        )
+        logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Stopping due to high LTV")
+        return True
+
+    def check_ltv(self) -> bool:
+        if not self.report_breach():
+            return False
+        self.close_positions()
+        return True
+
     def monitor_ltv(self, duration_min: int) -> None:
         logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Monitoring LTV for {duration_min} min")
         end_time = time.time() + duration_min * 60
         logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] duration_min={duration_min}, end_time={end_time}")
 
         while time.time() < end_time and not self.stop_event.is_set():
-            try:
-                state: Dict[str, Dict[str, Any]] = get_user_state()
-                paradex_key = self.paradex_creds["private_key"]
-                backpack_key = self.backpack_creds["api_secret"]
-
-                paradex_info = state.get(paradex_key, {})
-                backpack_info = state.get(backpack_key, {})
-                current_price_pd = 0
-                logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] State received. Paradex: {paradex_info}, Backpack: {backpack_info}")
-
-                if paradex_info.get("position") == "active":
-                    logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex position active, calculating LTV")
-                    side_pd = paradex_info.get("order_side", "").upper()
-                    liq_pd = paradex_info.get("order_liq_price", 0.0)
-                    last_order_pd = paradex_info.get("last_order", {})
-                    market_pd = last_order_pd.get("market", "")
-                    logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] Side: {side_pd}, LiqPrice: {liq_pd}, Market: {market_pd}")
-
-                    if market_pd:
-                        base_token_pd = market_pd.split("-")[0]
-                        current_price_pd = get_pair_price(base_token_pd)
-                        logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] Current price for {base_token_pd}: {current_price_pd}")
-
-                        if current_price_pd and liq_pd:
-                            if side_pd == "SELL":
-                                ltv_pd = current_price_pd / float(liq_pd)
-                            elif side_pd == "BUY":
-                                ltv_pd = float(liq_pd) / current_price_pd
-                            else:
-                                ltv_pd = 0
-
-                            ltv_pd *= 100
-                            ltv_pd_rounded = round(ltv_pd, 1)
-
-                            logger.debug(
-                                f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex LTV={ltv_pd_rounded}% | "
-                                f"Side={side_pd} | Market={market_pd} | CurrentPrice={current_price_pd} | LiqPrice={liq_pd}"
-                            )
-
-                            if ltv_pd > self.config["max_position_ltv"]:
-                                logger.info(
-                                    f"[{self.thread_id}] [{self.short_pk_paradex}] Paradex LTV={ltv_pd_rounded}% exceeds max ({self.config['max_position_ltv']}%), Side={side_pd}, Market={market_pd}"
-                                )
-                                logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] Stopping due to high LTV")
-                                self.close_positions()
-                                self.stop_event.set()
-                                return
-
-                if backpack_info.get("position") == "active":
-                    logger.debug(f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack position active, calculating LTV")
-                    side_bp = backpack_info.get("order_side", "").upper()
-                    liq_bp = backpack_info.get("order_liq_price", 0.0)
-                    logger.debug(f"[{self.thread_id}] [{self.short_pk_backpack}] Side: {side_bp}, LiqPrice: {liq_bp}")
-
-                    if isinstance(liq_bp, str):
-                        if liq_bp.strip() == '':
-                            liq_bp = 0.0
-                        else:
-                            try:
-                                liq_bp = float(liq_bp)
-                            except ValueError:
-                                liq_bp = 0.0
-                        logger.debug(f"[{self.thread_id}] [{self.short_pk_backpack}] Converted LiqPrice to float: {liq_bp}")
-
-                    if current_price_pd and liq_bp:
-                        if side_bp == "ASK":
-                            ltv_bp = current_price_pd / liq_bp
-                        elif side_bp == "BID":
-                            ltv_bp = liq_bp / current_price_pd
-                        else:
-                            ltv_bp = 0
-
-                        ltv_bp *= 100
-                        ltv_bp_rounded = round(ltv_bp, 1)
-
-                        logger.debug(
-                            f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack LTV={ltv_bp_rounded}% | "
-                            f"Side={side_bp} | Market={market_pd} | CurrentPrice={current_price_pd} | LiqPrice={liq_bp}"
-                        )
-
-                        if ltv_bp > self.config["max_position_ltv"]:
-                            logger.info(
-                                f"[{self.thread_id}] [{self.short_pk_backpack}] Backpack LTV={ltv_bp_rounded}% exceeds max ({self.config['max_position_ltv']}%), Side={side_bp}, Market={market_pd}"
-                            )
-                            logger.info(f"[{self.thread_id}] [{self.short_pk_backpack}] Stopping due to high LTV")
-                            self.close_positions()
-                            self.stop_event.set()
-                            return
-
-            except Exception as exc:
-                logger.warning(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] LTV monitoring error: {exc}")
-
+            # The risk engine sets risk_event on the price tick that crosses the limit; every
+            # ltv_checks_sec the legs are also repriced over REST in case a feed went quiet.
             wait_time = self.get_random_from_range("ltv_checks_sec")
-            logger.debug(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] Next LTV check in {wait_time}s")
-            time.sleep(wait_time)
+            if not self.risk_event.wait(min(wait_time, max(end_time - time.time(), 0))):
+                self.refresh_ltv()
+            if self.check_ltv():
+                self.stop_event.set()
+                return
 
         logger.info(f"[{self.thread_id}] [{self.short_pk_paradex}] [{self.short_pk_backpack}] LTV monitoring finished")
@@ -0,0 +1,215 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config.constants import logger
+from src.backpack.price_feed import get_price_feed as get_backpack_price_feed
+from src.paradex.price_feed import get_price_feed as get_paradex_price_feed
+from utils.data import USER_CONFIG
+from utils.price_feed import PriceFeed, Quote
+
+
+@dataclass
+class RiskLeg:
+    leg_id: str
+    venue: str
+    market: str
+    side: int
+    liq_price: float
+    on_breach: Callable[[str, float], None]
+
+
+class RiskEngine:
+    def __init__(self, max_ltv: float, capacity: int = 64) -> None:
+        self.max_ltv = max_ltv
+        self._lock = threading.RLock()
+        self._feeds: Dict[str, PriceFeed] = {}
+        self._legs: List[Optional[RiskLeg]] = [None] * capacity
+        self._rows: Dict[str, int] = {}
+        self._free_rows = list(range(capacity - 1, -1, -1))
+        self._markets: Dict[Tuple[str, str], int] = {}
+        self._market_keys: List[Tuple[str, str]] = []
+
+        self._active = np.zeros(capacity, dtype=bool)
+        self._side = np.zeros(capacity, dtype=np.int8)
+        self._liq = np.zeros(capacity, dtype=np.float64)
+        self._market_idx = np.zeros(capacity, dtype=np.int32)
+        self._breached = np.zeros(capacity, dtype=bool)
+        self._prices = np.zeros(8, dtype=np.float64)
+
+    def add_feed(self, venue: str, feed: PriceFeed) -> None:
+        with self._lock:
+            self._feeds[venue] = feed
+        feed.add_listener(lambda symbol, quote: self.on_price(venue, symbol, quote))
+
+    def _grow(self) -> None:
+        capacity = len(self._legs)
+        new_capacity = capacity * 2
+        self._legs.extend([None] * capacity)
+        self._free_rows = list(range(new_capacity - 1, capacity - 1, -1)) + self._free_rows
+        for name in ("_active", "_side", "_liq", "_market_idx", "_breached"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros(capacity, dtype=array.dtype)]))
+
+    def _market(self, venue: str, market: str) -> int:
+        key = (venue, market)
+        idx = self._markets.get(key)
+        if idx is None:
+            idx = len(self._market_keys)
+            self._markets[key] = idx
+            self._market_keys.append(key)
+            if idx >= len(self._prices):
+                self._prices = np.concatenate([self._prices, np.zeros(len(self._prices))])
+        return idx
+
+    def register(
+        self,
+        leg_id: str,
+        venue: str,
+        market: str,
+        side: int,
+        liq_price: float,
+        on_breach: Callable[[str, float], None]
+    ) -> None:
+        feed = self._feeds[venue]
+        with self._lock:
+            if leg_id in self._rows:
+                self.unregister(leg_id)
+            if not self._free_rows:
+                self._grow()
+
+            row = self._free_rows.pop()
+            market_idx = self._market(venue, market)
+            self._legs[row] = RiskLeg(leg_id, venue, market, side, liq_price, on_breach)
+            self._rows[leg_id] = row
+            self._active[row] = True
+            self._side[row] = side
+            self._liq[row] = liq_price
+            self._market_idx[row] = market_idx
+            self._breached[row] = False
+
+        feed.subscribe(market)
+        quote = feed.get_quote(market)
+        if quote is not None:
+            self.on_price(venue, market, quote)
+
+    def unregister(self, leg_id: str) -> None:
+        with self._lock:
+            row = self._rows.pop(leg_id, None)
+            if row is None:
+                return
+            self._legs[row] = None
+            self._active[row] = False
+            self._breached[row] = False
+            self._free_rows.append(row)
+
+    def is_registered(self, leg_id: str) -> bool:
+        with self._lock:
+            return leg_id in self._rows
+
+    def rearm(self, leg_id: str) -> None:
+        """Let a breached leg fire again, e.g. after closing it failed."""
+        with self._lock:
+            row = self._rows.get(leg_id)
+            if row is not None:
+                self._breached[row] = False
+
+    def refresh(self, leg_ids: Iterable[str], max_age_sec: float) -> None:
+        """Fetch a REST price for every leg whose quote is older than ``max_age_sec``, then evaluate all legs.
+
+        Breaches normally fire on the price tick that crosses the limit; this covers feeds that went quiet.
+        """
+        with self._lock:
+            legs = [self._legs[self._rows[leg_id]] for leg_id in leg_ids if leg_id in self._rows]
+        markets = {(leg.venue, leg.market) for leg in legs}
+
+        for venue, market in markets:
+            feed = self._feeds[venue]
+            if feed.get_quote(market, max_age_sec) is not None:
+                continue
+            try:
+                feed.fetch_quote(market)
+            except Exception as exc:
+                logger.warning(f"Risk engine: failed to refresh {venue} price for {market}: {exc}")
+
+        self.evaluate()
+
+    def _ltv(self) -> np.ndarray:
+        prices = self._prices[self._market_idx]
+        valid = self._active & (self._liq > 0) & (prices > 0)
+        safe_prices = np.where(valid, prices, 1.0)
+        safe_liq = np.where(valid, self._liq, 1.0)
+        ltv = np.where(self._side > 0, safe_liq / safe_prices, safe_prices / safe_liq) * 100
+        return np.where(valid, ltv, np.nan)
+
+    def on_price(self, venue: str, market: str, quote: Quote) -> None:
+        with self._lock:
+            market_idx = self._markets.get((venue, market))
+            if market_idx is None:
+                return
+            self._prices[market_idx] = quote.mid
+            self.evaluate(market_idx)
+
+    def evaluate(self, market_idx: Optional[int] = None) -> None:
+        with self._lock:
+            ltv = self._ltv()
+            crossed = ~self._breached & (np.nan_to_num(ltv, nan=0.0) > self.max_ltv)
+            if market_idx is not None:
+                crossed &= self._market_idx == market_idx
+
+            rows = np.flatnonzero(crossed)
+            self._breached[rows] = True
+            breaches = [(self._legs[row], float(ltv[row])) for row in rows]
+
+        for leg, leg_ltv in breaches:
+            try:
+                leg.on_breach(leg.leg_id, leg_ltv)
+            except Exception as exc:
+                logger.warning(f"Risk engine: breach handler failed for {leg.leg_id}: {exc}")
+
+    def get_ltv(self, leg_id: str) -> Optional[float]:
+        with self._lock:
+            row = self._rows.get(leg_id)
+            if row is None:
+                return None
+            ltv = float(self._ltv()[row])
+        return None if np.isnan(ltv) else ltv
+
+    def table(self) -> pd.DataFrame:
+        with self._lock:
+            ltv = self._ltv()
+            records = [
+                {
+                    "leg_id": leg.leg_id,
+                    "venue": leg.venue,
+                    "market": leg.market,
+                    "side": "LONG" if leg.side > 0 else "SHORT",
+                    "liq_price": leg.liq_price,
+                    "price": self._prices[self._market_idx[row]],
+                    "ltv": ltv[row],
+                    "breached": bool(self._breached[row]),
+                }
+                for leg_id, row in self._rows.items()
+                for leg in [self._legs[row]]
+            ]
+        return pd.DataFrame(records, columns=["leg_id", "venue", "market", "side", "liq_price", "price", "ltv", "breached"])
+
+
+_RISK_ENGINE: Optional[RiskEngine] = None
+_RISK_ENGINE_LOCK = threading.Lock()
+
+
+def get_risk_engine() -> RiskEngine:
+    global _RISK_ENGINE
+
+    if _RISK_ENGINE is None:
+        with _RISK_ENGINE_LOCK:
+            if _RISK_ENGINE is None:
+                engine = RiskEngine(max_ltv=USER_CONFIG["max_position_ltv"])
+                engine.add_feed("paradex", get_paradex_price_feed())
+                engine.add_feed("backpack", get_backpack_price_feed())
+                _RISK_ENGINE = engine
+    return _RISK_ENGINE
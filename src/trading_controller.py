@@ -1,16 +1,30 @@
+import math
 import threading
 import time
 import random
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
+from typing import Dict, Any, List, Optional
 import pandas as pd
 
 from src.config.constants import logger
-from src.config.paths import DATA_DIR
-from utils.data import USER_CONFIG
+from utils.data import USER_CONFIG, get_user_state
 from src.paradex.auth import get_account
+from src.paradex.signing import get_signing_service
 from src.paradex.trade import close_last_position as close_last_position_paradex
+from src.paradex.trade import reconcile_close as reconcile_close_paradex
+from src.paradex_pair_metrics import start_market_refresher
 from src.backpack.trade import close_last_position as close_last_position_backpack
+from src.backpack.trade import reconcile_close as reconcile_close_backpack
 from src.position_manager import TradingManager
+from utils.accounts_store import load_accounts
+from utils.retry import RetryError, get_retry_policy, retry_call
+from utils.stark import hex_to_int
+
+
+def load_active_accounts(table: str) -> pd.DataFrame:
+    df = load_accounts(table)
+    return df[df["is_active"] == True].sample(frac=1).reset_index(drop=True)
 
 
 class TradingController:
@@ -20,19 +34,17 @@ class TradingController:
         self.threads = {}
 
     def run_trading_managers(self) -> None:
-        df_paradex = pd.read_excel(f"{DATA_DIR}/accounts_paradex.xlsx")
-        df_paradex = df_paradex[df_paradex["is_active"] == True].sample(frac=1).reset_index(drop=True)
-
-        df_backpack = pd.read_excel(f"{DATA_DIR}/accounts_backpack.xlsx")
-        df_backpack = df_backpack[df_backpack["is_active"] == True].sample(frac=1).reset_index(drop=True)
+        df_paradex = load_active_accounts("accounts_paradex")
+        df_backpack = load_active_accounts("accounts_backpack")
 
         n_workers = min(len(df_paradex), len(df_backpack))
         max_retries = self.retries
 
         logger.info(f"Starting {n_workers} trading threads")
+        get_signing_service().warm_up()
+        start_market_refresher()
 
         def thread_worker(paradex_data: pd.Series, backpack_data: pd.Series, stop_event: threading.Event) -> None:
-            attempts = 0
             thread_name = threading.current_thread().name
             thread_id = thread_name.split('-')[1].split()[0]
             short_pk_paradex = paradex_data["private_key"][:10]
@@ -56,25 +68,29 @@ class TradingController:
                 stop_event=stop_event
             )
 
-            while attempts < max_retries and not stop_event.is_set():
+            def trading_session() -> None:
                 try:
                     manager.start_trading()
-                    break
                 except Exception as exc:
-                    attempts += 1
-                    logger.error(f"[{thread_id}] [{short_pk_paradex}] [{short_pk_backpack}] Error (Attempt {attempts}/{max_retries}): {exc}")
-                    
+                    logger.error(f"[{thread_id}] [{short_pk_paradex}] [{short_pk_backpack}] Error: {exc}")
                     try:
                         manager.close_positions()
                     except Exception as close_exc:
                         logger.error(f"[{thread_id}] [{short_pk_paradex}] [{short_pk_backpack}] Close failed: {close_exc}")
-
-                    if attempts < max_retries:
-                        delay = random.randint(5, 10)
-                        logger.info(f"[{thread_id}] [{short_pk_paradex}] [{short_pk_backpack}] Retrying after {delay}s")
-                        time.sleep(delay)
-                    else:
-                        logger.error(f"[{thread_id}] [{short_pk_paradex}] [{short_pk_backpack}] Failed after {max_retries} attempts")
+                    if isinstance(exc, RetryError):
+                        # A request that ran out of retries (an outage) is worth a new session later;
+                        # rejections and other non-retryable errors still end the thread.
+                        raise RuntimeError(str(exc)) from exc
+                    raise
+
+            # A session is retried with the shared backoff; only the attempt count bounds it, since a
+            # single session legitimately runs for hours.
+            policy = replace(get_retry_policy(), attempts=max_retries, deadline_sec=math.inf)
+            try:
+                retry_call(trading_session, policy=policy, stop_event=stop_event)
+            except Exception as exc:
+                if not stop_event.is_set():
+                    logger.error(f"[{thread_id}] [{short_pk_paradex}] [{short_pk_backpack}] Giving up: {exc}")
 
         for n in range(n_workers):
             paradex_data = df_paradex.iloc[n]
@@ -106,55 +122,69 @@ class TradingController:
         else:
             logger.warning(f"[{thread_id}] Thread not found")
 
-    def close_all_positions(self) -> None:
-        delay_cfg = self.config["delay_between_starting_new_thread_sec"]
-
-        df_paradex = pd.read_excel(f"{DATA_DIR}/accounts_paradex.xlsx")
-        df_paradex = df_paradex[df_paradex["is_active"] == True].sample(frac=1).reset_index(drop=True)
-
-        for i in range(df_paradex.shape[0]):
-            data = df_paradex.iloc[i]
-            account = get_account(data["address"], data["private_key"])
-            short_pk_paradex = hex(account.signer.private_key)[:10]
-            success = False
+    def close_all_positions(self, workers: Optional[int] = None, deadline_sec: Optional[float] = None) -> pd.DataFrame:
+        """Flatten every active account: both legs of a recorded hedge at the same time, many pairs
+        concurrently, and everything still open after ``deadline_sec`` reported as timed out."""
+        close_cfg = self.config.get("close_all", {})
+        workers = workers or close_cfg.get("workers", 16)
+        deadline_sec = deadline_sec or close_cfg.get("deadline_sec", 300)
+        deadline = time.monotonic() + deadline_sec
+
+        legs = pair_close_legs(load_active_accounts("accounts_paradex"), load_active_accounts("accounts_backpack"))
+        logger.info(f"Closing {len(legs)} legs with {workers} workers, deadline {deadline_sec}s")
+
+        def close_leg(exchange: str, data: pd.Series) -> str:
+            policy = replace(get_retry_policy(), deadline_sec=max(deadline - time.monotonic(), 0))
+            if exchange == "paradex":
+                args = (get_account(data["address"], data["private_key"]), data["proxy"])
+                close, reconcile = close_last_position_paradex, reconcile_close_paradex
+            else:
+                args = (data["api_key"], data["api_secret"], data["proxy"])
+                close, reconcile = close_last_position_backpack, reconcile_close_backpack
+            closed = retry_call(close, *args, policy=policy, idempotent=False, reconcile=lambda: reconcile(*args))
+            return "closed" if closed else "flat"
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Close")
+        futures = {executor.submit(close_leg, leg["exchange"], leg.pop("data")): leg for leg in legs}
+        done, not_done = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future, leg in futures.items():
+            if future in not_done:
+                leg["result"] = "timeout"
+            elif future.exception() is not None:
+                leg["result"] = f"failed: {future.exception()}"
+            else:
+                leg["result"] = future.result()
+
+        results = pd.DataFrame(list(futures.values()), columns=["pair", "exchange", "account", "result"])
+        failed = results[~results["result"].isin(["closed", "flat"])]
+        logger.info(f"Close-all results:\n{results.to_string(index=False)}")
+        if failed.empty:
+            logger.success(f"All {len(results)} legs are flat")
+        else:
+            logger.error(f"{len(failed)} of {len(results)} legs are still open or unknown")
+        return results
 
-            for attempt in range(1, self.retries + 1):
-                try:
-                    close_last_position_paradex(account, data["proxy"])
-                    success = True
-                    logger.info(f"[{short_pk_paradex}] Paradex closed on attempt {attempt}")
-                    break
-                except Exception as exc:
-                    logger.warning(f"[{short_pk_paradex}] Paradex close failed on attempt {attempt}: {exc}")
-                    time.sleep(1)
 
-            if not success:
-                logger.error(f"[{short_pk_paradex}] Failed to close Paradex after {self.retries} attempts")
-                
-            delay = random.randint(delay_cfg["min"], delay_cfg["max"])
-            logger.info(f"Waiting {delay} sec..")
-            time.sleep(delay)
+def pair_close_legs(df_paradex: pd.DataFrame, df_backpack: pd.DataFrame) -> List[Dict[str, Any]]:
+    """One close job per account, hedged legs next to each other so they are submitted together.
 
-        df_backpack = pd.read_excel(f"{DATA_DIR}/accounts_backpack.xlsx")
-        df_backpack = df_backpack[df_backpack["is_active"] == True].sample(frac=1).reset_index(drop=True)
+    Pairs come from the ``hedge_*`` keys the trading manager stores when it opens a position;
+    accounts without a recorded counterpart are closed on their own.
+    """
+    state = get_user_state()
+    backpack_by_key = {row["api_key"]: row for _, row in df_backpack.iterrows()}
 
-        for i in range(df_backpack.shape[0]):
-            data = df_backpack.iloc[i]
-            short_pk_backpack = str(data["api_secret"])[:10]
-            success = False
+    legs = []
+    for pair, (_, data) in enumerate(df_paradex.iterrows()):
+        legs.append({"pair": pair, "exchange": "paradex", "account": str(data["address"])[:10], "data": data})
 
-            for attempt in range(1, self.retries + 1):
-                try:
-                    close_last_position_backpack(data["api_key"], data["api_secret"], data["proxy"])
-                    success = True
-                    logger.info(f"[{short_pk_backpack}] Backpack closed on attempt {attempt}")
-                    break
-                except Exception as exc:
-                    logger.warning(f"[{short_pk_backpack}] Backpack close failed on attempt {attempt}: {exc}")
-                    time.sleep(1)
+        api_key = state.get(hex(hex_to_int(data["private_key"])), {}).get("hedge_backpack_api_key")
+        hedge = backpack_by_key.pop(api_key, None)
+        if hedge is not None:
+            legs.append({"pair": pair, "exchange": "backpack", "account": str(hedge["api_key"])[:10], "data": hedge})
 
-            if not success:
-                logger.error(f"[{short_pk_backpack}] Failed to close Backpack after {self.retries} attempts")
-                
-            delay = random.randint(delay_cfg["min"], delay_cfg["max"])
-            time.sleep(delay)
\ No newline at end of file
+    for pair, data in enumerate(backpack_by_key.values(), start=len(df_paradex)):
+        legs.append({"pair": pair, "exchange": "backpack", "account": str(data["api_key"])[:10], "data": data})
+    return legs
@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.config.constants import logger
+from src.config.paths import ACCOUNTS_DB_PATH, DATA_DIR
+
+ACCOUNT_TABLES = {
+    "accounts_paradex": "private_key",
+    "accounts_backpack": "api_key",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _serialize_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    clean = df.astype(object).where(pd.notna(df), None)
+    return clean.to_dict("records")
+
+
+def xlsx_path(table: str) -> str:
+    return os.path.join(DATA_DIR, f"{table}.xlsx")
+
+
+class AccountStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Dict[str, str]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        for table in ACCOUNT_TABLES:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, position INTEGER NOT NULL, data TEXT NOT NULL)"
+            )
+
+    def _get_meta(self, key: str, default: Any = None) -> Any:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+    def is_imported(self, table: str) -> bool:
+        with self._lock:
+            return self._get_meta(f"{table}.imported_at") is not None
+
+    def load(self, table: str) -> pd.DataFrame:
+        with self._lock:
+            columns = self._get_meta(f"{table}.columns", [])
+            rows = self._conn.execute(f"SELECT key, data FROM {table} ORDER BY position").fetchall()
+            self._snapshots[table] = {key: data for key, data in rows}
+
+        records = [json.loads(data) for _, data in rows]
+        return pd.DataFrame.from_records(records, columns=columns or None)
+
+    def save(self, table: str, df: pd.DataFrame) -> int:
+        key_column = ACCOUNT_TABLES[table]
+        records = _serialize_rows(df)
+
+        with self._lock:
+            snapshot = self._snapshots.get(table)
+            if snapshot is None:
+                snapshot = {key: data for key, data in self._conn.execute(f"SELECT key, data FROM {table}")}
+
+            new_snapshot: Dict[str, str] = {}
+            changed = []
+            for position, record in enumerate(records):
+                key = str(record[key_column])
+                data = json.dumps(record, ensure_ascii=False, default=_json_default)
+                new_snapshot[key] = data
+                if snapshot.get(key) != data:
+                    changed.append((key, position, data))
+            removed = [(key,) for key in snapshot if key not in new_snapshot]
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO {table} (key, position, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET position = excluded.position, data = excluded.data",
+                    changed,
+                )
+                self._conn.executemany(f"DELETE FROM {table} WHERE key = ?", removed)
+                self._set_meta(f"{table}.columns", [str(col) for col in df.columns])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._snapshots[table] = new_snapshot
+
+        logger.debug(f"{table}: {len(changed)} rows written, {len(removed)} rows removed")
+        return len(changed) + len(removed)
+
+    def import_xlsx(self, table: str, path: Optional[str] = None) -> int:
+        path = path or xlsx_path(table)
+        df = pd.read_excel(path)
+        key_column = ACCOUNT_TABLES[table]
+        if key_column not in df.columns:
+            raise ValueError(f"Missing '{key_column}' column in {path}")
+
+        self.save(table, df)
+        with self._lock:
+            self._set_meta(f"{table}.imported_at", os.path.getmtime(path))
+
+        logger.success(f"{table}: imported {len(df)} accounts from {os.path.basename(path)}")
+        return len(df)
+
+    def export_xlsx(self, table: str, path: Optional[str] = None) -> int:
+        path = path or xlsx_path(table)
+        df = self.load(table)
+        df.to_excel(path, index=False)
+
+        with self._lock:
+            self._set_meta(f"{table}.imported_at", os.path.getmtime(path))
+
+        logger.success(f"{table}: exported {len(df)} accounts to {os.path.basename(path)}")
+        return len(df)
+
+    def xlsx_is_newer(self, table: str) -> bool:
+        path = xlsx_path(table)
+        with self._lock:
+            imported_at = self._get_meta(f"{table}.imported_at")
+        return imported_at is not None and os.path.exists(path) and os.path.getmtime(path) > imported_at
+
+
+_STORE: Optional[AccountStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_account_store() -> AccountStore:
+    global _STORE
+
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = AccountStore(ACCOUNTS_DB_PATH)
+    return _STORE
+
+
+def load_accounts(table: str) -> pd.DataFrame:
+    store = get_account_store()
+    if not store.is_imported(table):
+        store.import_xlsx(table)
+    elif store.xlsx_is_newer(table):
+        logger.warning(f"{table}.xlsx was edited after the last import, run the import to apply the changes")
+    return store.load(table)
+
+
+def save_accounts(table: str, df: pd.DataFrame) -> int:
+    return get_account_store().save(table, df)
+
+
+def import_accounts_from_xlsx() -> None:
+    store = get_account_store()
+    for table in ACCOUNT_TABLES:
+        store.import_xlsx(table)
+
+
+def export_accounts_to_xlsx() -> None:
+    store = get_account_store()
+    for table in ACCOUNT_TABLES:
+        store.export_xlsx(table)
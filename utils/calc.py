@@ -1,101 +1,153 @@
-import numpy as np
-import random
-from decimal import Decimal, getcontext
+import math
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from src.config.constants import logger
-from src.paradex.market import get_pair_data as get_pair_data_paradex
-from src.backpack.market import get_pair_data as get_pair_data_backpack
-
-getcontext().prec = 32
-
+from src.config.paths import FUTURE_PAIRS_BACKPACK_PATH, FUTURE_PAIRS_PARADEX_PATH
+from utils.markets import get_registry
+from utils.metrics import CALC_SIZE_DURATION
+
+
+@dataclass(frozen=True)
+class QuantSpec:
+    """Order size rules of one token on both venues, as integers in units of ``10 ** -decimals``."""
+    token: str
+    decimals: int
+    increment_paradex: int
+    increment_backpack: int
+    increment: int
+    min_quantity_backpack: int
+    min_notional_paradex: Tuple[int, int]
+    size_decimals: int
+
+    @property
+    def scale(self) -> int:
+        return 10 ** self.decimals
+
+    def to_decimal(self, units: int) -> Decimal:
+        """``units`` (a multiple of ``increment``) as a Decimal with ``size_decimals`` places."""
+        return Decimal(units // 10 ** (self.decimals - self.size_decimals)).scaleb(-self.size_decimals)
+
+    def size_units(self, nominal_value: float, current_price: float) -> int:
+        """Largest size, on the common increment, worth at most ``nominal_value``; 0 if it is below
+        either venue's minimum."""
+        # Decimal(str(x)) is the value the user sees; float.as_integer_ratio() is its binary
+        # approximation and would size 200 USD at 0.1 as 1999 units instead of 2000.
+        value_num, value_den = Decimal(str(nominal_value)).as_integer_ratio()
+        price_num, price_den = Decimal(str(current_price)).as_integer_ratio()
+
+        units = value_num * price_den * self.scale // (value_den * price_num)
+        units -= units % self.increment
+        if units < self.min_quantity_backpack:
+            return 0
+
+        # units is a multiple of the Paradex increment, so it meets the minimum notional rounded up to
+        # that increment exactly when units * price >= min_notional.
+        notional_num, notional_den = self.min_notional_paradex
+        if units * price_num * notional_den < notional_num * price_den * self.scale:
+            return 0
+        return units
+
+
+def _decimals(value: str) -> int:
+    return max(-Decimal(value).normalize().as_tuple().exponent, 0)
+
+
+def build_quant_spec(token: str, pair_paradex: dict, pair_backpack: dict) -> QuantSpec:
+    increment_paradex = str(pair_paradex["order_size_increment"])
+    increment_backpack = str(pair_backpack["stepSize"])
+    min_quantity_backpack = str(pair_backpack["filters"]["quantity"].get("minQuantity") or increment_backpack)
+
+    decimals = max(_decimals(increment_paradex), _decimals(increment_backpack), _decimals(min_quantity_backpack))
+    scale = 10 ** decimals
+    units_paradex = int(Decimal(increment_paradex) * scale)
+    units_backpack = int(Decimal(increment_backpack) * scale)
+    increment = math.lcm(units_paradex, units_backpack)
+    return QuantSpec(
+        token=token,
+        decimals=decimals,
+        increment_paradex=units_paradex,
+        increment_backpack=units_backpack,
+        # A multiple of both increments can never be rejected for precision by either venue.
+        increment=increment,
+        min_quantity_backpack=int(Decimal(min_quantity_backpack) * scale),
+        min_notional_paradex=Decimal(str(pair_paradex["min_notional"])).as_integer_ratio(),
+        size_decimals=_decimals(str(Decimal(increment).scaleb(-decimals))),
+    )
+
+
+_SPECS: Dict[str, QuantSpec] = {}
+_SPECS_VERSION: Optional[Tuple[int, int]] = None
+_SPECS_LOCK = threading.Lock()
+
+
+def _load_specs() -> Dict[str, QuantSpec]:
+    global _SPECS, _SPECS_VERSION
+
+    registry_paradex = get_registry(FUTURE_PAIRS_PARADEX_PATH)
+    registry_backpack = get_registry(FUTURE_PAIRS_BACKPACK_PATH)
+    pairs_paradex = registry_paradex.pairs()
+    pairs_backpack = registry_backpack.pairs()
+
+    version = (registry_paradex.version, registry_backpack.version)
+    if version == _SPECS_VERSION:
+        return _SPECS
+
+    with _SPECS_LOCK:
+        if version != _SPECS_VERSION:
+            backpack_by_token = {pair["baseSymbol"].casefold(): pair for pair in pairs_backpack if pair.get("baseSymbol")}
+            specs = {}
+            for pair in pairs_paradex:
+                token = pair.get("base_currency", "")
+                pair_backpack = backpack_by_token.get(token.casefold())
+                if pair_backpack is None:
+                    continue
+                try:
+                    specs[token.casefold()] = build_quant_spec(token, pair, pair_backpack)
+                except (KeyError, TypeError, ArithmeticError) as exc:
+                    logger.warning(f"Skipping size rules for {token}: {exc}")
+            _SPECS = specs
+            _SPECS_VERSION = version
+    return _SPECS
+
+
+def get_quant_spec(token: str) -> QuantSpec:
+    spec = _load_specs().get(token.casefold())
+    if spec is None:
+        raise ValueError(f"Token '{token}' is not listed on both Paradex and Backpack")
+    return spec
+
+
+@CALC_SIZE_DURATION.timed()
 def calc_size(
     nominal_value: int,
     token: str,
     current_price: float
-) -> tuple:
-    logger.debug(f"Calculating size for token: {token} with nominal value: {nominal_value} USD and current price: {current_price} USD")
-
-    try:
-        pair_data_paradex = get_pair_data_paradex(token)
-        logger.debug(f"Received Paradex pair data for {token}: {pair_data_paradex}")
-    except Exception as e:
-        logger.error(f"Failed to retrieve Paradex pair data for {token}: {e}")
-        raise
-
-    try:
-        pair_data_backpack = get_pair_data_backpack(token)
-        logger.debug(f"Received Backpack pair data for {token}: {pair_data_backpack}")
-    except Exception as e:
-        logger.error(f"Failed to retrieve Backpack pair data for {token}: {e}")
-        raise
-
-    min_notional_paradex = float(pair_data_paradex["min_notional"])
-    logger.debug(f"Paradex minimum notional value for {token}: {min_notional_paradex}")
-
-    precision_paradex = Decimal(str(pair_data_paradex["order_size_increment"]))
-    logger.debug(f"Paradex order size increment (precision) for {token}: {precision_paradex}")
-
-    precision_backpack = Decimal(str(pair_data_backpack["stepSize"]))
-    logger.debug(f"Backpack step size (precision) for {token}: {precision_backpack}")
-
-    min_token_amount_paradex = calc_min_token_amount(min_notional_paradex, current_price, precision_paradex)
-    logger.debug(f"Minimum token amount for Paradex: {min_token_amount_paradex}")
-
-    min_token_amount_backpack = Decimal(pair_data_backpack["filters"]["quantity"]["minQuantity"])
-    logger.debug(f"Minimum token amount for Backpack: {min_token_amount_backpack}")
-
-    try:
-        max_token_amount_paradex = resize_amount(
-            Decimal(str(nominal_value)) / Decimal(str(current_price)), precision_paradex
-        )
-        logger.debug(f"Maximum token amount for Paradex: {max_token_amount_paradex}")
-    except Exception as e:
-        logger.error(f"Error calculating max token amount for Paradex: {e}")
-        raise
-
-    try:
-        max_token_amount_backpack = resize_amount(
-            Decimal(str(nominal_value)) / Decimal(str(current_price)), precision_backpack
-        )
-        logger.debug(f"Maximum token amount for Backpack: {max_token_amount_backpack}")
-    except Exception as e:
-        logger.error(f"Error calculating max token amount for Backpack: {e}")
-        raise
-
-    if max_token_amount_paradex < min_token_amount_paradex or max_token_amount_backpack < min_token_amount_backpack:
-        logger.error(f"Order size is too low ({nominal_value} USD) for token: {token}. "
-                     f"Max Paradex amount: {max_token_amount_paradex}, "
-                     f"Min Paradex amount: {min_token_amount_paradex}, "
-                     f"Max Backpack amount: {max_token_amount_backpack}, "
-                     f"Min Backpack amount: {min_token_amount_backpack}")
-        raise ValueError("Order size error")
-    
-    logger.debug(f"Calculation successful for token: {token}. Paradex size: {max_token_amount_paradex}, Backpack size: {max_token_amount_backpack}")
-    
-    if precision_paradex > precision_backpack:
-        return max_token_amount_paradex
-    return max_token_amount_backpack
-
-
-
-def calc_min_token_amount(
-    min_notional: int,
-    current_price: float,
-    precision: Decimal
 ) -> Decimal:
-    min_amount = Decimal(str(min_notional)) / Decimal(str(current_price))
-    return resize_up_amount(min_amount, precision)
-
-
-def resize_amount(
-    amount: Decimal,
-    precision: Decimal
-) -> Decimal:
-    return (amount // precision) * precision
-
+    spec = get_quant_spec(token)
+    units = spec.size_units(float(nominal_value), float(current_price))
+    if not units:
+        logger.error(f"Order size is too low ({nominal_value} USD at {current_price}) for token: {token}")
+        raise ValueError("Order size error")
 
-def resize_up_amount(
-    amount: Decimal,
-    precision: Decimal
-) -> Decimal:
-    return ((amount + precision - Decimal("1E-32")) // precision) * precision
+    size = spec.to_decimal(units)
+    logger.debug(f"Calculated size for {token}: {size} ({nominal_value} USD at {current_price})")
+    return size
+
+
+def calc_sizes(orders: Iterable[Tuple[str, float, float]]) -> List[Optional[Decimal]]:
+    """Size many ``(token, nominal_value, current_price)`` orders at once.
+
+    Orders that fall below a venue minimum come back as None instead of raising.
+    """
+    specs = _load_specs()
+    sizes = []
+    for token, nominal_value, current_price in orders:
+        spec = specs.get(token.casefold())
+        if spec is None:
+            raise ValueError(f"Token '{token}' is not listed on both Paradex and Backpack")
+        units = spec.size_units(float(nominal_value), float(current_price))
+        sizes.append(spec.to_decimal(units) if units else None)
+    return sizes
@@ -1,8 +1,10 @@
 import json
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from src.config.paths import CONFIG_PATH, STATE_PATH
+from src.config.paths import CONFIG_PATH, STATE_PATH, STATE_DB_PATH
+from utils.state import StateStore, JsonStateStore, SqliteStateStore
 
 
 def _load_pairs(path: Path) -> list:
@@ -13,15 +15,6 @@ def _load_pairs(path: Path) -> list:
         raise RuntimeError(f"Failed to load pairs data from {path}") from exc
 
 
-def _find_pair_by_key(key: str, value: str, path: str) -> dict:
-    pairs = _load_pairs(Path(path))
-    value_upper = value.upper()
-    for pair in pairs:
-        if pair.get(key, "").upper() == value_upper:
-            return pair
-    raise ValueError(f"{key.capitalize()} '{value}' not found in futures pairs")
-
-
 def load_json(path: Path) -> Dict[str, Any]:
     with path.open(encoding="utf-8") as file:
         return json.load(file)
@@ -32,19 +25,41 @@ def dump_json(path: Path, json_file: dict) -> None:
         json.dump(json_file, file, ensure_ascii=False, indent=2)
 
 
+def get_state_store() -> StateStore:
+    global _STATE_STORE
+
+    if _STATE_STORE is not None:
+        return _STATE_STORE
+
+    with _STATE_STORE_LOCK:
+        if _STATE_STORE is None:
+            backend = USER_CONFIG.get("state_backend", "sqlite")
+            if backend == "sqlite":
+                _STATE_STORE = SqliteStateStore(STATE_DB_PATH, json_path=STATE_PATH)
+            elif backend == "json":
+                _STATE_STORE = JsonStateStore(STATE_PATH)
+            else:
+                raise ValueError(f"Unknown state backend '{backend}'")
+    return _STATE_STORE
+
+
 def update_state(private_key: str, key: Any, value: Any) -> None:
-    path = Path(STATE_PATH)
-    state = load_json(path)
+    get_state_store().update(private_key, {key: value})
+
 
-    if private_key not in state:
-        state[private_key] = {}
+def update_state_many(private_key: str, values: Dict[Any, Any]) -> None:
+    get_state_store().update(private_key, values)
 
-    state[private_key][str(key)] = value
-    dump_json(path, state)
+
+def get_account_state(private_key: str) -> Dict[str, Any]:
+    return get_state_store().get(private_key)
 
 
 def get_user_state() -> Dict[str, Any]:
-    return load_json(Path(STATE_PATH))
+    return get_state_store().get_all()
 
 
 USER_CONFIG: Dict[str, Any] = load_json(Path(CONFIG_PATH))
+
+_STATE_STORE: Optional[StateStore] = None
+_STATE_STORE_LOCK = threading.Lock()
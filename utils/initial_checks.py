@@ -1,12 +1,12 @@
-import requests
 import pandas as pd
 from typing import List
 
 from src.accounts_monitor import update_accounts_info
-from src.config.paths import DATA_DIR
 from src.config.constants import logger
+from utils.accounts_store import load_accounts
 from utils.data import USER_CONFIG
-from utils.proxy import convert_proxy_to_dict
+from utils.proxy import proxy_label
+from utils.proxy_health import check_proxies
 
 
 def check_config() -> None:
@@ -62,8 +62,8 @@ def check_config() -> None:
     if "retries" not in config or not isinstance(config["retries"], int):
         raise ValueError("Missing or invalid 'retries'")
 
-    if config["retries"] < 0:
-        raise ValueError("'retries' must be >= 0")
+    if config["retries"] < 1:
+        raise ValueError("'retries' must be >= 1")
 
     if "debug_level" not in config or not isinstance(config["debug_level"], str):
         raise ValueError("Missing or invalid 'debug_level'")
@@ -75,8 +75,8 @@ def check_config() -> None:
     logger.success("✅ Config check passed.")
 
 
-def check_accounts(filename: str, required_columns: List[str], table_name: str) -> None:
-    df = pd.read_excel(DATA_DIR + f"/{filename}")
+def check_accounts(filename: str, required_columns: List[str], table_name: str, exchange: str) -> None:
+    df = load_accounts(table_name)
 
     for col in required_columns:
         if col not in df.columns:
@@ -85,6 +85,11 @@ def check_accounts(filename: str, required_columns: List[str], table_name: str)
     if not df["is_active"].dropna().apply(lambda x: isinstance(x, bool) or x in [True, False, 'TRUE', 'FALSE']).all():
         raise ValueError(f"Column 'is_active' must contain only boolean values (True/False) in {filename}")
 
+    active = df[df["is_active"].astype(str).str.upper() == "TRUE"]
+    proxy_health = check_proxies(
+        (str(proxy), exchange) for proxy in active["proxy"] if pd.notna(proxy) and str(proxy).strip() != ""
+    )
+
     order_value_max = USER_CONFIG["order_value_usd"]["max"]
     order_value_min = USER_CONFIG["order_value_usd"]["min"]
     max_leverage = USER_CONFIG["max_leverage"]
@@ -101,7 +106,10 @@ def check_accounts(filename: str, required_columns: List[str], table_name: str)
         proxy = row.get("proxy", "")
         if pd.isna(proxy) or str(proxy).strip() == "":
             raise ValueError(f"[{short_pk}] Proxy is missing or empty in {filename}")
-        check_proxy(proxy)
+
+        health = proxy_health[(str(proxy), exchange)]
+        if not health.healthy:
+            raise ValueError(f"[{short_pk}] Invalid or unreachable proxy '{proxy_label(str(proxy))}': {health.last_error}")
 
         usdc_balance = row.get("USDC", 0)
         max_order = usdc_balance * max_leverage
@@ -136,29 +144,18 @@ def check_all_accounts() -> None:
     check_accounts(
         filename="accounts_paradex.xlsx",
         required_columns=["USDC", "is_active", "position_market", "proxy"],
-        table_name="accounts_paradex"
+        table_name="accounts_paradex",
+        exchange="paradex"
     )
 
     check_accounts(
         filename="accounts_backpack.xlsx",
         required_columns=["USDC", "is_active", "proxy", "api_key", "api_secret"],
-        table_name="accounts_backpack"
+        table_name="accounts_backpack",
+        exchange="backpack"
     )
 
 
-def check_proxy(proxy_str: str) -> None:
-    try:
-        response = requests.get(
-            "https://example.com",
-            proxies=convert_proxy_to_dict(proxy_str),
-            timeout=5
-        )
-        if response.status_code != 200:
-            raise ValueError(f"Proxy returned status code {response.status_code}")
-    except Exception as e:
-        raise ValueError(f"Invalid or unreachable proxy '{proxy_str}': {e}")
-
-
 def start():
     logger.info("Starting initial checks")
     update_accounts_info()
@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config.constants import logger
+from utils.data import USER_CONFIG, _load_pairs
+from utils.markets import get_registry
+from utils.retry import ExchangeHTTPError
+from utils.sessions import http_get
+
+
+@dataclass(frozen=True)
+class MarketChange:
+    exchange: str
+    kind: str  # "listed", "delisted" or "changed"
+    symbol: str
+    fields: Tuple[str, ...] = ()
+
+
+@dataclass
+class MarketSource:
+    """Where one exchange publishes its market list and how to turn the response into ``pairs_*.json`` rows."""
+    exchange: str
+    url: str
+    path: str
+    normalize: Callable[[Any], List[dict]]
+    key: str = "symbol"
+    # Fields the bot trades on; only these count as a change. Dotted names reach into nested objects.
+    fields: Tuple[str, ...] = ()
+
+    @property
+    def validators_path(self) -> Path:
+        path = Path(self.path)
+        return path.with_name(path.stem + ".validators.json")
+
+
+def _field(pair: dict, name: str) -> Any:
+    value = pair
+    for part in name.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def diff_markets(
+    exchange: str,
+    old: List[dict],
+    new: List[dict],
+    key: str = "symbol",
+    fields: Tuple[str, ...] = ()
+) -> List[MarketChange]:
+    """Compare two market lists on ``fields``, or on every top-level field when none are given."""
+    old_by_key = {pair.get(key): pair for pair in old}
+    new_by_key = {pair.get(key): pair for pair in new}
+
+    changes = []
+    for symbol, pair in new_by_key.items():
+        previous = old_by_key.get(symbol)
+        if previous is None:
+            changes.append(MarketChange(exchange, "listed", symbol))
+            continue
+
+        names = fields or previous.keys() | pair.keys()
+        changed = tuple(sorted(name for name in names if _field(previous, name) != _field(pair, name)))
+        if changed:
+            changes.append(MarketChange(exchange, "changed", symbol, changed))
+    for symbol in old_by_key.keys() - new_by_key.keys():
+        changes.append(MarketChange(exchange, "delisted", symbol))
+    return changes
+
+
+def write_pairs(path: str, pairs: List[dict]) -> None:
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as file:
+        json.dump({"results": pairs}, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _load_validators(path: Path) -> Dict[str, str]:
+    try:
+        with path.open("r", encoding="utf-8") as file:
+            validators = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def _save_validators(path: Path, validators: Dict[str, str]) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump(validators, file)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning(f"Failed to save market validators to {path}: {exc}")
+
+
+class MarketRefresher:
+    """Keeps ``pairs_*.json`` in sync with the exchanges.
+
+    Requests are conditional (``If-None-Match``/``If-Modified-Since``) when the exchange sent validators, and the
+    file is only rewritten when a field the bot trades on differs, so an idle refresh costs one small response and
+    does not bump the registry version. Validators are kept next to the pairs file so restarts stay conditional.
+    """
+
+    def __init__(self, interval_sec: float = 300) -> None:
+        self.interval_sec = interval_sec
+        self._lock = threading.Lock()
+        self._sources: Dict[str, MarketSource] = {}
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._listeners: List[Callable[[List[MarketChange]], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_source(self, source: MarketSource) -> None:
+        with self._lock:
+            self._sources[source.exchange] = source
+
+    def add_listener(self, listener: Callable[[List[MarketChange]], None]) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def _fetch(self, source: MarketSource) -> Optional[Tuple[List[dict], Dict[str, str]]]:
+        with self._lock:
+            validators = self._validators.get(source.exchange)
+            if validators is None:
+                validators = self._validators[source.exchange] = _load_validators(source.validators_path)
+        headers = {}
+        if Path(source.path).exists():
+            if "ETag" in validators:
+                headers["If-None-Match"] = validators["ETag"]
+            if "Last-Modified" in validators:
+                headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        response = http_get(source.exchange, source.url, headers=headers)
+        if response.status_code == 304:
+            return None
+        if response.status_code != 200:
+            logger.error(f"Error fetching current {source.exchange} futures pairs: {response.text}")
+            raise ExchangeHTTPError(f"Failed to fetch {source.exchange} markets", response)
+
+        validators = {name: response.headers[name] for name in ("ETag", "Last-Modified") if name in response.headers}
+        return source.normalize(response.json()), validators
+
+    def _store_validators(self, source: MarketSource, validators: Dict[str, str]) -> None:
+        # Only called once the pairs file matches this response: validators that run ahead of the
+        # file would turn every later request into a 304 and leave the file stale.
+        with self._lock:
+            self._validators[source.exchange] = validators
+        _save_validators(source.validators_path, validators)
+
+    def refresh(self, exchange: str) -> List[MarketChange]:
+        source = self._sources[exchange]
+        fetched = self._fetch(source)
+        if fetched is None:
+            logger.debug(f"{exchange} markets not modified")
+            return []
+        pairs, validators = fetched
+
+        try:
+            cached = _load_pairs(Path(source.path))
+        except RuntimeError:
+            cached = None
+
+        changes = diff_markets(exchange, cached or [], pairs, source.key, source.fields)
+        if cached is not None and not changes:
+            logger.debug(f"{exchange} markets unchanged ({len(pairs)} pairs)")
+            self._store_validators(source, validators)
+            return []
+
+        write_pairs(source.path, pairs)
+        self._store_validators(source, validators)
+        get_registry(source.path).reload()
+        for change in changes:
+            fields = f": {', '.join(change.fields)}" if change.fields else ""
+            logger.info(f"{exchange} market {change.kind} {change.symbol}{fields}")
+
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(changes)
+            except Exception as exc:
+                logger.warning(f"Market change listener failed for {exchange}: {exc}")
+        return changes
+
+    def refresh_all(self) -> List[MarketChange]:
+        changes = []
+        for exchange in list(self._sources):
+            changes.extend(self.refresh(exchange))
+        return changes
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="market-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_sec):
+            for exchange in list(self._sources):
+                try:
+                    self.refresh(exchange)
+                except Exception as exc:
+                    logger.warning(f"Failed to refresh {exchange} markets: {exc}")
+
+
+_REFRESHER: Optional[MarketRefresher] = None
+_REFRESHER_LOCK = threading.Lock()
+
+
+def get_market_refresher() -> MarketRefresher:
+    global _REFRESHER
+
+    if _REFRESHER is not None:
+        return _REFRESHER
+
+    with _REFRESHER_LOCK:
+        if _REFRESHER is None:
+            _REFRESHER = MarketRefresher(USER_CONFIG.get("market_refresh", {}).get("interval_sec", 300))
+    return _REFRESHER
@@ -0,0 +1,96 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from utils.data import _load_pairs
+
+
+class MarketRegistry:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.version = 0
+        self._lock = threading.RLock()
+        self._mtime: Optional[int] = None
+        self._pairs: List[dict] = []
+        self._indexes: Dict[str, Dict[str, dict]] = {}
+        self._listeners: List[Callable[["MarketRegistry"], None]] = []
+
+    def _file_mtime(self) -> int:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError as exc:
+            raise RuntimeError(f"Failed to load pairs data from {self.path}") from exc
+
+    def _refresh(self, force: bool = False) -> None:
+        mtime = self._file_mtime()
+        if not force and mtime == self._mtime:
+            return
+
+        with self._lock:
+            if not force and mtime == self._mtime:
+                return
+            self._pairs = _load_pairs(self.path)
+            self._indexes = {}
+            self._mtime = mtime
+            self.version += 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(self)
+
+    def _index(self, key: str) -> Dict[str, dict]:
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = {}
+                for pair in self._pairs:
+                    value = pair.get(key)
+                    if isinstance(value, str):
+                        index.setdefault(value.casefold(), pair)
+                self._indexes[key] = index
+        return index
+
+    def reload(self) -> None:
+        self._refresh(force=True)
+
+    def pairs(self) -> List[dict]:
+        self._refresh()
+        return self._pairs
+
+    def find(self, key: str, value: str) -> dict:
+        self._refresh()
+        pair = self._index(key).get(value.casefold())
+        if pair is None:
+            raise ValueError(f"{key.capitalize()} '{value}' not found in futures pairs")
+        return pair
+
+    def add_listener(self, listener: Callable[["MarketRegistry"], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+
+_REGISTRIES: Dict[str, MarketRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_registry(path: str) -> MarketRegistry:
+    key = os.path.abspath(path)
+    registry = _REGISTRIES.get(key)
+    if registry is not None:
+        return registry
+
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = MarketRegistry(key)
+            _REGISTRIES[key] = registry
+    return registry
+
+
+def _find_pair_by_key(key: str, value: str, path: str) -> dict:
+    return get_registry(path).find(key, value)
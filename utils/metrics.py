@@ -0,0 +1,250 @@
+import functools
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from src.config.constants import logger
+from utils.data import USER_CONFIG
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CPU_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1)
+
+_ID_SEGMENT = re.compile(r"^(0x[0-9a-fA-F]+|[0-9a-fA-F-]{16,}|\d+)$")
+_TEMPLATED_PATHS = (
+    (re.compile(r"^/bbo/[^/]+$"), "/bbo/{market}"),
+    (re.compile(r"^/orders/[^/]+$"), "/orders/{id}"),
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts followed by the running sum and total count.
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[idx] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for idx, bound in enumerate(self.buckets):
+                cumulative += state[idx]
+                labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+_REGISTRY: Dict[str, Metric] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _register(metric: Metric) -> Metric:
+    with _REGISTRY_LOCK:
+        return _REGISTRY.setdefault(metric.name, metric)
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def render() -> str:
+    with _REGISTRY_LOCK:
+        metrics = list(_REGISTRY.values())
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+def normalize_endpoint(url: str) -> str:
+    path = urlparse(url).path
+    for prefix in ("/api/v1", "/v1"):
+        idx = path.find(prefix)
+        if idx >= 0:
+            path = path[idx + len(prefix):]
+            break
+
+    for pattern, template in _TEMPLATED_PATHS:
+        if pattern.match(path):
+            return template
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")) or "/"
+
+
+HTTP_REQUESTS = counter(
+    "bot_http_requests_total", "Outbound HTTP requests by response status",
+    ("exchange", "endpoint", "method", "proxy", "status"),
+)
+HTTP_LATENCY = histogram(
+    "bot_http_request_duration_seconds", "Outbound HTTP request latency",
+    ("exchange", "endpoint", "method", "proxy"),
+)
+HTTP_REQUEST_BYTES = counter(
+    "bot_http_request_bytes_total", "Bytes sent in outbound HTTP request bodies",
+    ("exchange", "endpoint", "proxy"),
+)
+HTTP_RESPONSE_BYTES = counter(
+    "bot_http_response_bytes_total", "Bytes received in HTTP response bodies",
+    ("exchange", "endpoint", "proxy"),
+)
+RATE_LIMIT_WAIT = histogram(
+    "bot_rate_limit_wait_seconds", "Time spent waiting for a rate limit token before a request",
+    ("exchange", "endpoint_class", "proxy"), (0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RATE_LIMITED = counter(
+    "bot_rate_limited_total", "HTTP 429 responses that slowed down a rate limit bucket",
+    ("exchange", "endpoint_class", "proxy"),
+)
+RETRY_ATTEMPTS = counter(
+    "bot_retry_attempts_total", "Failed attempts inside retry loops by error class", ("function", "outcome"),
+)
+RETRY_EXHAUSTED = counter(
+    "bot_retry_exhausted_total", "Retry loops that gave up after the last attempt", ("function",),
+)
+SIGNING_DURATION = histogram(
+    "bot_signing_duration_seconds", "Time spent signing requests and orders", ("kind",), CPU_BUCKETS,
+)
+CALC_SIZE_DURATION = histogram(
+    "bot_calc_size_duration_seconds", "Time spent in utils.calc.calc_size", (), CPU_BUCKETS,
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+_SERVER: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    global _SERVER
+
+    metrics_cfg = USER_CONFIG.get("metrics", {})
+    if _SERVER is not None or not metrics_cfg.get("enabled", False):
+        return _SERVER
+
+    host = host or metrics_cfg.get("host", "127.0.0.1")
+    port = port or metrics_cfg.get("port", 9108)
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as exc:
+        logger.warning(f"Metrics server could not bind to {host}:{port}: {exc}")
+        return None
+
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    _SERVER = server
+    logger.info(f"Metrics available at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,269 @@
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import websocket
+
+from src.config.constants import logger
+from utils.data import USER_CONFIG
+
+
+@dataclass(frozen=True)
+class OrderUpdate:
+    order_id: str
+    market: str
+    status: str
+    filled_size: float
+    avg_price: Optional[float]
+    final: bool
+    reject_reason: str = ""
+    # Exchange time of the last update; None when the venue did not report one.
+    updated_at: Optional[float] = None
+
+
+def wait_options() -> Dict[str, float]:
+    stream_cfg = USER_CONFIG.get("order_stream", {})
+    return {
+        "timeout_sec": stream_cfg.get("fill_timeout_sec", 10),
+        "poll_interval_sec": stream_cfg.get("poll_interval_sec", 1),
+        "ws_grace_sec": stream_cfg.get("ws_grace_sec", 2),
+    }
+
+
+def close_idle_streams(streams: Dict[str, "OrderStream"], idle_sec: float) -> None:
+    """Stop and drop the streams of accounts that have not placed an order for ``idle_sec``.
+    The caller holds the lock that guards ``streams``."""
+    now = time.time()
+    for key, stream in list(streams.items()):
+        if now - stream.last_used_at > idle_sec:
+            stream.stop()
+            del streams[key]
+
+
+class OrderStream(ABC):
+    """Authenticated per-account WebSocket that resolves one future per order once it is final."""
+
+    name = ""
+    ws_url = ""
+
+    def __init__(self, proxy: Optional[str] = None, reconnect_delay_sec: float = 5, history_size: int = 256) -> None:
+        self.proxy = proxy
+        self.reconnect_delay_sec = reconnect_delay_sec
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        self._final_updates: Dict[str, OrderUpdate] = {}
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._ws_connected = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_used_at = time.time()
+
+    @abstractmethod
+    def _open_messages(self) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _parse_message(self, message: Dict[str, Any]) -> Optional[OrderUpdate]:
+        ...
+
+    @property
+    def connected(self) -> bool:
+        return self._ws_connected.is_set()
+
+    def start(self) -> None:
+        if self._thread is None and self.ws_url:
+            self._thread = threading.Thread(target=self._run_ws, name=f"{self.name}-orders", daemon=True)
+            self._thread.start()
+
+    def wait_connected(self, timeout_sec: float) -> bool:
+        """Block until the stream is authenticated, at most ``timeout_sec``. False when it is not
+        running or did not connect in time; wait_for_order then falls back to REST."""
+        if self._thread is None:
+            return False
+        return self._ws_connected.wait(timeout_sec)
+
+    async def wait_connected_async(self, timeout_sec: float, check_interval_sec: float = 0.05) -> bool:
+        """wait_connected for the asyncio engine: checks the connection flag between awaited sleeps."""
+        if self._thread is None:
+            return False
+        deadline = time.monotonic() + timeout_sec
+        while not self._ws_connected.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(check_interval_sec, remaining))
+        return True
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def expect(self, order_id: str) -> Future:
+        self.last_used_at = time.time()
+        with self._lock:
+            future = self._futures.get(order_id)
+            if future is None:
+                future = self._futures[order_id] = Future()
+                update = self._final_updates.pop(order_id, None)
+                if update is not None:
+                    future.set_result(update)
+        return future
+
+    def resolve(self, update: OrderUpdate) -> None:
+        if not update.final:
+            return
+
+        with self._lock:
+            future = self._futures.pop(update.order_id, None)
+            if future is None:
+                # The fill can arrive before the REST response that tells us the order id.
+                self._final_updates[update.order_id] = update
+                while len(self._final_updates) > self.history_size:
+                    self._final_updates.pop(next(iter(self._final_updates)))
+                return
+
+        if not future.done():
+            future.set_result(update)
+
+    def wait_for_order(
+        self,
+        order_id: str,
+        poll: Callable[[], Optional[OrderUpdate]],
+        timeout_sec: float = 10,
+        poll_interval_sec: float = 1,
+        ws_grace_sec: float = 2
+    ) -> Optional[OrderUpdate]:
+        """Wait for the final state of ``order_id``, falling back to ``poll`` when the stream is
+        down or stays silent past ``ws_grace_sec``. Returns None if nothing final arrives in time."""
+        future = self.expect(order_id)
+        started = time.time()
+        deadline = started + timeout_sec
+
+        while True:
+            if not future.done() and (not self.connected or time.time() - started >= ws_grace_sec):
+                try:
+                    update = poll()
+                except Exception as exc:
+                    logger.debug(f"{self.name}: REST order poll failed for {order_id}: {exc}")
+                    update = None
+                if update is not None and update.final:
+                    self.resolve(update)
+                    return update
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                return future.result(timeout=min(poll_interval_sec, remaining))
+            except FutureTimeoutError:
+                pass
+
+        with self._lock:
+            self._futures.pop(order_id, None)
+        return None
+
+    async def wait_for_order_async(
+        self,
+        order_id: str,
+        poll: Callable[[], Awaitable[Optional[OrderUpdate]]],
+        timeout_sec: float = 10,
+        poll_interval_sec: float = 1,
+        ws_grace_sec: float = 2
+    ) -> Optional[OrderUpdate]:
+        """wait_for_order for the asyncio engine: the stream's future is awaited and ``poll`` is a coroutine,
+        so waiting for a fill holds no thread."""
+        future = asyncio.wrap_future(self.expect(order_id))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout_sec
+
+        try:
+            while True:
+                if not future.done() and (not self.connected or loop.time() - started >= ws_grace_sec):
+                    try:
+                        update = await poll()
+                    except Exception as exc:
+                        logger.debug(f"{self.name}: REST order poll failed for {order_id}: {exc}")
+                        update = None
+                    if update is not None and update.final:
+                        self.resolve(update)
+                        return update
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait({future}, timeout=min(poll_interval_sec, remaining))
+                if done:
+                    return future.result()
+        finally:
+            if not future.done():
+                # Also cancels the stream's future; it is dropped below either way.
+                future.cancel()
+
+        with self._lock:
+            self._futures.pop(order_id, None)
+        return None
+
+    def _proxy_options(self) -> Dict[str, Any]:
+        if not self.proxy:
+            return {}
+        host, port, username, password = self.proxy.split(":")
+        return {
+            "http_proxy_host": host,
+            "http_proxy_port": int(port),
+            "http_proxy_auth": (username, password),
+            "proxy_type": "http",
+        }
+
+    def _on_open(self, ws) -> None:
+        try:
+            for message in self._open_messages():
+                ws.send(json.dumps(message))
+        except Exception as exc:
+            logger.warning(f"{self.name}: failed to authenticate order stream: {exc}")
+            ws.close()
+            return
+
+        self._ws_connected.set()
+        logger.debug(f"{self.name}: order stream connected")
+
+    def _on_message(self, ws, raw_message: str) -> None:
+        try:
+            update = self._parse_message(json.loads(raw_message))
+        except Exception as exc:
+            logger.debug(f"{self.name}: failed to parse message {raw_message[:200]}: {exc}")
+            return
+
+        if update is not None:
+            self.resolve(update)
+
+    def _on_error(self, ws, error) -> None:
+        logger.debug(f"{self.name}: order stream error: {error}")
+
+    def _on_close(self, ws, status_code, message) -> None:
+        self._ws_connected.clear()
+        logger.debug(f"{self.name}: order stream closed ({status_code} {message})")
+
+    def _run_ws(self) -> None:
+        while not self._stop_event.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self._ws.run_forever(ping_interval=20, ping_timeout=10, **self._proxy_options())
+            except Exception as exc:
+                logger.warning(f"{self.name}: order stream loop failed: {exc}")
+
+            self._ws_connected.clear()
+            self._stop_event.wait(self.reconnect_delay_sec)
@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import websocket
+
+from src.config.constants import logger
+
+
+@dataclass(frozen=True)
+class Quote:
+    bid: float
+    ask: float
+    mid: float
+    updated_at: float
+
+
+class PriceFeed(ABC):
+    name = ""
+    ws_url = ""
+
+    def __init__(self, poll_interval_sec: float = 5, reconnect_delay_sec: float = 5, max_age_sec: Optional[float] = None) -> None:
+        self.poll_interval_sec = poll_interval_sec
+        self.reconnect_delay_sec = reconnect_delay_sec
+        self.max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, Quote] = {}
+        self._symbols: Set[str] = set()
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._ws_connected = threading.Event()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._request_id = 0
+        self._listeners: List[Callable[[str, Quote], None]] = []
+
+    @abstractmethod
+    def _subscribe_message(self, symbol: str, request_id: int) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def _parse_message(self, message: Dict[str, Any]) -> Optional[Tuple[str, float, float]]:
+        ...
+
+    @abstractmethod
+    def _fetch_rest(self, symbol: str) -> Tuple[float, float]:
+        ...
+
+    def start(self) -> None:
+        if self._threads:
+            return
+
+        if self.ws_url:
+            self._threads.append(threading.Thread(target=self._run_ws, name=f"{self.name}-ws", daemon=True))
+        self._threads.append(threading.Thread(target=self._run_poll, name=f"{self.name}-poll", daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def subscribe(self, symbol: str) -> None:
+        with self._lock:
+            if symbol in self._symbols:
+                return
+            self._symbols.add(symbol)
+
+        if self._ws_connected.is_set():
+            self._send_subscribe(symbol)
+
+    def add_listener(self, listener: Callable[[str, Quote], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def set_quote(self, symbol: str, bid: float, ask: float, updated_at: Optional[float] = None) -> Quote:
+        quote = Quote(bid=bid, ask=ask, mid=(bid + ask) / 2, updated_at=updated_at or time.time())
+        with self._lock:
+            self._quotes[symbol] = quote
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(symbol, quote)
+            except Exception as exc:
+                logger.warning(f"{self.name}: price listener failed for {symbol}: {exc}")
+        return quote
+
+    def get_quote(self, symbol: str, max_age_sec: Optional[float] = None) -> Optional[Quote]:
+        with self._lock:
+            quote = self._quotes.get(symbol)
+
+        if quote is None:
+            return None
+        if max_age_sec is not None and time.time() - quote.updated_at > max_age_sec:
+            return None
+        return quote
+
+    def fetch_quote(self, symbol: str) -> Quote:
+        bid, ask = self._fetch_rest(symbol)
+        return self.set_quote(symbol, bid, ask)
+
+    def _send_subscribe(self, symbol: str) -> None:
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+
+        try:
+            self._ws.send(json.dumps(self._subscribe_message(symbol, request_id)))
+        except Exception as exc:
+            logger.warning(f"{self.name}: failed to subscribe to {symbol}: {exc}")
+
+    def _on_open(self, ws) -> None:
+        self._ws_connected.set()
+        logger.debug(f"{self.name}: WebSocket connected")
+
+        with self._lock:
+            symbols = list(self._symbols)
+        for symbol in symbols:
+            self._send_subscribe(symbol)
+
+    def _on_message(self, ws, raw_message: str) -> None:
+        try:
+            parsed = self._parse_message(json.loads(raw_message))
+        except Exception as exc:
+            logger.debug(f"{self.name}: failed to parse message {raw_message[:200]}: {exc}")
+            return
+
+        if parsed is not None:
+            symbol, bid, ask = parsed
+            self.set_quote(symbol, bid, ask)
+
+    def _on_error(self, ws, error) -> None:
+        logger.debug(f"{self.name}: WebSocket error: {error}")
+
+    def _on_close(self, ws, status_code, message) -> None:
+        self._ws_connected.clear()
+        logger.debug(f"{self.name}: WebSocket closed ({status_code} {message})")
+
+    def _run_ws(self) -> None:
+        while not self._stop_event.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self._ws.run_forever(ping_interval=20, ping_timeout=10)
+            except Exception as exc:
+                logger.warning(f"{self.name}: WebSocket loop failed: {exc}")
+
+            self._ws_connected.clear()
+            self._stop_event.wait(self.reconnect_delay_sec)
+
+    def _poll_symbols(self) -> List[str]:
+        with self._lock:
+            symbols = list(self._symbols)
+
+        if not self._ws_connected.is_set():
+            return symbols
+        if self.max_age_sec is None:
+            return []
+        # A connected socket can still go quiet or lose a subscription, so stale symbols are polled as well.
+        return [symbol for symbol in symbols if self.get_quote(symbol, self.max_age_sec) is None]
+
+    def _run_poll(self) -> None:
+        while not self._stop_event.is_set():
+            for symbol in self._poll_symbols():
+                try:
+                    self.fetch_quote(symbol)
+                except Exception as exc:
+                    logger.warning(f"{self.name}: REST price poll failed for {symbol}: {exc}")
+
+            self._stop_event.wait(self.poll_interval_sec)
@@ -6,3 +6,10 @@ def convert_proxy_to_dict(proxy: str) -> dict:
         "https": f"http://{username}:{password}@{host}:{port}",
     }
     return proxies
+
+
+def proxy_label(proxy: str) -> str:
+    if not proxy:
+        return "direct"
+    host, port = proxy.split(":")[:2]
+    return f"{host}:{port}"
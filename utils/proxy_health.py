@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.constants import BACKPACK_HTTP_URL, PARADEX_HTTP_URL, logger
+from src.config.paths import PROXY_HEALTH_DB_PATH
+from utils.data import USER_CONFIG
+from utils.proxy import proxy_label
+from utils.sessions import http_get
+
+# Cheap unauthenticated endpoints on the hosts the bot trades through, so a probe measures the
+# latency (and geo-blocking) that orders will actually see.
+PROBE_URLS = {
+    "paradex": f"{PARADEX_HTTP_URL}/system/time",
+    "backpack": f"{BACKPACK_HTTP_URL}/time",
+}
+
+
+@dataclass
+class ProxyHealth:
+    proxy: str
+    exchange: str
+    latency_ms: Optional[float] = None
+    last_success: Optional[float] = None
+    last_checked: Optional[float] = None
+    failures: int = 0
+    last_error: str = ""
+
+    @property
+    def healthy(self) -> bool:
+        return self.failures == 0 and self.last_success is not None
+
+
+class ProxyHealthStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS proxy_health ("
+            "proxy TEXT NOT NULL, exchange TEXT NOT NULL, latency_ms REAL, last_success REAL, "
+            "last_checked REAL, failures INTEGER NOT NULL DEFAULT 0, last_error TEXT NOT NULL DEFAULT '', "
+            "PRIMARY KEY (proxy, exchange))"
+        )
+
+    def get(self, proxy: str, exchange: str) -> Optional[ProxyHealth]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT proxy, exchange, latency_ms, last_success, last_checked, failures, last_error "
+                "FROM proxy_health WHERE proxy = ? AND exchange = ?",
+                (proxy, exchange),
+            ).fetchone()
+        return ProxyHealth(*row) if row else None
+
+    def all(self) -> List[ProxyHealth]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT proxy, exchange, latency_ms, last_success, last_checked, failures, last_error FROM proxy_health"
+            ).fetchall()
+        return [ProxyHealth(*row) for row in rows]
+
+    def save(self, health: ProxyHealth) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO proxy_health (proxy, exchange, latency_ms, last_success, last_checked, failures, last_error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (proxy, exchange) DO UPDATE SET "
+                "latency_ms = excluded.latency_ms, last_success = excluded.last_success, "
+                "last_checked = excluded.last_checked, failures = excluded.failures, last_error = excluded.last_error",
+                (health.proxy, health.exchange, health.latency_ms, health.last_success,
+                 health.last_checked, health.failures, health.last_error),
+            )
+
+
+_STORE: Optional[ProxyHealthStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_proxy_health_store() -> ProxyHealthStore:
+    global _STORE
+
+    if _STORE is not None:
+        return _STORE
+
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ProxyHealthStore(PROXY_HEALTH_DB_PATH)
+    return _STORE
+
+
+def probe_proxy(proxy: str, exchange: str, timeout_sec: float = 5, previous: Optional[ProxyHealth] = None) -> ProxyHealth:
+    health = previous or ProxyHealth(proxy, exchange)
+    health.last_checked = time.time()
+
+    started = time.perf_counter()
+    try:
+        response = http_get(exchange, PROBE_URLS[exchange], proxy, timeout=(timeout_sec, timeout_sec))
+        if response.status_code != 200:
+            raise ValueError(f"{exchange} returned status code {response.status_code}")
+    except Exception as exc:
+        health.failures += 1
+        health.last_error = str(exc)[:300]
+        return health
+
+    health.latency_ms = (time.perf_counter() - started) * 1000
+    health.last_success = health.last_checked
+    health.failures = 0
+    health.last_error = ""
+    return health
+
+
+def check_proxies(targets: Iterable[Tuple[str, str]], force: bool = False) -> Dict[Tuple[str, str], ProxyHealth]:
+    """Probe each ``(proxy, exchange)`` concurrently, skipping proxies that passed within the TTL,
+    and persist the results. Returns the current health of every target."""
+    checks_cfg = USER_CONFIG.get("proxy_checks", {})
+    ttl_sec = checks_cfg.get("ttl_sec", 3600)
+    timeout_sec = checks_cfg.get("timeout_sec", 5)
+    store = get_proxy_health_store()
+
+    results: Dict[Tuple[str, str], ProxyHealth] = {}
+    stale = []
+    now = time.time()
+    for target in dict.fromkeys(targets):
+        health = store.get(*target)
+        if not force and health is not None and health.healthy and now - health.last_success < ttl_sec:
+            results[target] = health
+        else:
+            stale.append((target, health))
+
+    if stale:
+        logger.info(f"Probing {len(stale)} proxies ({len(results)} verified within {ttl_sec}s skipped)")
+        with ThreadPoolExecutor(max_workers=checks_cfg.get("workers", 32), thread_name_prefix="ProxyCheck") as executor:
+            futures = {
+                target: executor.submit(probe_proxy, target[0], target[1], timeout_sec, health)
+                for target, health in stale
+            }
+            for target, future in futures.items():
+                health = future.result()
+                store.save(health)
+                results[target] = health
+                if health.healthy:
+                    logger.debug(f"{target[1]} via {proxy_label(target[0])}: {health.latency_ms:.0f} ms")
+
+    latencies = sorted(health.latency_ms for health in results.values() if health.healthy)
+    if latencies:
+        logger.info(
+            f"Proxies: {len(latencies)}/{len(results)} healthy, "
+            f"median {latencies[len(latencies) // 2]:.0f} ms, slowest {latencies[-1]:.0f} ms"
+        )
+    return results
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            self._refill()
+
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        with self._lock:
+            self._refill()
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    def __init__(self, rate: float, burst: float, min_rate: Optional[float] = None, recovery_sec: float = 60) -> None:
+        super().__init__(rate, burst)
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 10
+        self.recovery_sec = recovery_sec
+
+    def _refill(self) -> None:
+        if self.rate < self.max_rate:
+            elapsed = time.monotonic() - self._updated_at
+            self.rate = min(self.max_rate, self.rate + (self.max_rate - self.min_rate) * elapsed / self.recovery_sec)
+        super()._refill()
+
+    def penalize(self, retry_after: float) -> None:
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Drain the bucket so the next token becomes available only after retry_after.
+            self._tokens = min(self._tokens, -retry_after * self.rate)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: float = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+
+        with self._lock:
+            return self._buckets.setdefault(key, TokenBucket(self.rate, self.burst))
+
+    def acquire(self, key: Hashable, tokens: float = 1) -> float:
+        return self.bucket(key).acquire(tokens)
+
+    def try_acquire(self, key: Hashable, tokens: float = 1) -> float:
+        return self.bucket(key).try_acquire(tokens)
@@ -0,0 +1,236 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+import requests
+
+from src.config.constants import logger
+from utils.data import USER_CONFIG
+from utils.metrics import RETRY_ATTEMPTS, RETRY_EXHAUSTED
+from utils.sessions import parse_retry_after
+
+RETRYABLE = "retryable"
+NON_RETRYABLE = "non_retryable"
+AMBIGUOUS = "ambiguous"
+
+SERVER_ERROR_STATUSES = {408, 500, 502, 503, 504}
+
+
+class ExchangeHTTPError(ValueError):
+    def __init__(self, message: str, response: requests.Response) -> None:
+        super().__init__(f"{message}: {response.status_code} - {response.text[:300]}")
+        self.status_code = response.status_code
+        self.retry_after = parse_retry_after(response.headers.get("Retry-After"), default=0)
+
+
+class OrderRejectedError(ValueError):
+    pass
+
+
+class RetryError(RuntimeError):
+    pass
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    if isinstance(exc, ExchangeHTTPError):
+        return exc.status_code
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code
+    return None
+
+
+def classify(exc: Exception, idempotent: bool = True) -> str:
+    """Sort a failure into retryable, non-retryable, or ambiguous (an order may have been placed)."""
+    if isinstance(exc, (OrderRejectedError, RetryError)):
+        return NON_RETRYABLE
+
+    status = _status_code(exc)
+    if status is not None:
+        # A rejected Paradex JWT is dropped where the 401 is received, so the retry authenticates again.
+        if status in (401, 429):
+            return RETRYABLE
+        if status in SERVER_ERROR_STATUSES or status >= 500:
+            return RETRYABLE if idempotent else AMBIGUOUS
+        return NON_RETRYABLE
+
+    # Nothing reached the exchange if the connection or proxy tunnel could not be established.
+    if isinstance(exc, (
+        requests.ConnectTimeout, requests.exceptions.ProxyError,
+        aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError,
+    )):
+        return RETRYABLE
+    return RETRYABLE if idempotent else AMBIGUOUS
+
+
+def _retry_after(exc: Exception) -> float:
+    if isinstance(exc, ExchangeHTTPError):
+        return exc.retry_after
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return parse_retry_after(exc.response.headers.get("Retry-After"), default=0)
+    return 0
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 5
+    base_delay_sec: float = 0.5
+    max_delay_sec: float = 10
+    deadline_sec: float = 60
+
+    def next_delay(self, previous: float) -> float:
+        # Decorrelated jitter: spreads retries from many threads instead of synchronizing them.
+        return min(self.max_delay_sec, random.uniform(self.base_delay_sec, max(previous, self.base_delay_sec) * 3))
+
+
+def get_retry_policy() -> RetryPolicy:
+    retry_cfg = USER_CONFIG.get("retry", {})
+    return RetryPolicy(
+        attempts=USER_CONFIG.get("retries", 5),
+        base_delay_sec=retry_cfg.get("base_delay_sec", 0.5),
+        max_delay_sec=retry_cfg.get("max_delay_sec", 10),
+        deadline_sec=retry_cfg.get("deadline_sec", 60),
+    )
+
+
+def retry_call(
+    func: Callable,
+    *args,
+    policy: Optional[RetryPolicy] = None,
+    idempotent: bool = True,
+    reconcile: Optional[Callable[[], Any]] = None,
+    stop_event: Optional[threading.Event] = None,
+    **kwargs
+) -> Any:
+    """Call ``func`` under ``policy``.
+
+    Non-idempotent calls (order submission) that fail ambiguously are never resubmitted blindly:
+    ``reconcile`` is called after the backoff and its result is returned if it is not None,
+    meaning the order did go through. It is also called once before giving up on an ambiguous
+    last attempt. Without ``reconcile`` an ambiguous failure is raised.
+    Setting ``stop_event`` interrupts the backoff and raises RetryError.
+    """
+    policy = policy or get_retry_policy()
+    name = getattr(func, "__name__", repr(func))
+    attempts = max(policy.attempts, 1)
+    deadline = time.monotonic() + policy.deadline_sec
+    delay = policy.base_delay_sec
+    last_exception = None
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            last_exception = exc
+            outcome = classify(exc, idempotent)
+            RETRY_ATTEMPTS.inc(function=name, outcome=outcome)
+
+            if outcome == NON_RETRYABLE:
+                logger.warning(f"{name} failed with a non-retryable error: {exc}")
+                raise
+            if outcome == AMBIGUOUS and reconcile is None:
+                logger.warning(f"{name} failed with an ambiguous outcome and cannot be reconciled: {exc}")
+                raise
+
+            delay = max(policy.next_delay(delay), _retry_after(exc))
+            if attempt == attempts or time.monotonic() + delay > deadline:
+                break
+
+            logger.warning(f"Attempt {attempt}/{attempts} failed for {name} ({outcome}): {exc}, retrying in {delay:.1f}s")
+            if stop_event is None:
+                time.sleep(delay)
+            elif stop_event.wait(delay):
+                raise RetryError(f"{name} stopped after {attempt} attempts") from exc
+
+            if outcome == AMBIGUOUS:
+                # Reconciling shares this call's deadline instead of starting a fresh one.
+                remaining = replace(policy, deadline_sec=max(deadline - time.monotonic(), 0))
+                settled = retry_call(reconcile, policy=remaining, stop_event=stop_event)
+                if settled is not None:
+                    logger.info(f"{name}: reconciled after an ambiguous failure, not resubmitting")
+                    return settled
+
+    if outcome == AMBIGUOUS:
+        try:
+            settled = reconcile()
+        except Exception as exc:
+            logger.warning(f"{name}: final reconcile failed: {exc}")
+        else:
+            if settled is not None:
+                logger.info(f"{name}: reconciled after the last ambiguous failure")
+                return settled
+
+    RETRY_EXHAUSTED.inc(function=name)
+    raise RetryError(f"All {attempt} attempts failed for {name}") from last_exception
+
+
+async def async_retry_call(
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    policy: Optional[RetryPolicy] = None,
+    idempotent: bool = True,
+    reconcile: Optional[Callable[[], Awaitable[Any]]] = None,
+    stop_event: Optional[asyncio.Event] = None,
+    **kwargs
+) -> Any:
+    """retry_call for coroutine functions: same classification, reconciliation and deadline, but the
+    backoff is awaited instead of sleeping, so a waiting call holds no thread."""
+    policy = policy or get_retry_policy()
+    name = getattr(func, "__name__", repr(func))
+    attempts = max(policy.attempts, 1)
+    deadline = time.monotonic() + policy.deadline_sec
+    delay = policy.base_delay_sec
+    last_exception = None
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as exc:
+            last_exception = exc
+            outcome = classify(exc, idempotent)
+            RETRY_ATTEMPTS.inc(function=name, outcome=outcome)
+
+            if outcome == NON_RETRYABLE:
+                logger.warning(f"{name} failed with a non-retryable error: {exc}")
+                raise
+            if outcome == AMBIGUOUS and reconcile is None:
+                logger.warning(f"{name} failed with an ambiguous outcome and cannot be reconciled: {exc}")
+                raise
+
+            delay = max(policy.next_delay(delay), _retry_after(exc))
+            if attempt == attempts or time.monotonic() + delay > deadline:
+                break
+
+            logger.warning(f"Attempt {attempt}/{attempts} failed for {name} ({outcome}): {exc}, retrying in {delay:.1f}s")
+            if stop_event is None:
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    raise RetryError(f"{name} stopped after {attempt} attempts") from exc
+
+            if outcome == AMBIGUOUS:
+                remaining = replace(policy, deadline_sec=max(deadline - time.monotonic(), 0))
+                settled = await async_retry_call(reconcile, policy=remaining, stop_event=stop_event)
+                if settled is not None:
+                    logger.info(f"{name}: reconciled after an ambiguous failure, not resubmitting")
+                    return settled
+
+    if outcome == AMBIGUOUS:
+        try:
+            settled = await reconcile()
+        except Exception as exc:
+            logger.warning(f"{name}: final reconcile failed: {exc}")
+        else:
+            if settled is not None:
+                logger.info(f"{name}: reconciled after the last ambiguous failure")
+                return settled
+
+    RETRY_EXHAUSTED.inc(function=name)
+    raise RetryError(f"All {attempt} attempts failed for {name}") from last_exception
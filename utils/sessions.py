@@ -0,0 +1,313 @@
+import json
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.data import USER_CONFIG
+from utils.metrics import (
+    HTTP_LATENCY, HTTP_REQUESTS, HTTP_REQUEST_BYTES, HTTP_RESPONSE_BYTES,
+    RATE_LIMIT_WAIT, RATE_LIMITED, normalize_endpoint
+)
+from utils.proxy import convert_proxy_to_dict, proxy_label
+from utils.rate_limit import AdaptiveTokenBucket
+
+_SESSIONS: Dict[Tuple[str, str], requests.Session] = {}
+_REQUEST_COUNTS: Dict[Tuple[str, str], int] = {}
+_BUCKETS: Dict[Tuple[str, str, str], AdaptiveTokenBucket] = {}
+_LOCK = threading.Lock()
+# aiohttp sessions belong to the event loop that created them; only the asyncio engine uses these.
+_ASYNC_SESSIONS: Dict[Tuple[str, str], aiohttp.ClientSession] = {}
+
+DEFAULT_RATE_LIMITS = {
+    "paradex": {
+        "orders": {"rate": 10, "burst": 20},
+        "auth": {"rate": 2, "burst": 5},
+        "account": {"rate": 10, "burst": 20},
+        "market": {"rate": 20, "burst": 40},
+    },
+    "backpack": {
+        "orders": {"rate": 10, "burst": 20},
+        "account": {"rate": 10, "burst": 20},
+        "market": {"rate": 20, "burst": 40},
+    },
+}
+
+
+def _http_config() -> Dict[str, Any]:
+    return USER_CONFIG.get("http", {})
+
+
+def _normalize_proxy(proxy: Optional[str]) -> str:
+    if not isinstance(proxy, str):
+        return ""
+    return proxy.strip()
+
+
+def get_session(exchange: str, proxy: Optional[str] = None) -> requests.Session:
+    key = (exchange, _normalize_proxy(proxy))
+    session = _SESSIONS.get(key)
+    if session is not None:
+        return session
+
+    with _LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            http_cfg = _http_config()
+            adapter = HTTPAdapter(
+                pool_connections=http_cfg.get("pool_connections", 4),
+                pool_maxsize=http_cfg.get("pool_maxsize", 8),
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if key[1]:
+                session.proxies.update(convert_proxy_to_dict(key[1]))
+            _SESSIONS[key] = session
+            _REQUEST_COUNTS[key] = 0
+    return session
+
+
+def endpoint_class(endpoint: str) -> str:
+    if endpoint == "/auth":
+        return "auth"
+    if endpoint.startswith(("/orders", "/order")):
+        return "orders"
+    if endpoint.startswith(("/bbo", "/markets", "/markPrices")):
+        return "market"
+    return "account"
+
+
+def _limit_config(exchange: str, limit_class: str) -> Dict[str, float]:
+    limits_cfg = USER_CONFIG.get("rate_limits", {})
+    defaults = DEFAULT_RATE_LIMITS.get(exchange, {})
+    limit = limits_cfg.get(exchange, {}).get(limit_class) or defaults.get(limit_class) or defaults.get("account", {})
+    return {
+        "rate": limit.get("rate", 10),
+        "burst": limit.get("burst", limit.get("rate", 10)),
+        "min_rate": limit.get("min_rate"),
+        "recovery_sec": limits_cfg.get("recovery_sec", 60),
+    }
+
+
+def get_bucket(exchange: str, limit_class: str, proxy: str) -> AdaptiveTokenBucket:
+    key = (exchange, limit_class, proxy)
+    bucket = _BUCKETS.get(key)
+    if bucket is not None:
+        return bucket
+
+    with _LOCK:
+        bucket = _BUCKETS.get(key)
+        if bucket is None:
+            bucket = _BUCKETS[key] = AdaptiveTokenBucket(**_limit_config(exchange, limit_class))
+    return bucket
+
+
+def parse_retry_after(value: Optional[str], default: float = 1) -> float:
+    if not value:
+        return default
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+def http_request(
+    exchange: str,
+    method: str,
+    url: str,
+    proxy: Optional[str] = None,
+    **kwargs
+) -> requests.Response:
+    http_cfg = _http_config()
+    kwargs.setdefault("timeout", (
+        http_cfg.get("connect_timeout_sec", 5),
+        http_cfg.get("read_timeout_sec", 15),
+    ))
+
+    session = get_session(exchange, proxy)
+    key = (exchange, _normalize_proxy(proxy))
+    if key[1]:
+        # Per-request proxies take precedence over HTTP(S)_PROXY from the environment, which would
+        # otherwise override session.proxies and send account traffic out through another IP.
+        kwargs.setdefault("proxies", session.proxies)
+    with _LOCK:
+        _REQUEST_COUNTS[key] = _REQUEST_COUNTS.get(key, 0) + 1
+
+    endpoint = normalize_endpoint(url)
+    labels = {"exchange": exchange, "endpoint": endpoint, "proxy": proxy_label(key[1])}
+    limit_labels = {"exchange": exchange, "endpoint_class": endpoint_class(endpoint), "proxy": labels["proxy"]}
+    bucket = get_bucket(exchange, limit_labels["endpoint_class"], labels["proxy"])
+    RATE_LIMIT_WAIT.observe(bucket.acquire(), **limit_labels)
+
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+    except requests.RequestException as exc:
+        HTTP_LATENCY.observe(time.perf_counter() - started, method=method, **labels)
+        HTTP_REQUESTS.inc(method=method, status=type(exc).__name__, **labels)
+        raise
+
+    HTTP_LATENCY.observe(time.perf_counter() - started, method=method, **labels)
+    HTTP_REQUESTS.inc(method=method, status=str(response.status_code), **labels)
+    HTTP_REQUEST_BYTES.inc(len(response.request.body or b""), **labels)
+    HTTP_RESPONSE_BYTES.inc(len(response.content), **labels)
+
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        bucket.penalize(retry_after)
+        RATE_LIMITED.inc(**limit_labels)
+    return response
+
+
+def http_get(exchange: str, url: str, proxy: Optional[str] = None, **kwargs) -> requests.Response:
+    return http_request(exchange, "GET", url, proxy, **kwargs)
+
+
+def http_post(exchange: str, url: str, proxy: Optional[str] = None, **kwargs) -> requests.Response:
+    return http_request(exchange, "POST", url, proxy, **kwargs)
+
+
+class AsyncResponse:
+    """A fully read aiohttp response with the parts of the requests.Response interface callers use."""
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes, url: str) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def get_async_session(exchange: str, proxy: Optional[str] = None) -> aiohttp.ClientSession:
+    key = (exchange, _normalize_proxy(proxy))
+    session = _ASYNC_SESSIONS.get(key)
+    if session is None or session.closed:
+        http_cfg = _http_config()
+        connector = aiohttp.TCPConnector(limit=http_cfg.get("pool_maxsize", 8))
+        # trust_env=False: like the per-request proxies of the sync client, HTTP(S)_PROXY from the
+        # environment must not reroute account traffic; the account proxy is passed per request.
+        session = _ASYNC_SESSIONS[key] = aiohttp.ClientSession(connector=connector, trust_env=False)
+    return session
+
+
+async def async_http_request(
+    exchange: str,
+    method: str,
+    url: str,
+    proxy: Optional[str] = None,
+    **kwargs
+) -> AsyncResponse:
+    http_cfg = _http_config()
+    kwargs.setdefault("timeout", aiohttp.ClientTimeout(
+        sock_connect=http_cfg.get("connect_timeout_sec", 5),
+        sock_read=http_cfg.get("read_timeout_sec", 15),
+    ))
+
+    session = get_async_session(exchange, proxy)
+    key = (exchange, _normalize_proxy(proxy))
+    if key[1]:
+        kwargs.setdefault("proxy", convert_proxy_to_dict(key[1])["http"])
+    body = b""
+    if "json" in kwargs:
+        # Serialized here, as requests does, so the request size can be measured.
+        body = json.dumps(kwargs.pop("json")).encode("utf-8")
+        kwargs["data"] = body
+        kwargs["headers"] = {"Content-Type": "application/json", **(kwargs.get("headers") or {})}
+
+    endpoint = normalize_endpoint(url)
+    labels = {"exchange": exchange, "endpoint": endpoint, "proxy": proxy_label(key[1])}
+    limit_labels = {"exchange": exchange, "endpoint_class": endpoint_class(endpoint), "proxy": labels["proxy"]}
+    bucket = get_bucket(exchange, limit_labels["endpoint_class"], labels["proxy"])
+    RATE_LIMIT_WAIT.observe(await bucket.acquire_async(), **limit_labels)
+
+    started = time.perf_counter()
+    try:
+        async with session.request(method, url, **kwargs) as raw_response:
+            content = await raw_response.read()
+            response = AsyncResponse(raw_response.status, raw_response.headers.copy(), content, url)
+    except (aiohttp.ClientError, TimeoutError) as exc:
+        HTTP_LATENCY.observe(time.perf_counter() - started, method=method, **labels)
+        HTTP_REQUESTS.inc(method=method, status=type(exc).__name__, **labels)
+        raise
+
+    HTTP_LATENCY.observe(time.perf_counter() - started, method=method, **labels)
+    HTTP_REQUESTS.inc(method=method, status=str(response.status_code), **labels)
+    HTTP_REQUEST_BYTES.inc(len(body), **labels)
+    HTTP_RESPONSE_BYTES.inc(len(response.content), **labels)
+
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        bucket.penalize(retry_after)
+        RATE_LIMITED.inc(**limit_labels)
+    return response
+
+
+async def async_http_get(exchange: str, url: str, proxy: Optional[str] = None, **kwargs) -> AsyncResponse:
+    return await async_http_request(exchange, "GET", url, proxy, **kwargs)
+
+
+async def async_http_post(exchange: str, url: str, proxy: Optional[str] = None, **kwargs) -> AsyncResponse:
+    return await async_http_request(exchange, "POST", url, proxy, **kwargs)
+
+
+async def close_async_sessions() -> None:
+    sessions = list(_ASYNC_SESSIONS.values())
+    _ASYNC_SESSIONS.clear()
+    for session in sessions:
+        await session.close()
+
+
+def _count_connections(adapter: HTTPAdapter) -> int:
+    managers = [adapter.poolmanager, *adapter.proxy_manager.values()]
+    total = 0
+    for manager in managers:
+        for pool_key in list(manager.pools.keys()):
+            pool = manager.pools.get(pool_key)
+            if pool is not None:
+                total += pool.num_connections
+    return total
+
+
+def get_connection_stats() -> Dict[str, Dict[str, int]]:
+    with _LOCK:
+        items = [(key, session, _REQUEST_COUNTS.get(key, 0)) for key, session in _SESSIONS.items()]
+
+    stats = {}
+    for (exchange, proxy), session, request_count in items:
+        connections = _count_connections(session.get_adapter("https://"))
+        stats[f"{exchange}:{proxy_label(proxy)}"] = {
+            "requests": request_count,
+            "connections": connections,
+            "reused": max(request_count - connections, 0),
+        }
+    return stats
+
+
+def close_sessions() -> None:
+    with _LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+        _REQUEST_COUNTS.clear()
+        _BUCKETS.clear()
+
+    for session in sessions:
+        session.close()
@@ -1,11 +1,48 @@
+import functools
 import time
 import json
 from decimal import Decimal
-from typing import Dict, Union
+from typing import Dict, List, Optional, Union
 
+from starknet_py.cairo.felt import encode_shortstring
 from starknet_py.common import int_from_bytes
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.hash.utils import compute_hash_on_elements
+from starknet_py.utils.typed_data import TypedData, parse_felt
 
-from src.config.constants import STARKNET_CHAIN_ID
+from src.config.constants import STARKNET_CHAIN_ID, logger
+
+CHAIN_ID = int_from_bytes(STARKNET_CHAIN_ID.encode("utf-8"))
+
+DOMAIN = {"name": "Paradex", "chainId": hex(CHAIN_ID), "version": "1"}
+DOMAIN_TYPE = [
+    {"name": "name", "type": "felt"},
+    {"name": "chainId", "type": "felt"},
+    {"name": "version", "type": "felt"},
+]
+AUTH_TYPES = {
+    "StarkNetDomain": DOMAIN_TYPE,
+    "Request": [
+        {"name": "method", "type": "felt"},
+        {"name": "path", "type": "felt"},
+        {"name": "body", "type": "felt"},
+        {"name": "timestamp", "type": "felt"},
+        {"name": "expiration", "type": "felt"},
+    ],
+}
+ORDER_TYPES = {
+    "StarkNetDomain": DOMAIN_TYPE,
+    "Order": [
+        {"name": "timestamp", "type": "felt"},
+        {"name": "market", "type": "felt"},
+        {"name": "side", "type": "felt"},
+        {"name": "orderType", "type": "felt"},
+        {"name": "size", "type": "felt"},
+        {"name": "price", "type": "felt"},
+    ],
+}
+
+STARKNET_MESSAGE_PREFIX = encode_shortstring("StarkNet Message")
 
 
 def hex_to_int(val: str) -> int:
@@ -16,8 +53,8 @@ def build_auth_message(
     method: str,
     path: str,
     body: Union[dict, str],
-    timestamp: int = None,
-    expiration: int = None
+    timestamp: Optional[int] = None,
+    expiration: Optional[int] = None
 ) -> Dict:
     now = int(time.time())
     timestamp = timestamp or now
@@ -33,26 +70,9 @@ def build_auth_message(
             "timestamp": timestamp,
             "expiration": expiration,
         },
-        "domain": {
-            "name": "Paradex",
-            "chainId": hex(int_from_bytes(STARKNET_CHAIN_ID.encode("utf-8"))),
-            "version": "1"
-        },
+        "domain": DOMAIN,
         "primaryType": "Request",
-        "types": {
-            "StarkNetDomain": [
-                {"name": "name", "type": "felt"},
-                {"name": "chainId", "type": "felt"},
-                {"name": "version", "type": "felt"},
-            ],
-            "Request": [
-                {"name": "method", "type": "felt"},
-                {"name": "path", "type": "felt"},
-                {"name": "body", "type": "felt"},
-                {"name": "timestamp", "type": "felt"},
-                {"name": "expiration", "type": "felt"},
-            ],
-        },
+        "types": AUTH_TYPES,
     }
 
 
@@ -63,30 +83,10 @@ def build_trade_message(
     size: Decimal,
     timestamp: int
 ) -> Dict:
-    chain_id = int_from_bytes(STARKNET_CHAIN_ID.encode("utf-8"))
-
     return {
-        "domain": {
-            "name": "Paradex",
-            "version": "1",
-            "chainId": hex(chain_id)
-        },
+        "domain": DOMAIN,
         "primaryType": "Order",
-        "types": {
-            "StarkNetDomain": [
-                {"name": "name", "type": "felt"},
-                {"name": "chainId", "type": "felt"},
-                {"name": "version", "type": "felt"}
-            ],
-            "Order": [
-                {"name": "timestamp", "type": "felt"},
-                {"name": "market", "type": "felt"},
-                {"name": "side", "type": "felt"},
-                {"name": "orderType", "type": "felt"},
-                {"name": "size", "type": "felt"},
-                {"name": "price", "type": "felt"},
-            ]
-        },
+        "types": ORDER_TYPES,
         "message": {
             "timestamp": str(timestamp),
             "market": market,
@@ -98,5 +98,62 @@ def build_trade_message(
     }
 
 
+def _encode_type(types: Dict[str, List[Dict[str, str]]], type_name: str) -> str:
+    fields = ",".join(f"{field['name']}:{field['type']}" for field in types[type_name])
+    return f"{type_name}({fields})"
+
+
+@functools.lru_cache(maxsize=None)
+def _type_hash(type_name: str) -> int:
+    types = AUTH_TYPES if type_name in AUTH_TYPES else ORDER_TYPES
+    return get_selector_from_name(_encode_type(types, type_name))
+
+
+def _struct_hash(types: Dict[str, List[Dict[str, str]]], type_name: str, data: Dict) -> int:
+    values = [parse_felt(data[field["name"]]) for field in types[type_name]]
+    return compute_hash_on_elements([_type_hash(type_name), *values])
+
+
+@functools.lru_cache(maxsize=None)
+def _domain_hash() -> int:
+    return _struct_hash(ORDER_TYPES, "StarkNetDomain", DOMAIN)
+
+
+def _fast_message_hash(typed_data: Dict, account_address: int) -> int:
+    message = typed_data["message"]
+    types = typed_data["types"]
+    return compute_hash_on_elements([
+        STARKNET_MESSAGE_PREFIX,
+        _domain_hash(),
+        account_address,
+        _struct_hash(types, typed_data["primaryType"], message),
+    ])
+
+
+def _is_precomputed(typed_data: Dict) -> bool:
+    return typed_data.get("domain") == DOMAIN and typed_data.get("types") in (AUTH_TYPES, ORDER_TYPES)
+
+
+@functools.lru_cache(maxsize=None)
+def _fast_hash_verified() -> bool:
+    # The shortcut mirrors starknet_py's revision 0 encoding; if a library upgrade changes that,
+    # fall back to the full TypedData path rather than sign a hash the exchange will reject.
+    for sample in (
+        build_trade_message("ETH-USD-PERP", "MARKET", "BUY", Decimal("0.125"), 1700000000000),
+        build_auth_message("POST", "/v1/auth", "", 1700000000, 1700086400),
+    ):
+        if _fast_message_hash(sample, 1) != TypedData.from_dict(sample).message_hash(1):
+            logger.warning("Precomputed typed data hash does not match starknet_py, using the slow path")
+            return False
+    return True
+
+
+def message_hash(typed_data: Dict, account_address: int) -> int:
+    """Starknet typed data hash, reusing the precomputed domain and type hashes for Paradex messages."""
+    if _is_precomputed(typed_data) and _fast_hash_verified():
+        return _fast_message_hash(typed_data, account_address)
+    return TypedData.from_dict(typed_data).message_hash(account_address)
+
+
 def chain_size(size: Decimal) -> str:
     return str(int(size.scaleb(8)))
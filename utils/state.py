@@ -0,0 +1,160 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class StateStore(ABC):
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_complete = False
+
+    @abstractmethod
+    def _read(self, account: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def _read_all(self) -> Dict[str, Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _write(self, account: str, values: Dict[str, Any]) -> None:
+        ...
+
+    def get(self, account: str) -> Dict[str, Any]:
+        with self._lock:
+            if account not in self._cache:
+                if self._cache_complete:
+                    return {}
+                self._cache[account] = self._read(account)
+            return dict(self._cache[account])
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if not self._cache_complete:
+                self._cache = self._read_all()
+                self._cache_complete = True
+            return {account: dict(values) for account, values in self._cache.items() if values}
+
+    def update(self, account: str, values: Dict[str, Any]) -> None:
+        if not values:
+            return
+
+        values = {str(key): value for key, value in values.items()}
+        with self._lock:
+            self._write(account, values)
+            if account not in self._cache and not self._cache_complete:
+                self._cache[account] = self._read(account)
+            else:
+                self._cache.setdefault(account, {}).update(values)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonStateStore(StateStore):
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = Path(path)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        with self.path.open(encoding="utf-8") as file:
+            return json.load(file)
+
+    def _read(self, account: str) -> Dict[str, Any]:
+        return self._load().get(account, {})
+
+    def _read_all(self) -> Dict[str, Dict[str, Any]]:
+        return self._load()
+
+    def _write(self, account: str, values: Dict[str, Any]) -> None:
+        state = self._load()
+        state.setdefault(account, {}).update(values)
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class SqliteStateStore(StateStore):
+    def __init__(self, path: str, json_path: Optional[str] = None) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "account TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (account, key))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        if json_path:
+            self._migrate_json(Path(json_path))
+
+    def _migrate_json(self, json_path: Path) -> None:
+        with self._lock:
+            migrated = self._conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if migrated:
+                return
+
+            state = {}
+            if json_path.exists():
+                with json_path.open(encoding="utf-8") as file:
+                    state = json.load(file)
+
+            rows = [
+                (account, str(key), json.dumps(value, ensure_ascii=False))
+                for account, values in state.items()
+                for key, value in values.items()
+            ]
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO state (account, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (account, key) DO NOTHING",
+                    rows,
+                )
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(json_path),))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _read(self, account: str) -> Dict[str, Any]:
+        rows = self._conn.execute("SELECT key, value FROM state WHERE account = ?", (account,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def _read_all(self) -> Dict[str, Dict[str, Any]]:
+        state: Dict[str, Dict[str, Any]] = {}
+        for account, key, value in self._conn.execute("SELECT account, key, value FROM state"):
+            state.setdefault(account, {})[key] = json.loads(value)
+        return state
+
+    def _write(self, account: str, values: Dict[str, Any]) -> None:
+        rows = [(account, key, json.dumps(value, ensure_ascii=False)) for key, value in values.items()]
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT INTO state (account, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (account, key) DO UPDATE SET value = excluded.value",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()